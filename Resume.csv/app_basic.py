@@ -1,340 +1,515 @@
-import os
-import json
-import pandas as pd
-from flask import Flask, request, jsonify, render_template, send_file
-from flask_cors import CORS
-from werkzeug.utils import secure_filename
-import PyPDF2
-from docx import Document
-import re
-import io
-import math
-from datetime import datetime
-from collections import Counter
-
-app = Flask(__name__)
-CORS(app)
-
-# Configuration
-UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
-# Create upload folder if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-class BasicResumeRanker:
-    def __init__(self):
-        self.job_keywords = {}
-        self.resume_texts = []
-        self.resume_names = []
-        self.job_description = ""
-        
-    def extract_text_from_pdf(self, pdf_path):
-        """Extract text from PDF file"""
-        try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-        except Exception as e:
-            print(f"Error extracting text from PDF: {e}")
-            return ""
-    
-    def extract_text_from_docx(self, docx_path):
-        """Extract text from DOCX file"""
-        try:
-            doc = Document(docx_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            print(f"Error extracting text from DOCX: {e}")
-            return ""
-    
-    def preprocess_text(self, text):
-        """Basic text preprocessing"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
-        }
-        
-        words = text.split()
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
-        
-        return " ".join(filtered_words)
-    
-    def calculate_tf_idf_scores(self, documents):
-        """Calculate TF-IDF scores for documents"""
-        # Calculate term frequency for each document
-        tf_scores = []
-        all_terms = set()
-        
-        for doc in documents:
-            words = doc.split()
-            tf = Counter(words)
-            tf_scores.append(tf)
-            all_terms.update(words)
-        
-        # Calculate inverse document frequency
-        idf_scores = {}
-        num_docs = len(documents)
-        
-        for term in all_terms:
-            doc_count = sum(1 for tf in tf_scores if term in tf)
-            idf_scores[term] = math.log(num_docs / (1 + doc_count))
-        
-        # Calculate TF-IDF vectors
-        tfidf_vectors = []
-        for tf in tf_scores:
-            vector = {}
-            for term in all_terms:
-                tf_score = tf.get(term, 0)
-                idf_score = idf_scores[term]
-                vector[term] = tf_score * idf_score
-            tfidf_vectors.append(vector)
-        
-        return tfidf_vectors, all_terms
-    
-    def cosine_similarity(self, vec1, vec2, all_terms):
-        """Calculate cosine similarity between two vectors"""
-        dot_product = 0
-        norm1 = 0
-        norm2 = 0
-        
-        for term in all_terms:
-            val1 = vec1.get(term, 0)
-            val2 = vec2.get(term, 0)
-            dot_product += val1 * val2
-            norm1 += val1 * val1
-            norm2 += val2 * val2
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0
-        
-        return dot_product / (math.sqrt(norm1) * math.sqrt(norm2))
-    
-    def set_job_description(self, job_description, keywords=None):
-        """Set job description and keywords for ranking"""
-        self.job_description = job_description
-        if keywords:
-            self.job_keywords = {keyword.lower(): weight for keyword, weight in keywords.items()}
-        else:
-            # Extract common keywords from job description
-            processed_desc = self.preprocess_text(job_description)
-            words = processed_desc.split()
-            # Count word frequencies
-            word_freq = Counter(words)
-            
-            # Take top 20 most frequent words as keywords
-            most_common = word_freq.most_common(20)
-            self.job_keywords = {word: 1.0 for word, _ in most_common if len(word) > 3}
-    
-    def add_resume(self, file_path, filename):
-        """Add a resume to the ranking system"""
-        # Extract text based on file type
-        if file_path.endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            text = self.extract_text_from_docx(file_path)
-        else:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-        
-        # Preprocess text
-        processed_text = self.preprocess_text(text)
-        
-        self.resume_texts.append(processed_text)
-        self.resume_names.append(filename)
-    
-    def calculate_scores(self):
-        """Calculate similarity scores for all resumes"""
-        if not self.resume_texts:
-            return []
-        
-        # Combine job description with resume texts for vectorization
-        all_documents = [self.job_description] + self.resume_texts
-        
-        # Calculate TF-IDF vectors
-        tfidf_vectors, all_terms = self.calculate_tf_idf_scores(all_documents)
-        
-        # Calculate cosine similarity between job description and each resume
-        job_vector = tfidf_vectors[0]
-        resume_vectors = tfidf_vectors[1:]
-        
-        similarities = []
-        for resume_vector in resume_vectors:
-            similarity = self.cosine_similarity(job_vector, resume_vector, all_terms)
-            similarities.append(similarity)
-        
-        # Calculate keyword-based scores
-        keyword_scores = []
-        for resume_text in self.resume_texts:
-            score = 0
-            for keyword, weight in self.job_keywords.items():
-                if keyword in resume_text:
-                    score += weight
-            keyword_scores.append(score)
-        
-        # Normalize keyword scores
-        if keyword_scores:
-            max_keyword_score = max(keyword_scores)
-            if max_keyword_score > 0:
-                keyword_scores = [score / max_keyword_score for score in keyword_scores]
-        
-        # Combine similarity and keyword scores
-        final_scores = []
-        for i in range(len(similarities)):
-            combined_score = (similarities[i] * 0.7) + (keyword_scores[i] * 0.3)
-            final_scores.append(combined_score)
-        
-        return final_scores
-    
-    def rank_resumes(self):
-        """Rank resumes and return results"""
-        scores = self.calculate_scores()
-        
-        # Create results with ranking
-        results = []
-        for i, (name, score) in enumerate(zip(self.resume_names, scores)):
-            results.append({
-                'rank': i + 1,
-                'filename': name,
-                'score': round(score * 100, 2),
-                'similarity_percentage': round(score * 100, 2)
-            })
-        
-        # Sort by score (descending)
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Update ranks after sorting
-        for i, result in enumerate(results):
-            result['rank'] = i + 1
-        
-        return results
-
-# Initialize the ranker
-ranker = BasicResumeRanker()
-
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/upload', methods=['POST'])
-def upload_resumes():
-    if 'resumes' not in request.files:
-        return jsonify({'error': 'No files uploaded'}), 400
-    
-    files = request.files.getlist('resumes')
-    uploaded_files = []
-    
-    for file in files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Add to ranker
-            ranker.add_resume(filepath, filename)
-            uploaded_files.append(filename)
-    
-    return jsonify({
-        'message': f'Successfully uploaded {len(uploaded_files)} files',
-        'files': uploaded_files
-    })
-
-@app.route('/set-job-description', methods=['POST'])
-def set_job_description():
-    data = request.get_json()
-    job_description = data.get('job_description', '')
-    keywords = data.get('keywords', {})
-    
-    ranker.set_job_description(job_description, keywords)
-    
-    return jsonify({'message': 'Job description set successfully'})
-
-@app.route('/rank', methods=['POST'])
-def rank_resumes():
-    if not ranker.resume_texts:
-        return jsonify({'error': 'No resumes uploaded'}), 400
-    
-    if not hasattr(ranker, 'job_description') or not ranker.job_description:
-        return jsonify({'error': 'No job description set'}), 400
-    
-    results = ranker.rank_resumes()
-    
-    return jsonify({
-        'results': results,
-        'total_resumes': len(results)
-    })
-
-@app.route('/download-report', methods=['POST'])
-def download_report():
-    data = request.get_json()
-    results = data.get('results', [])
-    
-    # Create Excel report
-    df = pd.DataFrame(results)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Resume Rankings', index=False)
-        
-        # Add summary sheet
-        summary_data = {
-            'Metric': ['Total Resumes', 'Average Score', 'Highest Score', 'Lowest Score'],
-            'Value': [
-                len(results),
-                round(df['score'].mean(), 2) if len(results) > 0 else 0,
-                round(df['score'].max(), 2) if len(results) > 0 else 0,
-                round(df['score'].min(), 2) if len(results) > 0 else 0
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-    
-    output.seek(0)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"resume_rankings_{timestamp}.xlsx"
-    
-    return send_file(
-        output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name=filename
-    )
-
-@app.route('/reset', methods=['POST'])
-def reset():
-    global ranker
-    ranker = BasicResumeRanker()
-    
-    # Clear uploaded files
-    for filename in os.listdir(app.config['UPLOAD_FOLDER']):
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-    
-    return jsonify({'message': 'System reset successfully'})
-
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080)
+import os
+import json
+import atexit
+from flask import Flask, Response, g, request, jsonify, render_template, send_file, url_for
+from flask_cors import CORS
+from werkzeug.utils import secure_filename
+import tempfile
+import time
+import multiprocessing
+from datetime import datetime
+from near_duplicates import duplicate_groups
+from job_query import JobQueryCache
+from extraction_cache import ExtractionCache
+from extraction_pool import ExtractionPool
+from ingestion_jobs import IngestionQueue
+from workspaces import WorkspaceRegistry, is_valid_workspace_id
+from text_extraction import preprocess_version
+from metrics import metrics, span, server_timing
+from resume_ranker import (
+    BasicResumeRanker, allowed_file, EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, EXTRACTION_MAX_PAGES,
+    EXTRACTION_MAX_BYTES, INGESTION_BATCH_SIZE
+)
+from ranking_report import (
+    RankingStore, REPORT_COLUMNS, REPORT_FORMATS, HAS_PARQUET, ranking_id_of, ranking_rows,
+    write_xlsx, write_parquet, csv_chunks, jsonl_chunks
+)
+
+app = Flask(__name__)
+CORS(app)
+
+# Configuration
+UPLOAD_FOLDER = 'uploads'
+app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+
+# Persistent index (SQLite + memory-mapped arrays) reopened on start-up
+INDEX_FOLDER = 'index'
+app.config['INDEX_FOLDER'] = INDEX_FOLDER
+
+# Named workspaces, each with its own uploads and index, under /w/<id>/...;
+# the unprefixed routes serve the default workspace in the folders above
+WORKSPACES_FOLDER = 'workspaces'
+DEFAULT_WORKSPACE = 'default'
+app.config['WORKSPACES_FOLDER'] = WORKSPACES_FOLDER
+
+# Workspaces kept in memory, idle ones beyond this are unloaded to disk
+MAX_LOADED_WORKSPACES = int(os.environ.get('MAX_LOADED_WORKSPACES', 16))
+
+# Set by serve.py: worker processes map the saved index read-only and share
+# it, writes go through a lock on the index folder
+SHARED_INDEX = os.environ.get('SHARED_INDEX', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Seconds between two saves of the index for single uploads and removals;
+# each save rewrites the whole index, see Workspace.save. Shared indexes are
+# always saved at once
+INDEX_SAVE_INTERVAL = float(os.environ.get('INDEX_SAVE_INTERVAL', 5))
+
+# Content-addressed cache of extracted resume text, shared across resets
+EXTRACTION_CACHE_FOLDER = 'cache'
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+app.config['EXTRACTION_CACHE_FOLDER'] = EXTRACTION_CACHE_FOLDER
+
+# Compiled job descriptions kept across /rank calls and resets
+JOB_CACHE_SIZE = int(os.environ.get('JOB_CACHE_SIZE', 256))
+
+# Rankings whose report can be downloaded by id, per process
+RANKING_CACHE_SIZE = int(os.environ.get('RANKING_CACHE_SIZE', 32))
+
+# Requests with this header (or ?profile=1) get a Server-Timing header
+# with the time spent in each stage of the request
+PROFILE_HEADER = 'X-Profile'
+
+# Create upload folder if it doesn't exist
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+def truncated_files(extracted):
+    """Report the extract_resumes entries cut short by the extraction limits"""
+    return [{'filename': filename, **truncation}
+            for _, filename, _, _, truncation in extracted if truncation is not None]
+
+def is_true(value):
+    """Read a boolean flag from a form field or query parameter"""
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+def create_ranker():
+    return BasicResumeRanker(extraction_cache=extraction_cache, extraction_pool=extraction_pool,
+                             job_cache=job_cache)
+
+extraction_cache = ExtractionCache(
+    app.config['EXTRACTION_CACHE_FOLDER'],
+    EXTRACTION_CACHE_MAX_BYTES,
+    # Entries extracted under other limits may be truncated differently
+    f'{preprocess_version()}-{EXTRACTION_MAX_PAGES}-{EXTRACTION_MAX_BYTES}'
+)
+job_cache = JobQueryCache(JOB_CACHE_SIZE)
+rankings = RankingStore(RANKING_CACHE_SIZE)
+extraction_pool = ExtractionPool(EXTRACTION_WORKERS, EXTRACTION_TIMEOUT) if EXTRACTION_WORKERS > 0 else None
+
+def ingest_batch(job, files):
+    """Extract a batch of an upload job outside the workspace lock, then index it"""
+    with workspaces.use(job.context) as workspace:
+        resets = workspace.resets
+        extracted, failures = workspace.ranker.extract_resumes(files)
+        with workspace.writing(keep=True) as ranker:
+            if job.cancelled or workspace.resets != resets:
+                # Reset while the batch was being extracted
+                return None
+            duplicates = ranker.insert_resumes(extracted)
+            if workspace.shared_index:
+                # Other processes only see what has been saved
+                workspace.save(ranker)
+    for _, filename, _, _, truncation in extracted:
+        if truncation is not None:
+            job.record_truncation(filename, truncation)
+    for duplicate in duplicates:
+        job.record_duplicate(duplicate)
+    return failures
+
+def finish_ingestion_job(job):
+    with workspaces.use(job.context) as workspace, workspace.writing() as ranker:
+        if not workspace.shared_index:
+            workspace.save(ranker)
+
+ingestion_queue = IngestionQueue(ingest_batch, finish_ingestion_job, INGESTION_BATCH_SIZE)
+
+# Workspaces are loaded from their index lazily, picking up any upload that
+# changed while they were unloaded; those with upload jobs stay in memory
+workspaces = WorkspaceRegistry(
+    app.config['WORKSPACES_FOLDER'],
+    create_ranker,
+    MAX_LOADED_WORKSPACES,
+    folders={DEFAULT_WORKSPACE: (app.config['UPLOAD_FOLDER'], app.config['INDEX_FOLDER'])},
+    is_busy=lambda workspace_id: bool(ingestion_queue.active_jobs(workspace_id)),
+    # Cached rankings hold snapshots, and so the index, of the workspace
+    on_evict=rankings.discard,
+    shared_index=SHARED_INDEX,
+    save_interval=INDEX_SAVE_INTERVAL
+)
+# Deferred saves are written on exit too, sync_folder recovers them otherwise
+atexit.register(workspaces.flush_all)
+
+def workspace_gauge(read):
+    """Collector of read(snapshot) for every loaded workspace, labelled by workspace"""
+    return lambda: {(('workspace', workspace_id),): read(snapshot)
+                    for workspace_id, snapshot in workspaces.snapshots().items()}
+
+metrics.collect('documents', 'Resumes in the index of each loaded workspace',
+                workspace_gauge(lambda snapshot: len(snapshot.resume_tokens)))
+metrics.collect('vocabulary_size', 'Distinct terms in the vocabulary of each loaded workspace',
+                workspace_gauge(lambda snapshot: len(snapshot.vocabulary)))
+metrics.collect('index_version', 'Version of the published index of each loaded workspace',
+                workspace_gauge(lambda snapshot: snapshot.index.version))
+metrics.collect('workspaces_loaded', 'Workspaces held in memory', lambda: workspaces.stats()['loaded'])
+metrics.collect('workspace_evictions_total', 'Idle workspaces unloaded to disk',
+                lambda: workspaces.evictions, 'counter')
+metrics.collect('extraction_cache_hits_total', 'Extraction cache lookups that hit',
+                lambda: extraction_cache.hits, 'counter')
+metrics.collect('extraction_cache_misses_total', 'Extraction cache lookups that missed',
+                lambda: extraction_cache.misses, 'counter')
+metrics.collect('job_cache_hits_total', 'Compiled job lookups that hit', lambda: job_cache.hits, 'counter')
+metrics.collect('job_cache_misses_total', 'Compiled job lookups that missed', lambda: job_cache.misses, 'counter')
+
+# Extraction workers started with spawn re-import this module, only the
+# main process owns the index; warm start the default workspace
+if multiprocessing.parent_process() is None:
+    with workspaces.use(DEFAULT_WORKSPACE):
+        pass
+
+def workspace_route(rule, **options):
+    """Register a view under rule for the default workspace and under /w/<workspace_id>/rule"""
+    def decorator(view):
+        app.route(rule, defaults={'workspace_id': DEFAULT_WORKSPACE}, **options)(view)
+        return app.route('/w/<workspace_id>' + rule, **options)(view)
+    return decorator
+
+@app.before_request
+def start_request_timing():
+    g.request_start = time.perf_counter()
+    # A request that failed before its after_request may have left a profile
+    metrics.stop_profile()
+    if is_true(request.headers.get(PROFILE_HEADER, request.args.get('profile'))):
+        metrics.start_profile()
+
+@app.after_request
+def record_request(response):
+    elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+    endpoint = request.endpoint or 'unknown'
+    metrics.inc('requests_total', endpoint=endpoint, status=response.status_code)
+    metrics.observe('request_duration_seconds', elapsed, endpoint=endpoint)
+    profile = metrics.stop_profile()
+    if profile is not None:
+        profile['total'] = elapsed
+        response.headers['Server-Timing'] = server_timing(profile)
+    return response
+
+@app.before_request
+def check_workspace_id():
+    workspace_id = (request.view_args or {}).get('workspace_id')
+    if workspace_id is not None and not is_valid_workspace_id(workspace_id):
+        return jsonify({'error': 'Invalid workspace id'}), 404
+
+@workspace_route('/')
+def index(workspace_id):
+    api_base = '' if workspace_id == DEFAULT_WORKSPACE else f'/w/{workspace_id}'
+    return render_template('index.html', api_base=api_base)
+
+@workspace_route('/upload', methods=['POST'])
+def upload_resumes(workspace_id):
+    if 'resumes' not in request.files:
+        return jsonify({'error': 'No files uploaded'}), 400
+    
+    with workspaces.use(workspace_id) as workspace:
+        files = request.files.getlist('resumes')
+        saved_files = []
+        
+        for file in files:
+            if file and allowed_file(file.filename):
+                filename = secure_filename(file.filename)
+                filepath = os.path.join(workspace.upload_folder, filename)
+                file.save(filepath)
+                saved_files.append((filepath, filename))
+        
+        if is_true(request.form.get('async', request.args.get('async'))):
+            # Index in the background and let the client poll the job
+            job = ingestion_queue.submit(saved_files, workspace_id)
+            return jsonify({
+                'message': f'Queued {len(job.files)} files for indexing',
+                'job_id': job.id,
+                'status_url': url_for('job_status', workspace_id=workspace_id, job_id=job.id)
+            }), 202
+        
+        # Add to ranker, extracting the files in parallel
+        extracted, failures = workspace.ranker.extract_resumes(saved_files)
+        with workspace.writing() as ranker:
+            duplicates = ranker.insert_resumes(extracted)
+            workspace.save(ranker, defer=True)
+    
+    uploaded_files = [filename for _, filename in saved_files if filename not in failures]
+    return jsonify({
+        'message': f'Successfully uploaded {len(uploaded_files)} files',
+        'files': uploaded_files,
+        'failed': [{'filename': filename, 'error': error} for filename, error in failures.items()],
+        'truncated': truncated_files(extracted),
+        'duplicates': duplicates
+    })
+
+@workspace_route('/jobs/<job_id>', methods=['GET'])
+def job_status(workspace_id, job_id):
+    job = ingestion_queue.get(job_id)
+    if job is None or job.context != workspace_id:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict(include_files=is_true(request.args.get('files', '1'))))
+
+@workspace_route('/remove-resume', methods=['POST'])
+def remove_resume(workspace_id):
+    data = request.get_json()
+    filename = secure_filename(data.get('filename', ''))
+    
+    with workspaces.use(workspace_id) as workspace, workspace.writing() as ranker:
+        if not ranker.remove_resume(filename):
+            return jsonify({'error': 'Resume not found'}), 404
+        workspace.save(ranker, defer=True)
+        
+        file_path = os.path.join(workspace.upload_folder, filename)
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+    
+    return jsonify({'message': f'Removed {filename}'})
+
+@workspace_route('/duplicates', methods=['GET'])
+def duplicates_report(workspace_id):
+    """Near-duplicate resumes grouped under the resume they duplicate"""
+    with workspaces.use(workspace_id) as workspace:
+        ranker = workspace.ranker
+        duplicates = ranker.snapshot.duplicates
+
+    return jsonify({
+        'mode': ranker.duplicate_mode,
+        'threshold': ranker.duplicate_threshold,
+        'total_duplicates': len(duplicates),
+        'collapsed': sum(duplicate.collapsed for duplicate in duplicates.values()),
+        'groups': duplicate_groups(duplicates.values())
+    })
+
+@workspace_route('/set-job-description', methods=['POST'])
+def set_job_description(workspace_id):
+    data = request.get_json()
+    job_description = data.get('job_description', '')
+    keywords = data.get('keywords', {})
+    
+    with workspaces.use(workspace_id) as workspace, workspace.lock:
+        workspace.set_job_description(job_description, keywords)
+        # Keywords with words too short to be indexed, which never match
+        ignored = workspace.ranker.job_query.matcher.ignored
+    
+    return jsonify({'message': 'Job description set successfully', 'ignored_keywords': ignored})
+
+def optional_number(data, name, cast):
+    """Read an optional numeric parameter from the JSON body or query string"""
+    value = data.get(name, request.args.get(name))
+    if value is None or value == '':
+        return None
+    return cast(value)
+
+def ingestion_status(workspace_id):
+    """Files of running upload jobs that are not in the rankings yet"""
+    jobs = [job.to_dict(include_files=False) for job in ingestion_queue.active_jobs(workspace_id)]
+    return {
+        'active_jobs': [job['job_id'] for job in jobs],
+        'pending_files': sum(job['total_files'] - job['processed_files'] for job in jobs)
+    }
+
+@workspace_route('/rank', methods=['POST'])
+def rank_resumes(workspace_id):
+    data = request.get_json(silent=True) or {}
+    try:
+        top_k = optional_number(data, 'top_k', int)
+        offset = optional_number(data, 'offset', int) or 0
+        min_score = optional_number(data, 'min_score', float)
+        wait_timeout = optional_number(data, 'wait_timeout', float)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k, offset, min_score and wait_timeout must be numbers'}), 400
+    
+    if (top_k is not None and top_k < 0) or offset < 0:
+        return jsonify({'error': 'top_k and offset must not be negative'}), 400
+    
+    # Either rank what has been indexed so far or wait for an upload job
+    wait_for_job = data.get('wait_for_job', request.args.get('wait_for_job'))
+    if wait_for_job:
+        job = ingestion_queue.get(wait_for_job)
+        if job is None or job.context != workspace_id:
+            return jsonify({'error': 'Job not found'}), 404
+        job.wait(wait_timeout)
+    
+    # Rank the last published snapshot, uploads carry on meanwhile
+    with workspaces.use(workspace_id) as workspace:
+        snapshot = workspace.ranker.snapshot
+        if not snapshot.resume_tokens:
+            return jsonify({'error': 'No resumes uploaded', 'ingestion': ingestion_status(workspace_id)}), 400
+        
+        if not snapshot.job_query.job_description:
+            return jsonify({'error': 'No job description set'}), 400
+        
+        ranking = snapshot.rank_page(top_k, offset, min_score,
+                                     is_true(data.get('exhaustive', request.args.get('exhaustive'))),
+                                     is_true(data.get('recall', request.args.get('recall'))))
+    
+    # The full ranking can be downloaded as a report without posting it back
+    ranking['ranking_id'] = rankings.put(workspace_id, snapshot)
+    ranking['report_url'] = url_for('ranking_report', workspace_id=workspace_id,
+                                    ranking_id=ranking['ranking_id'])
+    ranking['ingestion'] = ingestion_status(workspace_id)
+    with span('serialize'):
+        return jsonify(ranking)
+
+@workspace_route('/rank-batch', methods=['POST'])
+def rank_batch(workspace_id):
+    data = request.get_json(silent=True) or {}
+    jobs = data.get('jobs', [])
+    try:
+        top_k = optional_number(data, 'top_k', int)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k must be a number'}), 400
+    
+    if top_k is not None and top_k < 0:
+        return jsonify({'error': 'top_k must not be negative'}), 400
+    
+    with workspaces.use(workspace_id) as workspace:
+        ranker = workspace.ranker
+        if not ranker.snapshot.resume_tokens:
+            return jsonify({'error': 'No resumes uploaded'}), 400
+        
+        if (not jobs or not isinstance(jobs, list)
+                or not all(isinstance(job, dict) and job.get('job_description') for job in jobs)):
+            return jsonify({'error': 'Every job needs a job_description'}), 400
+        
+        ranking = ranker.rank_many(
+            jobs,
+            top_k=10 if top_k is None else top_k,
+            best_job_per_candidate=bool(data.get('best_job_per_candidate', False))
+        )
+    
+    with span('serialize'):
+        return jsonify(ranking)
+
+@workspace_route('/report/<ranking_id>', methods=['GET'])
+def ranking_report(workspace_id, ranking_id):
+    """Every resume of a ranking returned by /rank as an Excel, CSV, JSON Lines or Parquet file"""
+    report_format = request.args.get('format', 'xlsx').lower()
+    if report_format not in REPORT_FORMATS:
+        return jsonify({'error': f'format must be one of {", ".join(REPORT_FORMATS)}'}), 400
+    if report_format == 'parquet' and not HAS_PARQUET:
+        return jsonify({'error': 'Parquet reports need pyarrow'}), 400
+    try:
+        min_score = optional_number({}, 'min_score', float)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'min_score must be a number'}), 400
+    
+    snapshot = rankings.get(workspace_id, ranking_id)
+    if snapshot is None:
+        # Ranked by another worker process, or evicted: the current version
+        # of the corpus and job still has the same id
+        with workspaces.use(workspace_id) as workspace:
+            current = workspace.ranker.snapshot
+        if current.resume_tokens and ranking_id_of(current) == ranking_id:
+            snapshot = current
+    if snapshot is None:
+        return jsonify({'error': 'Ranking not found, rank the resumes again'}), 404
+    
+    rows = ranking_rows(snapshot, min_score)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"resume_rankings_{timestamp}.{report_format}"
+    
+    if report_format in ('csv', 'jsonl'):
+        # Sent chunk by chunk as the rows are ranked
+        chunks = csv_chunks(rows) if report_format == 'csv' else jsonl_chunks(rows)
+        return Response(chunks, mimetype=REPORT_FORMATS[report_format],
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+    
+    # Zip based formats need the whole file, written to disk rather than memory
+    output = tempfile.TemporaryFile()
+    with span('report'):
+        if report_format == 'parquet':
+            write_parquet(rows, output)
+        else:
+            write_xlsx(rows, output)
+    output.seek(0)
+    
+    return send_file(
+        output,
+        mimetype=REPORT_FORMATS[report_format],
+        as_attachment=True,
+        download_name=filename
+    )
+
+@workspace_route('/download-report', methods=['POST'])
+def download_report(workspace_id):
+    """Excel report of results posted by the client, see /report/<ranking_id>"""
+    data = request.get_json()
+    results = data.get('results', [])
+    
+    columns = list(results[0]) if results else REPORT_COLUMNS
+    rows = ([result.get(column) for column in columns] for result in results)
+    output = tempfile.TemporaryFile()
+    with span('report'):
+        write_xlsx(rows, output, columns, columns.index('score') if 'score' in columns else None)
+    output.seek(0)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"resume_rankings_{timestamp}.xlsx"
+    
+    return send_file(
+        output,
+        mimetype=REPORT_FORMATS['xlsx'],
+        as_attachment=True,
+        download_name=filename
+    )
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Liveness: the process answers requests"""
+    return jsonify({
+        'status': 'ok',
+        'pid': os.getpid(),
+        'shared_index': SHARED_INDEX,
+        'workspaces': workspaces.stats()
+    })
+
+@workspace_route('/ready', methods=['GET'])
+def ready(workspace_id):
+    """Readiness: the workspace index is loaded, with its version and size"""
+    try:
+        with workspaces.use(workspace_id) as workspace:
+            stats = workspace.index_stats()
+    except Exception as e:
+        print(f"Index of workspace {workspace_id} not ready: {e}")
+        return jsonify({'status': 'unavailable', 'workspace_id': workspace_id, 'error': str(e)}), 503
+    
+    return jsonify(dict(stats, status='ready', workspace_id=workspace_id, pid=os.getpid(),
+                        shared_index=SHARED_INDEX))
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Counters, stage timings and corpus sizes of this process for Prometheus"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify(dict(extraction_cache.stats(), job_cache=job_cache.stats()))
+
+@app.route('/workspaces', methods=['GET'])
+def list_workspaces():
+    return jsonify({'workspaces': workspaces.list_workspaces(), **workspaces.stats()})
+
+@app.route('/w/<workspace_id>', methods=['DELETE'])
+def delete_workspace(workspace_id):
+    ingestion_queue.cancel_all(workspace_id)
+    for job in ingestion_queue.active_jobs(workspace_id):
+        job.wait()
+    if not workspaces.delete(workspace_id):
+        return jsonify({'error': 'Workspace is in use'}), 409
+    rankings.discard(workspace_id)
+    return jsonify({'message': f'Deleted workspace {workspace_id}'})
+
+@workspace_route('/reset', methods=['POST'])
+def reset(workspace_id):
+    ingestion_queue.cancel_all(workspace_id)
+    with workspaces.use(workspace_id) as workspace, workspace.lock:
+        workspace.reset()
+    rankings.discard(workspace_id)
+    
+    return jsonify({'message': 'System reset successfully'})
+
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0', port=8080)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Batch Ranking for AI-Powered Resume Ranker
+Ranks a folder of resumes, or the files matching a glob, against every job
+of a job descriptions file without the web app, for nightly runs over large
+folders. Files are streamed in batches through the extraction pool, so
+memory holds one batch of extracted text on top of the index, and every
+core extracts. The index folder is the checkpoint: it is saved every
+--checkpoint-every resumes, and a run started again after a crash skips the
+files already indexed with the same size and mtime, or SHA-256, like
+sync_folder. Each job is written as a CSV, JSON Lines, Parquet or Excel
+file in the output folder; jobs already written for the same index and
+options are skipped too.
+
+Usage: python batch_rank.py RESUMES JOBS [--index batch_index] [--output rankings] [--format csv] [--top-k N]
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+from itertools import islice
+
+from werkzeug.utils import secure_filename
+
+from resume_ranker import (
+    BasicResumeRanker, allowed_file, EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, INGESTION_BATCH_SIZE,
+    SCORING, SCORING_MODES, DUPLICATE_MODE, DUPLICATE_MODES
+)
+from extraction_pool import ExtractionPool
+from index_store import file_sha256, writer_lock
+from ranking_report import (
+    REPORT_FORMATS, HAS_PARQUET, ranking_rows, csv_chunks, jsonl_chunks, write_parquet, write_xlsx
+)
+
+# Configuration, overridable through the environment or the command line
+BATCH_INDEX_FOLDER = os.environ.get('BATCH_INDEX_FOLDER', 'batch_index')
+BATCH_OUTPUT_FOLDER = os.environ.get('BATCH_OUTPUT_FOLDER', 'rankings')
+# Resumes indexed between two saves of the index; each save writes the whole
+# snapshot, so small values slow large runs down
+BATCH_CHECKPOINT_EVERY = int(os.environ.get('BATCH_CHECKPOINT_EVERY', 1000))
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def resume_files(source):
+    """(file_path, filename) of the resumes in a folder or matching a glob, in path order
+
+    Sorting only holds the paths, and keeps the upload order, which breaks
+    ties between equal scores, the same from one run to the next.
+    """
+    if os.path.isdir(source):
+        with os.scandir(source) as entries:
+            paths = sorted(entry.path for entry in entries if entry.is_file())
+    else:
+        paths = sorted(path for path in glob.iglob(source, recursive=True) if os.path.isfile(path))
+    for path in paths:
+        filename = os.path.basename(path)
+        if allowed_file(filename):
+            yield path, filename
+
+
+def load_jobs(path):
+    """[{'title', 'job_description', 'keywords'}] of a job descriptions file
+
+    JSON files hold the jobs of a /rank-batch request, as a list or under
+    'jobs'. Text files are laid out like sample_job_descriptions.txt: a
+    'JOB TITLE:' line per job, then its description and optionally a
+    'KEYWORDS:' section of 'keyword: weight' lines. Raises ValueError when
+    a job cannot be read.
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+
+    if path.lower().endswith('.json'):
+        data = json.loads(text)
+        jobs = data.get('jobs', []) if isinstance(data, dict) else data
+        if not all(isinstance(job, dict) and job.get('job_description') for job in jobs):
+            raise ValueError("Every job needs a job_description")
+        return [{'title': job.get('title') or f'job {number}', 'job_description': job['job_description'],
+                 'keywords': job.get('keywords')} for number, job in enumerate(jobs, start=1)]
+
+    # Rules of '=' or '-' only separate the jobs and their parts
+    text = re.sub(r'^\s*[=-]{3,}\s*$', '', text, flags=re.MULTILINE)
+    if 'JOB TITLE:' in text:
+        sections = text.split('JOB TITLE:')[1:]
+    else:
+        sections = [os.path.splitext(os.path.basename(path))[0] + '\n' + text]
+
+    jobs = []
+    for section in sections:
+        title, _, body = section.partition('\n')
+        description, _, keyword_lines = body.partition('KEYWORDS:')
+        description = description.replace('DESCRIPTION:', '', 1).strip()
+        if not description:
+            raise ValueError(f"Job '{title.strip()}' has no description")
+
+        keywords = {}
+        for line in keyword_lines.splitlines():
+            if not line.strip():
+                continue
+            keyword, _, weight = line.rpartition(':')
+            try:
+                keywords[keyword.strip()] = float(weight)
+            except ValueError:
+                raise ValueError(f"Job '{title.strip()}' has a keyword line without a weight: {line.strip()}")
+        jobs.append({'title': title.strip(), 'job_description': description, 'keywords': keywords or None})
+    return jobs
+
+
+def changed_files(ranker, files, known, seen, counts):
+    """The files to extract, skipping those stored with the same size and mtime or SHA-256"""
+    for file_path, filename in files:
+        if filename in seen:
+            print(f"Skipping {file_path}: another {filename} was already indexed")
+            continue
+        seen.add(filename)
+
+        stats = known.get(filename)
+        if stats is not None:
+            size, mtime, sha256 = stats
+            stat = os.stat(file_path)
+            if size == stat.st_size and mtime == stat.st_mtime:
+                counts['unchanged'] += 1
+                continue
+            if file_sha256(file_path) == sha256:
+                ranker.store.touch_document(filename, stat.st_size, stat.st_mtime)
+                counts['unchanged'] += 1
+                counts['touched'] += 1
+                continue
+        yield file_path, filename
+
+
+def ingest(ranker, source, batch_size, checkpoint_every):
+    """Bring the index in line with the resumes of source, saving it every checkpoint_every resumes
+
+    Resumes that are no longer in source are removed at the end. Returns
+    the counts of indexed, unchanged, failed and removed resumes.
+    """
+    known = ranker.store.document_stats()
+    seen = set()
+    counts = {'indexed': 0, 'unchanged': 0, 'touched': 0, 'failed': 0, 'removed': 0}
+    files = changed_files(ranker, resume_files(source), known, seen, counts)
+    start = time.perf_counter()
+    pending = 0
+
+    batch = list(islice(files, batch_size))
+    while batch:
+        extracted, failures = ranker.extract_resumes(batch)
+        ranker.insert_resumes(extracted)
+        for filename, error in failures.items():
+            print(f"Error indexing {filename}: {error}")
+        counts['indexed'] += len(extracted)
+        counts['failed'] += len(failures)
+
+        pending += len(batch)
+        if pending >= checkpoint_every:
+            ranker.save_index()
+            pending = 0
+            print(f"Checkpoint: {counts['indexed']} indexed, {counts['unchanged']} unchanged, "
+                  f"{counts['failed']} failed, {counts['indexed'] / (time.perf_counter() - start):.1f} resumes/s")
+        batch = list(islice(files, batch_size))
+
+    for filename in known.keys() - seen:
+        ranker.remove_resume(filename)
+        counts['removed'] += 1
+
+    # New stats of touched files are only committed with a save as well
+    if pending or counts['removed'] or counts['touched']:
+        ranker.save_index()
+    return counts
+
+
+def write_ranking(snapshot, path, report_format, top_k, min_score):
+    """Write the ranking of a snapshot to path, replacing it only once complete"""
+    rows = ranking_rows(snapshot, min_score, top_k)
+    temporary = path + '.tmp'
+    if report_format in ('csv', 'jsonl'):
+        chunks = csv_chunks(rows) if report_format == 'csv' else jsonl_chunks(rows)
+        with open(temporary, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    else:
+        with open(temporary, 'wb') as f:
+            if report_format == 'parquet':
+                write_parquet(rows, f)
+            else:
+                write_xlsx(rows, f)
+    os.replace(temporary, path)
+
+
+def load_manifest(path):
+    """{output filename: ranking} of the rankings written so far"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def rank_jobs(ranker, jobs, output, report_format, top_k, min_score):
+    """Write the ranking of every job, skipping those written for the same index and options"""
+    os.makedirs(output, exist_ok=True)
+    manifest_path = os.path.join(output, MANIFEST_FILENAME)
+    manifest = load_manifest(manifest_path)
+    generation = ranker.store.generation()
+
+    for number, job in enumerate(jobs, start=1):
+        filename = f"{number:02d}_{secure_filename(job['title']) or 'job'}.{report_format}"
+        path = os.path.join(output, filename)
+        ranker.set_job_description(job['job_description'], job['keywords'])
+        if ranker.job_query.matcher.ignored:
+            print(f"{job['title']}: ignoring keywords with words of two characters or less: "
+                  f"{', '.join(ranker.job_query.matcher.ignored)}")
+        ranking = {'generation': generation, 'job': ranker.job_query.key, 'top_k': top_k, 'min_score': min_score}
+        if manifest.get(filename) == ranking and os.path.exists(path):
+            print(f"{job['title']}: {filename} is up to date")
+            continue
+
+        start = time.perf_counter()
+        write_ranking(ranker.current_snapshot(), path, report_format, top_k, min_score)
+        manifest[filename] = ranking
+        save_manifest(manifest_path, manifest)
+        print(f"{job['title']}: ranked to {filename} in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank a folder of resumes against every job of a job descriptions file')
+    parser.add_argument('resumes', help='folder of resumes, or a glob such as "uploads/**/*.pdf"')
+    parser.add_argument('jobs', help='job descriptions laid out like sample_job_descriptions.txt, '
+                                     'or a JSON list of /rank-batch jobs')
+    parser.add_argument('--index', default=BATCH_INDEX_FOLDER, help='index folder, kept between runs as the checkpoint')
+    parser.add_argument('--output', default=BATCH_OUTPUT_FOLDER, help='folder of the ranking files')
+    parser.add_argument('--format', choices=list(REPORT_FORMATS), default='csv')
+    parser.add_argument('--top-k', type=int, default=None, help='resumes per job, all of them by default')
+    parser.add_argument('--min-score', type=float, default=None, help='lowest score written, in percent')
+    parser.add_argument('--workers', type=int, default=EXTRACTION_WORKERS, help='extraction processes')
+    parser.add_argument('--batch-size', type=int, default=INGESTION_BATCH_SIZE, help='files extracted at a time')
+    parser.add_argument('--checkpoint-every', type=int, default=BATCH_CHECKPOINT_EVERY,
+                        help='resumes indexed between two saves of the index')
+    parser.add_argument('--scoring', choices=SCORING_MODES, default=SCORING)
+    parser.add_argument('--duplicates', choices=DUPLICATE_MODES, default=DUPLICATE_MODE)
+    args = parser.parse_args()
+
+    if args.format == 'parquet' and not HAS_PARQUET:
+        print("Parquet output needs pyarrow: pip install pyarrow")
+        return 1
+    if not os.path.isdir(args.resumes) and not glob.has_magic(args.resumes):
+        print(f"{args.resumes} is neither a folder nor a glob")
+        return 1
+    try:
+        jobs = load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read the jobs in {args.jobs}: {e}")
+        return 1
+    if not jobs:
+        print(f"No jobs in {args.jobs}")
+        return 1
+
+    # Reports rank every resume, so the semantic shortlist is never used
+    pool = ExtractionPool(max(args.workers, 1), EXTRACTION_TIMEOUT)
+    ranker = BasicResumeRanker(extraction_pool=pool, scoring=args.scoring, duplicate_mode=args.duplicates,
+                               semantic=False)
+    try:
+        # Keeps a server or another run from writing the same index meanwhile
+        with writer_lock(args.index):
+            ranker.open_index(args.index)
+            counts = ingest(ranker, args.resumes, max(args.batch_size, 1), max(args.checkpoint_every, 1))
+            print(f"{counts['indexed']} resumes indexed, {counts['unchanged']} unchanged, "
+                  f"{counts['failed']} failed, {counts['removed']} removed, {len(ranker.resume_names)} in the index")
+            if not len(ranker.resume_names):
+                print("No resumes to rank")
+                return 1
+            rank_jobs(ranker, jobs, args.output, args.format, args.top_k, args.min_score)
+    finally:
+        pool.shutdown()
+        if ranker.store is not None:
+            ranker.store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+BM25 Pruning Benchmark for AI-Powered Resume Ranker
+Ranks a synthetic corpus against job-description-like queries with BM25,
+once exhaustively (every resume scored, then select_top) and once with
+MaxScore pruning, checks that both return the same top k with the same
+scores and prints their latencies and how many resumes pruning scored.
+
+The corpus is built straight into the arrays of a saved index and ranked
+through a MappedIndex, as serve.py workers do, since a million resumes do
+not fit in the dicts of a writable index. Resumes follow the model of
+sample_data.SyntheticResumeGenerator: Zipf words and a few skills each.
+Queries mix common words with a handful of repeated skills.
+
+Usage: python benchmarks/bench_bm25.py [--count 1000000] [--top-k 50] [--queries 20] [--pure]
+"""
+
+import os
+import sys
+import time
+import argparse
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bm25
+from bm25 import Bm25Query, bm25_scores, bm25_top
+from mapped_index import MappedIndex
+from top_k import select_top
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM_SKILLS = 150
+CHUNK_RESUMES = 20000
+
+
+def zipf_cumulative(vocabulary_size):
+    weights = 1.0 / np.arange(1, vocabulary_size + 1)
+    cumulative = np.cumsum(weights)
+    return cumulative / cumulative[-1]
+
+
+def chunk_postings(chunk, args, cumulative):
+    """Sorted (term, local doc) keys with their tf, and the lengths of one chunk of resumes"""
+    rng = np.random.default_rng([args.seed, chunk])
+    count = min(CHUNK_RESUMES, args.count - chunk * CHUNK_RESUMES)
+    sigma = args.length_sigma
+    lengths = np.maximum(rng.lognormal(np.log(args.mean_words) - sigma * sigma / 2, sigma, count), 10).astype(np.int64)
+
+    tokens = np.searchsorted(cumulative, rng.random(int(lengths.sum())))
+    docs = np.repeat(np.arange(count), lengths)
+    # A tenth of the words are skills, from 3 to 10 of them per resume
+    skills = np.argsort(rng.random((count, NUM_SKILLS)), axis=1)[:, :10]
+    skill_counts = rng.integers(3, 11, count)
+    replaced = np.flatnonzero(rng.random(len(tokens)) < 0.1)
+    picks = (rng.random(len(replaced)) * skill_counts[docs[replaced]]).astype(np.int64)
+    tokens[replaced] = args.vocabulary_size + skills[docs[replaced], picks]
+
+    keys, tfs = np.unique(tokens * count + docs, return_counts=True)
+    return keys // count, keys % count, tfs, lengths
+
+
+def build_index(args):
+    """MappedIndex over postings arrays of a synthetic corpus, built in two passes of chunks"""
+    cumulative = zipf_cumulative(args.vocabulary_size)
+    num_terms = args.vocabulary_size + NUM_SKILLS
+    num_chunks = -(-args.count // CHUNK_RESUMES)
+
+    # First the postings of every term, to lay them out term by term
+    term_counts = np.zeros(num_terms, dtype=np.int64)
+    for chunk in range(num_chunks):
+        terms, _, _, _ = chunk_postings(chunk, args, cumulative)
+        term_counts += np.bincount(terms, minlength=num_terms)
+    offsets = np.zeros(num_terms + 1, dtype=np.uint64)
+    np.cumsum(term_counts, out=offsets[1:])
+
+    doc_ids = np.empty(int(offsets[-1]), dtype=np.uint32)
+    tfs = np.empty(int(offsets[-1]), dtype=np.uint32)
+    max_tfs = np.zeros(num_terms, dtype=np.uint32)
+    lengths = np.empty(args.count, dtype=np.uint32)
+    filled = offsets[:-1].astype(np.int64)
+    for chunk in range(num_chunks):
+        terms, docs, chunk_tfs, chunk_lengths = chunk_postings(chunk, args, cumulative)
+        start = chunk * CHUNK_RESUMES
+        lengths[start:start + len(chunk_lengths)] = chunk_lengths
+        # Chunks come in doc id order, so every term's postings stay sorted
+        first = np.searchsorted(terms, terms, side='left')
+        positions = filled[terms] + np.arange(len(terms)) - first
+        doc_ids[positions] = docs + start
+        tfs[positions] = chunk_tfs
+        np.maximum.at(max_tfs, terms, chunk_tfs.astype(np.uint32))
+        filled += np.bincount(terms, minlength=num_terms)
+
+    index = MappedIndex(
+        memoryview(offsets), memoryview(doc_ids), memoryview(tfs), memoryview(max_tfs),
+        memoryview(lengths), array('d', bytes(24 * args.count)), b'\x01' * args.count, args.count, 1
+    )
+    return index, memoryview(np.arange(args.count, dtype=np.uint32))
+
+
+def make_queries(args):
+    """{term: count} of job descriptions: common words and a few repeated skills"""
+    rng = np.random.default_rng([args.seed, 1 << 20])
+    cumulative = zipf_cumulative(args.vocabulary_size)
+    queries = []
+    for _ in range(args.queries):
+        weights = {}
+        for term in np.searchsorted(cumulative, rng.random(args.query_words)).tolist():
+            weights[term] = weights.get(term, 0) + 1
+        for skill in rng.choice(NUM_SKILLS, 6, replace=False).tolist():
+            weights[args.vocabulary_size + skill] = int(rng.integers(1, 4))
+        queries.append(weights)
+    return queries
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BM25 top-k with MaxScore pruning against exhaustive scoring')
+    parser.add_argument('--count', type=int, default=1000000, help='resumes in the corpus')
+    parser.add_argument('--vocabulary-size', type=int, default=20000)
+    parser.add_argument('--mean-words', type=int, default=400)
+    parser.add_argument('--length-sigma', type=float, default=0.5)
+    parser.add_argument('--top-k', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=20, help='job descriptions to rank')
+    parser.add_argument('--query-words', type=int, default=40, help='words per job description')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pure', action='store_true', help='rank without NumPy, slow for large corpora')
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy is needed to build the synthetic corpus")
+        return 1
+
+    start = time.perf_counter()
+    index, doc_ids = build_index(args)
+    print(f"{args.count} resumes, {len(index.postings._doc_ids)} postings, "
+          f"built in {time.perf_counter() - start:.1f}s")
+    bm25.HAS_NUMPY = not args.pure
+
+    exhaustive_times, pruned_times, scored, postings = [], [], [], []
+    for weights in make_queries(args):
+        query = Bm25Query(index, weights)
+        start = time.perf_counter()
+        scores = bm25_scores(index, query, doc_ids)
+        exhaustive = [(row, scores[row]) for row in select_top(scores, args.top_k)]
+        exhaustive_times.append(time.perf_counter() - start)
+
+        stats = {}
+        start = time.perf_counter()
+        pruned = bm25_top(index, query, doc_ids, args.top_k, stats=stats)
+        pruned_times.append(time.perf_counter() - start)
+
+        if pruned != exhaustive:
+            print(f"MISMATCH: pruned top {args.top_k} differs from the exhaustive one")
+            return 1
+        scored.append(stats['scored'])
+        postings.append(stats['postings'] / sum(len(index.postings.arrays(term)[0]) for term, _ in query.terms))
+
+    print(f"{args.queries} queries of {args.query_words} words, top {args.top_k}: identical results")
+    for label, times in (('exhaustive', exhaustive_times), ('pruned', pruned_times)):
+        print(f"{label:>10}: p50 {percentile(times, 0.5) * 1000:8.1f} ms   p95 {percentile(times, 0.95) * 1000:8.1f} ms")
+    print(f"pruning fully scored {sum(scored) / len(scored):.0f} resumes per query "
+          f"({sum(scored) / len(scored) / args.count:.3%}) and read "
+          f"{sum(postings) / len(postings):.0%} of the postings of the query terms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
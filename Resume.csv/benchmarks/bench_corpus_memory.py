@@ -0,0 +1,144 @@
+"""
+Corpus Memory Benchmark for AI-Powered Resume Ranker
+Builds the per-resume state of a ranker for a synthetic corpus in two
+layouts and reports the resident memory they take, scaled to 100k resumes:
+'lists' is the layout before the columnar corpus (a token array, filename
+and doc id object per resume in lists, lengths and norm sums in dicts, and
+the tuples every published snapshot froze them into), 'columns' is a
+ResumeCorpus with its snapshot and the DocumentColumns of a ResumeIndex.
+Postings are the same in both layouts and left out. Every layout is built
+in a fresh process, so its resident memory is its own.
+
+Usage: python benchmarks/bench_corpus_memory.py [--count 100000] [--mean-words 400]
+"""
+
+import os
+import sys
+import json
+import math
+import random
+import argparse
+import subprocess
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus_store import ResumeCorpus
+from resume_index import DocumentColumns
+
+LAYOUTS = ['lists', 'columns']
+
+
+def resident_mb():
+    """Resident set size of this process, None where unknown"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current size, which only grows while a layout is built
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def resume_lengths(count, mean_words, seed):
+    """Lognormal resume lengths in tokens, mean_words on average"""
+    rng = random.Random(seed)
+    sigma = 0.5
+    mu = math.log(mean_words) - sigma * sigma / 2
+    return [max(1, int(rng.lognormvariate(mu, sigma))) for _ in range(count)]
+
+
+def filename(doc_id):
+    return f'resume_{doc_id:06d}.pdf'
+
+
+def build_lists(lengths, term_ids):
+    """Lists and dicts of Python objects per resume, as the ranker kept them before"""
+    resume_tokens, resume_names, doc_ids = [], [], []
+    doc_lengths, norm_sums = {}, {}
+    for doc_id, length in enumerate(lengths):
+        # Vocabulary.encode builds each array from a list, so it is sized exactly
+        resume_tokens.append(array('I', term_ids[:length]))
+        resume_names.append(filename(doc_id))
+        doc_ids.append(doc_id)
+        doc_lengths[doc_id] = length
+        norm_sums[doc_id] = [float(length), length * 1.5, length * 2.25]
+    snapshot = (tuple(doc_ids), tuple(resume_names), tuple(resume_tokens))
+    return resume_tokens, resume_names, doc_ids, doc_lengths, norm_sums, snapshot
+
+
+def build_columns(lengths, term_ids):
+    """ResumeCorpus and DocumentColumns holding the same resumes"""
+    corpus = ResumeCorpus()
+    doc_lengths = DocumentColumns.empty('I')
+    norm_sums = DocumentColumns.empty('d', 3)
+    # The writer looks filenames up on every insert, which builds its name dict
+    corpus.row_of(filename(0))
+    for doc_id, length in enumerate(lengths):
+        corpus.append(doc_id, filename(doc_id), array('I', term_ids[:length]))
+        doc_lengths[doc_id] = length
+        norm_sums[doc_id] = (float(length), length * 1.5, length * 2.25)
+    return corpus, doc_lengths, norm_sums, corpus.snapshot()
+
+
+def run_single(layout, args):
+    lengths = resume_lengths(args.count, args.mean_words, args.seed)
+    term_ids = list(range(max(lengths)))
+    before = resident_mb()
+    corpus = (build_lists if layout == 'lists' else build_columns)(lengths, term_ids)
+    after = resident_mb()
+    del corpus
+    return {
+        'layout': layout,
+        'count': args.count,
+        'tokens': sum(lengths),
+        'resident_mb': None if before is None else after - before
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident memory of the per-resume state of a ranker')
+    parser.add_argument('--count', type=int, default=100000, help='resumes to build')
+    parser.add_argument('--mean-words', type=int, default=400, help='average tokens per resume')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--single', choices=LAYOUTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_single(args.single, args)))
+        return 0
+
+    results = []
+    for layout in LAYOUTS:
+        command = [sys.executable, os.path.abspath(__file__), '--single', layout, '--count', str(args.count),
+                   '--mean-words', str(args.mean_words), '--seed', str(args.seed)]
+        completed = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+        if completed.returncode != 0:
+            print(f"Layout {layout} failed with exit code {completed.returncode}")
+            return 1
+        results.append(json.loads(completed.stdout))
+
+    if results[0]['resident_mb'] is None:
+        print("Resident memory is not available on this platform")
+        return 1
+
+    tokens_mb = 4 * results[0]['tokens'] / (1024 * 1024)
+    scale = 100000 / args.count
+    print(f"{args.count} resumes, {results[0]['tokens']} tokens ({tokens_mb:.1f} MB of token ids)")
+    print(f"{'layout':>8} {'MB per 100k':>12} {'overhead per resume':>20}")
+    for entry in results:
+        overhead = (entry['resident_mb'] - tokens_mb) * 1024 * 1024 / args.count
+        print(f"{entry['layout']:>8} {entry['resident_mb'] * scale:>12.1f} {overhead:>18.0f} B")
+    saved = results[0]['resident_mb'] - results[1]['resident_mb']
+    print(f"columns save {saved * scale:.1f} MB per 100k resumes "
+          f"({saved / results[0]['resident_mb']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Keyword Matcher Benchmark for AI-Powered Resume Ranker
+Scores a synthetic corpus against hundreds of recruiter keywords, comparing
+the former `keyword in processed_text` scan of every keyword x resume with the
+compiled KeywordMatcher, checks the matcher against a plain whole-word
+reference and prints both timings.
+
+Usage: python benchmarks/bench_keyword_matcher.py [num_resumes] [num_keywords]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resume_ranker import BasicResumeRanker
+from keyword_matcher import KeywordMatcher
+from tokenizer import tokenize
+from bench_vector_backend import SKILLS, FILLER, write_corpus
+
+
+def make_keywords(num_keywords, seed=7):
+    """Skills, two-word phrases and a few unknown words with random weights"""
+    rng = random.Random(seed)
+    vocabulary = SKILLS + FILLER + [f'skill{i}' for i in range(num_keywords)]
+    keywords = {}
+    while len(keywords) < num_keywords:
+        words = rng.sample(vocabulary, rng.choice([1, 1, 2]))
+        keywords[' '.join(words)] = rng.choice([0.5, 1.0, 1.5, 2.0])
+    return keywords
+
+
+def substring_scores(texts, keywords):
+    """Keyword stage as it was: one substring scan per keyword x resume"""
+    scores = [0] * len(texts)
+    for keyword, weight in keywords.items():
+        for i, text in enumerate(texts):
+            if keyword in text:
+                scores[i] += weight
+    return scores
+
+
+def reference_scores(texts, keywords):
+    """Whole-word and phrase matching spelled out with sets of word n-grams"""
+    phrases = [(tuple(tokenize(keyword)), weight) for keyword, weight in keywords.items()]
+    lengths = {len(phrase) for phrase, _ in phrases if phrase}
+    scores = [0] * len(texts)
+    for i, text in enumerate(texts):
+        words = text.split()
+        ngrams = {tuple(words[j:j + n]) for n in lengths for j in range(len(words) - n + 1)}
+        for phrase, weight in phrases:
+            if phrase and phrase in ngrams:
+                scores[i] += weight
+    return scores
+
+
+def best_time(function, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    num_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    num_keywords = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    keywords = make_keywords(num_keywords)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, num_resumes)
+        ranker = BasicResumeRanker()
+        ranker.add_resumes([(path, os.path.basename(path)) for path in paths])
+
+    texts = [ranker.vocabulary.decode(tokens) for tokens in ranker.resume_tokens]
+
+    def run_matcher():
+        matcher = KeywordMatcher(keywords)
+        return matcher.scores(ranker.vocabulary, ranker.index.postings,
+                              ranker.rows_of_docs(), ranker.resume_tokens)
+
+    _, substring_time = best_time(lambda: substring_scores(texts, keywords))
+    matcher_scores, matcher_time = best_time(run_matcher)
+
+    expected = reference_scores(texts, keywords)
+    max_diff = max((abs(a - b) for a, b in zip(matcher_scores, expected)), default=0.0)
+
+    print(f"{num_resumes} resumes, {num_keywords} keywords: substring scan {substring_time * 1000:.1f} ms, "
+          f"matcher {matcher_time * 1000:.1f} ms, max diff {max_diff:.1e}")
+    return 0 if max_diff < 1e-9 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
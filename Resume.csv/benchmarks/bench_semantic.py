@@ -0,0 +1,96 @@
+"""
+Semantic Retrieval Benchmark for AI-Powered Resume Ranker
+Ranks a synthetic corpus against the sample job descriptions once
+exhaustively and once among the shortlist of the semantic stage (LSA
+embeddings in an IVF index), for int8 and float32 embeddings and a few
+numbers of probed lists, and prints the recall@k of the shortlisted top k
+against the exhaustive one together with the latencies of both paths.
+
+Usage: python benchmarks/bench_semantic.py [--count 20000] [--top-k 10] [--shortlist 1000] [--scoring tfidf]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resume_ranker import BasicResumeRanker
+from sample_data import SyntheticResumeGenerator
+from semantic_index import SemanticRetriever, HAS_SEMANTIC_INDEX, QUANTIZATIONS
+from text_extraction import preprocess_text
+from top_k import select_top
+
+JOB_DESCRIPTIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample_job_descriptions.txt')
+
+
+def load_job_descriptions(path=JOB_DESCRIPTIONS):
+    """Texts of the job descriptions in sample_job_descriptions.txt"""
+    with open(path, encoding='utf-8') as f:
+        return [part.strip() for part in f.read().split('JOB TITLE:')[1:]]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recall and latency of the semantic shortlist against exhaustive ranking')
+    parser.add_argument('--count', type=int, default=20000, help='resumes in the corpus')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--shortlist', type=int, default=1000, help='resumes re-scored per job')
+    parser.add_argument('--dimensions', type=int, default=128)
+    parser.add_argument('--probes', default='4,8,16', help='comma-separated numbers of lists to probe')
+    parser.add_argument('--scoring', choices=['tfidf', 'bm25'], default='tfidf')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not HAS_SEMANTIC_INDEX:
+        print("NumPy and SciPy are not installed, nothing to compare")
+        return 1
+
+    start = time.perf_counter()
+    generator = SyntheticResumeGenerator(seed=args.seed)
+    ranker = BasicResumeRanker(scoring=args.scoring, duplicate_mode='off')
+    ranker.insert_resumes([(None, f'resume_{number:07d}.txt', None, preprocess_text(generator.text(number)), None)
+                           for number in range(args.count)])
+    print(f"{args.count} resumes indexed in {time.perf_counter() - start:.1f}s")
+
+    jobs = load_job_descriptions()
+    expected, exhaustive_times = [], []
+    for job_description in jobs:
+        ranker.set_job_description(job_description)
+        snapshot = ranker.current_snapshot()
+        start = time.perf_counter()
+        scores = snapshot.calculate_scores()
+        expected.append(set(select_top(scores, args.top_k)))
+        exhaustive_times.append(time.perf_counter() - start)
+    print(f"{len(jobs)} jobs, top {args.top_k}, exhaustive: p50 {percentile(exhaustive_times, 0.5) * 1000:.1f} ms")
+
+    for quantization in QUANTIZATIONS:
+        retriever = SemanticRetriever(args.dimensions, quantization, args.shortlist, 0)
+        start = time.perf_counter()
+        semantic = retriever.index_for(ranker.current_snapshot())
+        print(f"{quantization}: fitted {len(semantic.centroids)} lists of {semantic.dimensions} dimensions "
+              f"in {time.perf_counter() - start:.1f}s, {semantic.codes.nbytes / 2 ** 20:.1f} MiB of embeddings")
+
+        for probes in [int(value) for value in args.probes.split(',')]:
+            retriever.probes = probes
+            recalls, times = [], []
+            for job_description, exact in zip(jobs, expected):
+                ranker.set_job_description(job_description)
+                snapshot = ranker.current_snapshot()
+                snapshot.semantic_retriever = retriever
+                start = time.perf_counter()
+                ranked, _ = snapshot.semantic_top(args.top_k)
+                times.append(time.perf_counter() - start)
+                recalls.append(len(exact & {row for row, _ in ranked}) / len(exact))
+            print(f"  {probes:>3} probes: recall@{args.top_k} {sum(recalls) / len(recalls):.3f} "
+                  f"(min {min(recalls):.2f})   p50 {percentile(times, 0.5) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
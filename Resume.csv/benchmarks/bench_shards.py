@@ -0,0 +1,96 @@
+"""
+Sharding Benchmark for AI-Powered Resume Ranker
+Indexes a synthetic corpus in a single BasicResumeRanker and in a
+ShardedRanker for each number of shards, ranks the sample job descriptions
+against all of them, checks that every sharded page holds the resumes and
+scores of the unsharded one and prints indexing time, rank latency and
+throughput per number of shards. Shards rank in parallel processes, so
+throughput can only grow with the shards up to the number of cores.
+
+Usage: python benchmarks/bench_shards.py [--count 20000] [--shards 1,2,4] [--top-k 10] [--queries 30] [--scoring tfidf]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resume_ranker import BasicResumeRanker
+from shards import ShardedRanker
+from sample_data import SyntheticResumeGenerator
+from text_extraction import preprocess_text
+from bench_semantic import load_job_descriptions, percentile
+
+
+def page_entries(page):
+    """(score, filename) of a page, in a tie-independent order"""
+    return sorted((result['score'], result['filename']) for result in page['results'])
+
+
+def time_queries(ranker, jobs, args, exhaustive=None):
+    """Pages of every job and the latency of each of args.queries rankings"""
+    pages, times = [], []
+    for number in range(args.queries):
+        job_description = jobs[number % len(jobs)]
+        ranker.set_job_description(job_description)
+        start = time.perf_counter()
+        if exhaustive is None:
+            page = ranker.rank_page(args.top_k)
+        else:
+            page = ranker.rank_page(args.top_k, exhaustive=exhaustive)
+        times.append(time.perf_counter() - start)
+        pages.append(page_entries(page))
+    return pages, times
+
+
+def report(label, build_time, times):
+    print(f"{label:>10}: indexed in {build_time:6.1f}s   p50 {percentile(times, 0.5) * 1000:7.1f} ms   "
+          f"p95 {percentile(times, 0.95) * 1000:7.1f} ms   {len(times) / sum(times):7.1f} ranks/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded ranking throughput against a single ranker')
+    parser.add_argument('--count', type=int, default=20000, help='resumes in the corpus')
+    parser.add_argument('--shards', default='1,2,4', help='comma-separated numbers of shards')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=30, help='rankings per configuration')
+    parser.add_argument('--scoring', choices=['tfidf', 'bm25'], default='tfidf')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = SyntheticResumeGenerator(seed=args.seed)
+    extracted = [(None, f'resume_{number:07d}.txt', None, preprocess_text(generator.text(number)), None)
+                 for number in range(args.count)]
+    jobs = load_job_descriptions()
+    print(f"{args.count} resumes, {len(jobs)} job descriptions, top {args.top_k}, "
+          f"{args.scoring}, {os.cpu_count()} CPUs")
+
+    # The shards score on the postings path, so the reference does too
+    start = time.perf_counter()
+    ranker = BasicResumeRanker(vector_backend_min_resumes=float('inf'), duplicate_mode='off', scoring=args.scoring)
+    ranker.insert_resumes(extracted)
+    build_time = time.perf_counter() - start
+    expected, times = time_queries(ranker, jobs, args, exhaustive=args.scoring == 'tfidf')
+    report('unsharded', build_time, times)
+    del ranker
+
+    for num_shards in [int(value) for value in args.shards.split(',')]:
+        start = time.perf_counter()
+        sharded = ShardedRanker(num_shards, args.scoring)
+        try:
+            sharded.insert_resumes(extracted)
+            build_time = time.perf_counter() - start
+            pages, times = time_queries(sharded, jobs, args)
+        finally:
+            sharded.shutdown()
+        if pages != expected:
+            print(f"MISMATCH: {num_shards} shards ranked differently from the single ranker")
+            return 1
+        report(f'{num_shards} shards', build_time, times)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Tokenizer Benchmark for AI-Powered Resume Ranker
+Compares the previous two-pass preprocess_text, which returned a joined string
+that was split again for TF-IDF, with the single-pass tokenizer interning
+terms into array('I') token arrays. Checks that both keep the same words and
+prints tokens/sec and the bytes held per resume.
+
+Usage: python benchmarks/bench_tokenizer.py [num_resumes]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tokenizer import Vocabulary, tokenize
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'React.js', 'Angular', 'Node', 'SQL', 'NoSQL',
+    'machine', 'learning', 'TensorFlow', 'PyTorch', 'Docker', 'Kubernetes',
+    'AWS', 'Azure', 'Spring', 'Boot', 'Django', 'Flask', 'pandas', 'Spark'
+]
+FILLER = [
+    'the', 'and', 'with', 'experience', 'team', 'project,', 'developed', 'built',
+    'senior', 'years', 'engineer.', 'I', 'in', 'for', '(2019-2023)', 'e-commerce'
+]
+
+
+def legacy_preprocess_text(text):
+    """preprocess_text as it was before the tokenizer, for comparison"""
+    # Convert to lowercase
+    text = text.lower()
+
+    # Remove special characters and extra whitespace
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove common stop words
+    stop_words = {
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+    }
+
+    words = text.split()
+    filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+
+    return " ".join(filtered_words)
+
+
+def make_corpus(num_resumes, seed=42):
+    """Random raw resume texts with punctuation, casing and stop words"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(num_resumes):
+        words = rng.choices(SKILLS, k=rng.randint(100, 300)) + rng.choices(FILLER, k=rng.randint(200, 600))
+        rng.shuffle(words)
+        corpus.append(' '.join(words))
+    return corpus
+
+
+def run_legacy(corpus):
+    """Preprocess to strings, then split them again as TF-IDF did"""
+    texts = [legacy_preprocess_text(text) for text in corpus]
+    num_tokens = sum(len(text.split()) for text in texts)
+    return texts, num_tokens
+
+
+def run_interned(corpus):
+    vocabulary = Vocabulary()
+    token_arrays = [vocabulary.encode(tokenize(text)) for text in corpus]
+    return vocabulary, token_arrays, sum(len(tokens) for tokens in token_arrays)
+
+
+def best_time(function, corpus, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(corpus)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    num_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = make_corpus(num_resumes)
+
+    (texts, legacy_tokens), legacy_time = best_time(run_legacy, corpus)
+    (vocabulary, token_arrays, interned_tokens), interned_time = best_time(run_interned, corpus)
+
+    for text, tokens in zip(texts, token_arrays):
+        if vocabulary.decode(tokens) != text:
+            print("MISMATCH: tokenizer output differs from the legacy preprocessing")
+            return 1
+
+    # Memory held per resume: the joined string before, the token array after
+    legacy_bytes = sum(sys.getsizeof(text) for text in texts) / num_resumes
+    interned_bytes = sum(sys.getsizeof(tokens) for tokens in token_arrays) / num_resumes
+    vocabulary_bytes = sum(sys.getsizeof(term) for term in vocabulary.terms)
+
+    print(f"{num_resumes} resumes, {interned_tokens} tokens")
+    print(f"legacy:   {legacy_tokens / legacy_time:,.0f} tokens/sec, {legacy_bytes:,.0f} bytes/resume")
+    print(f"interned: {interned_tokens / interned_time:,.0f} tokens/sec, {interned_bytes:,.0f} bytes/resume "
+          f"(+{vocabulary_bytes:,} bytes shared vocabulary of {len(vocabulary)} terms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
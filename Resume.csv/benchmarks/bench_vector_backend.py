@@ -0,0 +1,91 @@
+"""
+Vector Backend Benchmark for AI-Powered Resume Ranker
+Ranks a synthetic corpus with the pure-Python and the CSR scoring paths,
+checks that both produce the same scores and prints their timings.
+
+Usage: python benchmarks/bench_vector_backend.py [num_resumes]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resume_ranker import BasicResumeRanker
+from vector_backend import HAS_VECTOR_BACKEND
+
+SKILLS = [
+    'python', 'java', 'javascript', 'react', 'angular', 'node', 'sql', 'nosql',
+    'machine', 'learning', 'tensorflow', 'pytorch', 'docker', 'kubernetes',
+    'aws', 'azure', 'spring', 'boot', 'django', 'flask', 'pandas', 'spark'
+]
+FILLER = ['experience', 'team', 'project', 'developed', 'built', 'senior', 'years', 'engineer']
+
+JOB_DESCRIPTION = """We are looking for a Senior Python Developer with machine learning
+experience, SQL databases, Docker and AWS. Knowledge of Django or Flask is a plus."""
+KEYWORDS = {'Python': 2.0, 'Machine Learning': 1.5, 'Docker': 1.0, 'SQL': 1.0, 'node': 0.5}
+
+
+def write_corpus(directory, num_resumes, seed=42):
+    """Write num_resumes random text resumes and return their paths"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(num_resumes):
+        words = rng.choices(SKILLS, k=rng.randint(20, 60)) + rng.choices(FILLER, k=rng.randint(20, 80))
+        rng.shuffle(words)
+        path = os.path.join(directory, f'resume_{i}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(' '.join(words))
+        paths.append(path)
+    return paths
+
+
+def time_scores(ranker, repeats=3):
+    """Return the scores and the best wall time of calculate_scores"""
+    best = float('inf')
+    scores = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scores = ranker.calculate_scores()
+        best = min(best, time.perf_counter() - start)
+    return scores, best
+
+
+def main():
+    if not HAS_VECTOR_BACKEND:
+        print("NumPy/SciPy are not installed, nothing to compare")
+        return 1
+
+    num_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as directory:
+        pure = BasicResumeRanker(vector_backend_min_resumes=float('inf'))
+        vectorised = BasicResumeRanker(vector_backend_min_resumes=0)
+        for path in write_corpus(directory, num_resumes):
+            pure.add_resume(path, os.path.basename(path))
+            vectorised.add_resume(path, os.path.basename(path))
+
+    for keywords in (KEYWORDS, None):
+        pure.set_job_description(JOB_DESCRIPTION, keywords)
+        vectorised.set_job_description(JOB_DESCRIPTION, keywords)
+
+        pure_scores, pure_time = time_scores(pure)
+        vector_scores, vector_time = time_scores(vectorised)
+
+        worst = max(abs(a - b) for a, b in zip(pure_scores, vector_scores))
+        if worst > 1e-9:
+            print(f"MISMATCH: max score difference {worst:.3e}")
+            return 1
+
+        label = 'custom keywords' if keywords else 'auto keywords'
+        print(f"{num_resumes} resumes, {label}: pure {pure_time * 1000:.1f} ms, "
+              f"csr {vector_time * 1000:.1f} ms, max diff {worst:.1e}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Load Test for AI-Powered Resume Ranker
+Uploads a synthetic corpus one file at a time through /upload while reader
+threads keep calling /rank, checks every ranking against a reference ranker
+holding the same prefix of the corpus, then measures /rank throughput with
+1, 2, 4 and 8 reader threads.
+
+Readers rank lock-free against published snapshots, but they still share
+one interpreter: pure-Python scoring is bound by the GIL, so reads only
+scale with threads where NumPy/SciPy scoring releases it.
+
+Usage: python benchmarks/load_test.py [num_resumes] [seconds_per_level]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+
+def reference_rankings(app_basic, paths, job_description, keywords):
+    """{number of resumes: {filename: score}} for every prefix of paths"""
+    ranker = app_basic.BasicResumeRanker()
+    ranker.set_job_description(job_description, keywords)
+    rankings = {}
+    for k, path in enumerate(paths, start=1):
+        ranker.add_resume(path, os.path.basename(path))
+        page = ranker.rank_page()
+        rankings[k] = {row['filename']: row['score'] for row in page['results']}
+    return rankings
+
+
+def upload(client, path):
+    with open(path, 'rb') as f:
+        response = client.post('/upload', data={'resumes': (f, os.path.basename(path))},
+                               content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+
+
+def rank(client):
+    response = client.post('/rank', json={})
+    if response.status_code != 200:
+        return None
+    return response.get_json()
+
+
+def run_readers(app, num_threads, seconds, on_ranking=None):
+    """Call /rank from num_threads threads for seconds, returns the number of calls"""
+    stop = time.perf_counter() + seconds
+    counts = [0] * num_threads
+
+    def reader(slot):
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            ranking = rank(client)
+            if ranking is not None and on_ranking is not None:
+                on_ranking(ranking)
+            counts[slot] += 1
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def main():
+    num_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        # app_basic creates its folders and warm starts the default
+        # workspace relative to the working directory on import
+        os.chdir(directory)
+        os.environ['EXTRACTION_WORKERS'] = '0'
+        import app_basic
+        from bench_vector_backend import JOB_DESCRIPTION, KEYWORDS, write_corpus
+
+        corpus = os.path.join(directory, 'corpus')
+        os.makedirs(corpus)
+        paths = write_corpus(corpus, num_resumes)
+
+        client = app_basic.app.test_client()
+        client.post('/set-job-description', json={'job_description': JOB_DESCRIPTION, 'keywords': KEYWORDS})
+        expected = reference_rankings(app_basic, paths, JOB_DESCRIPTION, KEYWORDS)
+
+        # Concurrent uploads and ranks: every ranking must be the ranking of
+        # some prefix of the corpus, never a mix of two versions
+        rankings = []
+        done = threading.Event()
+
+        def writer():
+            for path in paths:
+                upload(client, path)
+            done.set()
+
+        def readers():
+            while not done.is_set():
+                run_readers(app_basic.app, 4, 0.05, rankings.append)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=writer), threading.Thread(target=readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        mismatches = 0
+        for ranking in rankings:
+            k = ranking['total_resumes']
+            scores = {row['filename']: row['score'] for row in ranking['results']}
+            reference = expected[k]
+            if scores.keys() != reference.keys() or any(
+                    abs(score - reference[name]) > 0.011 for name, score in scores.items()):
+                mismatches += 1
+        versions = len({ranking['total_resumes'] for ranking in rankings})
+        print(f"{num_resumes} uploads with concurrent ranks in {elapsed:.2f} s: "
+              f"{len(rankings)} rankings over {versions} corpus versions, {mismatches} mismatches")
+
+        # Read throughput on the full corpus
+        baseline = None
+        for num_threads in (1, 2, 4, 8):
+            calls = run_readers(app_basic.app, num_threads, seconds)
+            rate = calls / seconds
+            baseline = baseline or rate
+            print(f"{num_threads} reader threads: {rate:.1f} ranks/s ({rate / baseline:.2f}x)")
+
+        os.chdir(BENCHMARK_DIR)
+
+    return 0 if rankings and not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Benchmark Suite for AI-Powered Resume Ranker
+Generates seeded synthetic corpora with sample_data and, for each corpus
+size, times extraction, preprocessing, indexing, saving, the warm start of
+a workspace and /rank latency (p50/p95/p99), and records the peak RSS.
+Every size runs in a fresh process, so its peak RSS is its own.
+
+Results are printed as a table and can be written as JSON; --compare checks
+them against an earlier JSON file and exits with 1 on any regression beyond
+the tolerance, so the suite can gate changes in CI.
+
+Usage: python benchmarks/run_benchmarks.py [--counts 1000,10000] [--formats txt,docx,pdf]
+       [--ranks 50] [--output results.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..'))
+
+WORKSPACE = 'bench'
+JOB_TITLE = 'Senior Python Developer'
+
+# Metrics where more is worse, compared by --compare
+COMPARED_METRICS = ['extraction_s', 'preprocessing_s', 'indexing_s', 'save_s', 'warm_start_s',
+                    'rank_cold_s', 'rank_p50_s', 'rank_p95_s', 'rank_p99_s', 'peak_rss_mb']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, None where unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    position = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(position, len(ordered) - 1)]
+
+
+def run_single(count, args):
+    """Benchmark one corpus size in this process and return its results"""
+    with tempfile.TemporaryDirectory() as directory:
+        # app_basic creates its folders relative to the working directory on import
+        os.chdir(directory)
+        os.environ['EXTRACTION_WORKERS'] = '0'
+        import app_basic
+        from sample_data import JOB_DESCRIPTIONS, generate_resumes
+        from text_extraction import extract_text, preprocess_text
+
+        upload_folder = os.path.join(app_basic.WORKSPACES_FOLDER, WORKSPACE, 'uploads')
+        index_folder = os.path.join(app_basic.WORKSPACES_FOLDER, WORKSPACE, 'index')
+        results = {'count': count}
+
+        start = time.perf_counter()
+        paths = list(generate_resumes(upload_folder, count, args.formats, args.seed,
+                                      args.vocabulary_size, args.mean_words, args.length_sigma))
+        results['generation_s'] = time.perf_counter() - start
+        results['corpus_mb'] = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+
+        start = time.perf_counter()
+        texts = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                sha256 = hashlib.sha256(f.read()).hexdigest()
+            texts.append((path, sha256, extract_text(path)))
+        results['extraction_s'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted = [(path, os.path.basename(path), sha256, preprocess_text(text), None)
+                     for path, sha256, text in texts]
+        results['preprocessing_s'] = time.perf_counter() - start
+        results['tokens'] = sum(len(entry[3].split()) for entry in extracted)
+        del texts
+
+        ranker = app_basic.create_ranker()
+        ranker.open_index(index_folder)
+        start = time.perf_counter()
+        ranker.insert_resumes(extracted)
+        results['indexing_s'] = time.perf_counter() - start
+        del extracted
+
+        start = time.perf_counter()
+        ranker.save_index()
+        results['save_s'] = time.perf_counter() - start
+        ranker.store.close()
+        del ranker
+
+        # The workspace warm starts from the saved index on its first request
+        client = app_basic.app.test_client()
+        job = JOB_DESCRIPTIONS[JOB_TITLE]
+        start = time.perf_counter()
+        response = client.post(f'/w/{WORKSPACE}/set-job-description',
+                               json={'job_description': job['description'], 'keywords': job['keywords']})
+        results['warm_start_s'] = time.perf_counter() - start
+        assert response.status_code == 200, response.get_json()
+
+        latencies = []
+        for _ in range(args.ranks + 1):
+            start = time.perf_counter()
+            response = client.post(f'/w/{WORKSPACE}/rank', json={'top_k': 10})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.get_json()
+        results['ranked_resumes'] = response.get_json()['total_resumes']
+        # The first rank after a job description change scores the corpus
+        # for the first time, the rest hit warm caches
+        results['rank_cold_s'] = latencies.pop(0)
+        results['rank_mean_s'] = sum(latencies) / len(latencies)
+        results['rank_p50_s'] = percentile(latencies, 0.50)
+        results['rank_p95_s'] = percentile(latencies, 0.95)
+        results['rank_p99_s'] = percentile(latencies, 0.99)
+        results['peak_rss_mb'] = peak_rss_mb()
+
+        os.chdir(BENCHMARK_DIR)
+    return results
+
+
+def run_child(count, args):
+    """Run one corpus size in a fresh interpreter and return its results"""
+    command = [sys.executable, os.path.abspath(__file__), '--single', str(count),
+               '--formats', ','.join(args.formats), '--seed', str(args.seed),
+               '--vocabulary-size', str(args.vocabulary_size), '--mean-words', str(args.mean_words),
+               '--length-sigma', str(args.length_sigma), '--ranks', str(args.ranks)]
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+    if completed.returncode != 0:
+        print(f"Benchmark of {count} resumes failed with exit code {completed.returncode}")
+        return None
+    # app_basic may print while starting, the results are the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of results against baseline, as printable lines"""
+    baseline_by_count = {entry['count']: entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        reference = baseline_by_count.get(entry['count'])
+        if reference is None:
+            continue
+        for metric in COMPARED_METRICS:
+            current, previous = entry.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + tolerance):
+                regressions.append(f"{entry['count']} resumes: {metric} {previous:.4g} -> {current:.4g} "
+                                   f"(+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'resumes':>9} {'extract':>9} {'preproc':>9} {'index':>9} {'save':>8} {'warm':>8} "
+          f"{'rank p50':>9} {'p95':>8} {'p99':>8} {'rss MB':>8}")
+    for entry in results:
+        rss = entry['peak_rss_mb']
+        print(f"{entry['count']:>9} {entry['extraction_s']:>8.2f}s {entry['preprocessing_s']:>8.2f}s "
+              f"{entry['indexing_s']:>8.2f}s {entry['save_s']:>7.2f}s {entry['warm_start_s']:>7.2f}s "
+              f"{entry['rank_p50_s'] * 1000:>7.1f}ms {entry['rank_p95_s'] * 1000:>6.1f}ms "
+              f"{entry['rank_p99_s'] * 1000:>6.1f}ms {rss if rss is None else round(rss):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction, indexing and ranking at several corpus sizes')
+    parser.add_argument('--counts', default='1000,10000', help='comma separated corpus sizes')
+    parser.add_argument('--formats', default='txt', help='comma separated mix of txt, docx and pdf')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--vocabulary-size', type=int, default=20000)
+    parser.add_argument('--mean-words', type=int, default=400)
+    parser.add_argument('--length-sigma', type=float, default=0.5)
+    parser.add_argument('--ranks', type=int, default=50, help='/rank calls per size for the percentiles')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of earlier results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown before a regression')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.formats = args.formats.split(',')
+
+    if args.single is not None:
+        print(json.dumps(run_single(args.single, args)))
+        return 0
+
+    results = []
+    for count in (int(count) for count in args.counts.split(',')):
+        print(f"Benchmarking {count} resumes...", flush=True)
+        entry = run_child(count, args)
+        if entry is None:
+            return 1
+        results.append(entry)
+    print_table(results)
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'formats': args.formats,
+            'seed': args.seed,
+            'vocabulary_size': args.vocabulary_size,
+            'mean_words': args.mean_words,
+            'length_sigma': args.length_sigma,
+            'ranks': args.ranks
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print(f"Warning: {args.compare} was run with another configuration: {baseline.get('config')}")
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+BM25 Scoring for AI-Powered Resume Ranker
+Okapi BM25 over the postings of a ResumeIndex or MappedIndex, using the
+document lengths and total length kept up to date at ingest. The top k are
+found with MaxScore pruning: query terms are taken by decreasing upper bound
+of their contribution, and once the terms left can no longer lift an unseen
+resume into the top k only the resumes still in reach are looked up in
+their postings, so most resumes are never fully scored. Scores are added up
+in the same term order on every path, so the pruned top k is the exhaustive
+one. NumPy is optional and only makes both paths faster.
+"""
+
+import math
+import heapq
+from bisect import bisect_left
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+K1 = 1.2
+B = 0.75
+
+# Relative slack of the upper bounds, so rounding in the sums never prunes
+# a resume that ties with the k-th best score
+BOUND_SLACK = 1e-9
+
+# Once only some resumes can still reach the top k, a posting list is looked
+# up for each of them rather than read in full while it is this many times
+# longer than the list of those resumes
+PROBE_RATIO = 8
+
+
+class Bm25Query:
+    """Weighted terms of a query for one version of an index
+
+    query_weights maps term ids to their weight in the query, e.g. counts;
+    terms no resume holds and weights of zero or less are left out. terms
+    are (term, weight) pairs by decreasing upper bound, where a resume of
+    length dl with tf occurrences of term scores
+    weight * tf / (tf + length_base + length_scale * dl), and suffix_bounds[i]
+    is the most the terms from i on can add to any score. Scores are divided
+    by max_score, the most a resume could score, to fall within [0, 1].
+    """
+
+    def __init__(self, index, query_weights):
+        num_docs = index.num_docs
+        self.length_base = K1 * (1 - B)
+        self.length_scale = K1 * B * num_docs / index.total_length if index.total_length else 0.0
+
+        terms = []
+        self.max_score = 0.0
+        for term, count in query_weights.items():
+            df = index.document_frequency(term) if term >= 0 else 0
+            if count <= 0 or not df:
+                continue
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            weight = count * idf * (K1 + 1)
+            # tf / (tf + K) grows with tf, and K is never below length_base
+            max_tf = index.max_tf(term)
+            bound = weight * max_tf / (max_tf + self.length_base)
+            terms.append((bound, term, weight))
+            self.max_score += weight
+        terms.sort(key=lambda entry: (-entry[0], entry[1]))
+
+        self.terms = [(term, weight) for _, term, weight in terms]
+        self.suffix_bounds = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            self.suffix_bounds[i] = self.suffix_bounds[i + 1] + terms[i][0] * (1 + BOUND_SLACK)
+
+
+def bm25_scores(index, query, doc_ids):
+    """BM25 score of every resume, in the order of doc_ids"""
+    if not query.terms:
+        return [0.0] * len(doc_ids)
+
+    if HAS_NUMPY:
+        acc = np.zeros(index.next_doc_id)
+        doc_terms = _numpy_doc_terms(index, query)
+        for term, weight in query.terms:
+            term_doc_ids, tfs = _numpy_postings(index, term)
+            acc[term_doc_ids] += _numpy_contributions(weight, tfs, doc_terms[term_doc_ids])
+        return (acc[np.frombuffer(doc_ids, dtype=np.uint32)] / query.max_score).tolist()
+
+    acc = {}
+    lengths = index.doc_lengths.values
+    for term, weight in query.terms:
+        term_doc_ids, tfs = index.posting_arrays(term)
+        for doc_id, tf in zip(term_doc_ids, tfs):
+            acc[doc_id] = acc.get(doc_id, 0.0) + _contribution(query, weight, tf, lengths[doc_id])
+    return [acc.get(doc_id, 0.0) / query.max_score for doc_id in doc_ids]
+
+
+def bm25_doc_scores(index, query, doc_ids):
+    """BM25 score of a few resumes, each looked up in the postings, e.g. a shortlist"""
+    scores = [0.0] * len(doc_ids)
+    lengths = index.doc_lengths.values
+    for term, weight in query.terms:
+        term_postings = index.postings.get(term)
+        for i, doc_id in enumerate(doc_ids):
+            tf = term_postings.get(doc_id)
+            if tf:
+                scores[i] += _contribution(query, weight, tf, lengths[doc_id])
+    return [score / query.max_score for score in scores] if query.terms else scores
+
+
+def bm25_top(index, query, doc_ids, limit, min_score=None, stats=None):
+    """(row, score) of the limit best resumes by BM25, best first, with MaxScore pruning
+
+    Ties keep upload order and min_score is a fraction of max_score, as
+    select_top over bm25_scores would have it. Returns None when fewer than
+    limit resumes match the query and the page has to be filled with
+    resumes scoring 0, which only an exhaustive ranking can tell apart.
+    stats, if given, is filled with the resumes and postings looked at.
+    """
+    if stats is None:
+        stats = {}
+    if limit <= 0:
+        return []
+    threshold = 0.0
+    if min_score is not None and min_score > 0:
+        threshold = min_score * query.max_score * (1 - BOUND_SLACK)
+
+    rank = _numpy_top if HAS_NUMPY else _python_top
+    ranked = rank(index, query, limit, threshold, stats)
+    if ranked is None:
+        return None
+
+    results = []
+    for score, doc_id in ranked:
+        score = score / query.max_score
+        if min_score is not None and score < min_score:
+            break
+        results.append((doc_id, score))
+        if len(results) == limit:
+            break
+    if len(results) < limit and (min_score is None or min_score <= 0):
+        return None
+    rows = _rows_of(doc_ids, [doc_id for doc_id, _ in results])
+    return [(row, score) for row, (_, score) in zip(rows, results)]
+
+
+def _contribution(query, weight, tf, length):
+    return weight * tf / (tf + (query.length_base + query.length_scale * length))
+
+
+def _numpy_doc_terms(index, query):
+    """length_base + length_scale * dl of every doc id, the length part of each contribution"""
+    lengths = np.frombuffer(index.doc_lengths.values, dtype=np.uint32)
+    return query.length_base + query.length_scale * lengths
+
+
+def _numpy_contributions(weight, tfs, doc_terms):
+    tfs = tfs.astype(np.float64)
+    contributions = tfs * weight
+    tfs += doc_terms
+    contributions /= tfs
+    return contributions
+
+
+def _numpy_postings(index, term):
+    term_doc_ids, tfs = index.posting_arrays(term)
+    return np.frombuffer(term_doc_ids, dtype=np.uint32), np.frombuffer(tfs, dtype=np.uint32)
+
+
+def _numpy_probe(term_doc_ids, doc_ids):
+    """Mask of the doc ids found in a posting list and their positions in it"""
+    if not len(term_doc_ids):
+        return np.zeros(len(doc_ids), dtype=bool), np.zeros(len(doc_ids), dtype=np.intp)
+    found = np.searchsorted(term_doc_ids, doc_ids)
+    found[found == len(term_doc_ids)] = 0
+    hits = term_doc_ids[found] == doc_ids
+    return hits, found[hits]
+
+
+def _rows_of(doc_ids, ranked_doc_ids):
+    """Rows of doc ids in a column sorted by doc id"""
+    if HAS_NUMPY:
+        column = np.frombuffer(doc_ids, dtype=np.uint32)
+        return np.searchsorted(column, np.asarray(ranked_doc_ids, dtype=np.uint32)).tolist()
+    return [bisect_left(doc_ids, doc_id) for doc_id in ranked_doc_ids]
+
+
+def _numpy_top(index, query, limit, threshold, stats):
+    """(score, doc id) of the resumes left in reach of the top limit, best first, or None"""
+    acc = np.zeros(index.next_doc_id)
+    doc_terms = _numpy_doc_terms(index, query)
+    suffix_bounds = query.suffix_bounds
+    best = np.empty(0, dtype=np.uint32)
+    candidates = None
+    postings = 0
+    seed_position = 1
+
+    for position, (term, weight) in enumerate(query.terms):
+        if candidates is None and suffix_bounds[position] < threshold:
+            # No resume outside the postings read so far can reach the top any more
+            candidates = np.flatnonzero(acc + suffix_bounds[position] >= threshold).astype(np.uint32)
+        term_doc_ids, tfs = _numpy_postings(index, term)
+
+        if candidates is None or PROBE_RATIO * len(candidates) >= len(term_doc_ids):
+            acc[term_doc_ids] += _numpy_contributions(weight, tfs, doc_terms[term_doc_ids])
+            postings += len(term_doc_ids)
+        else:
+            hits, found = _numpy_probe(term_doc_ids, candidates)
+            hit_doc_ids = candidates[hits]
+            acc[hit_doc_ids] += _numpy_contributions(weight, tfs[found], doc_terms[hit_doc_ids])
+            postings += len(candidates)
+
+        if candidates is not None:
+            scores = acc[candidates]
+            if len(candidates) > limit:
+                threshold = max(threshold, np.partition(scores, len(scores) - limit)[len(scores) - limit])
+            candidates = candidates[scores + suffix_bounds[position + 1] >= threshold]
+        elif position + 1 == seed_position:
+            # The exact scores of the best resumes so far are a floor for the
+            # k-th best score, far above the k-th best partial score
+            seed_position *= 2
+            hits, _ = _numpy_probe(term_doc_ids, best)
+            pool = np.concatenate([best[~hits], term_doc_ids])
+            if len(pool) >= limit:
+                best = pool[np.argpartition(-acc[pool], limit - 1)[:limit]]
+                scores = acc[best]
+                for later_term, later_weight in query.terms[position + 1:]:
+                    later_doc_ids, later_tfs = _numpy_postings(index, later_term)
+                    hits, found = _numpy_probe(later_doc_ids, best)
+                    scores[hits] += _numpy_contributions(later_weight, later_tfs[found], doc_terms[best[hits]])
+                threshold = max(threshold, scores.min())
+
+    if candidates is None:
+        candidates = np.flatnonzero(acc >= threshold) if threshold > 0 else np.flatnonzero(acc)
+    scores = acc[candidates]
+    if len(candidates) > limit:
+        keep = scores >= np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        candidates, scores = candidates[keep], scores[keep]
+    stats.update(scored=len(candidates), postings=postings)
+    order = np.lexsort((candidates, -scores))
+    return list(zip(scores[order].tolist(), candidates[order].tolist()))
+
+
+def _python_top(index, query, limit, threshold, stats):
+    """Pure Python _numpy_top, over dicts of partial scores"""
+    acc = {}
+    lengths = index.doc_lengths.values
+    suffix_bounds = query.suffix_bounds
+    best = []
+    candidates = None
+    postings = 0
+    seed_position = 1
+
+    for position, (term, weight) in enumerate(query.terms):
+        if candidates is None and suffix_bounds[position] < threshold:
+            remaining = suffix_bounds[position]
+            candidates = [doc_id for doc_id, score in acc.items() if score + remaining >= threshold]
+        term_doc_ids, tfs = index.posting_arrays(term)
+
+        if candidates is None or len(candidates) >= len(term_doc_ids):
+            for doc_id, tf in zip(term_doc_ids, tfs):
+                acc[doc_id] = acc.get(doc_id, 0.0) + _contribution(query, weight, tf, lengths[doc_id])
+            postings += len(term_doc_ids)
+        else:
+            term_postings = index.postings.get(term)
+            for doc_id in candidates:
+                tf = term_postings.get(doc_id)
+                if tf:
+                    acc[doc_id] += _contribution(query, weight, tf, lengths[doc_id])
+            postings += len(candidates)
+
+        if candidates is not None:
+            if len(candidates) > limit:
+                threshold = max(threshold, heapq.nlargest(limit, map(acc.__getitem__, candidates))[-1])
+            remaining = suffix_bounds[position + 1]
+            candidates = [doc_id for doc_id in candidates if acc[doc_id] + remaining >= threshold]
+        elif position + 1 == seed_position:
+            seed_position *= 2
+            pool = set(best)
+            pool.update(term_doc_ids)
+            if len(pool) >= limit:
+                best = heapq.nlargest(limit, pool, key=acc.__getitem__)
+                scores = [acc[doc_id] for doc_id in best]
+                for later_term, later_weight in query.terms[position + 1:]:
+                    later_postings = index.postings.get(later_term)
+                    for i, doc_id in enumerate(best):
+                        tf = later_postings.get(doc_id)
+                        if tf:
+                            scores[i] += _contribution(query, later_weight, tf, lengths[doc_id])
+                threshold = max(threshold, min(scores))
+
+    if candidates is None:
+        candidates = [doc_id for doc_id, score in acc.items() if score >= threshold and score > 0]
+    ranked = sorted(((acc[doc_id], doc_id) for doc_id in candidates), key=lambda entry: (-entry[0], entry[1]))
+    if len(ranked) > limit:
+        kth = ranked[limit - 1][0]
+        ranked = [entry for entry in ranked if entry[0] >= kth]
+    stats.update(scored=len(ranked), postings=postings)
+    return ranked
@@ -0,0 +1,233 @@
+"""
+Columnar Resume Corpus for AI-Powered Resume Ranker
+Keeps the resumes of a ranker, in ranking order, as a struct of arrays
+instead of lists of Python objects: doc ids, start and end offsets into one
+flat buffer of token ids, and start and end offsets into one UTF-8 buffer of
+filenames. A resume costs a few dozen bytes besides its tokens, and the
+columns are written to disk and mapped back as they are.
+"""
+
+from array import array
+from bisect import bisect_left
+
+# Buffers are compacted once the tokens of removed resumes outweigh the
+# tokens in use, and hold at least this many of them
+COMPACT_MIN_TOKENS = 1 << 16
+
+
+class ResumeCorpus:
+    """Resume row i is doc_ids[i], tokens[token_starts[i]:token_ends[i]] and
+    name_data[name_starts[i]:name_ends[i]]
+
+    The token and name buffers are only ever appended to in place, so
+    snapshot() copies the small per-row columns and shares the buffers with
+    the corpus as it goes on. Removing a resume leaves its tokens and name
+    in the buffers until compaction writes new ones. Doc ids are handed out
+    in upload order, so they ascend with the rows.
+    """
+
+    __slots__ = ('doc_ids', 'token_starts', 'token_ends', 'tokens', 'name_starts', 'name_ends',
+                 'name_data', 'read_only', 'names', 'token_rows', '_used_tokens', '_doc_ids_by_name')
+
+    def __init__(self, doc_ids=None, token_starts=None, token_ends=None, tokens=None,
+                 name_starts=None, name_ends=None, name_data=None, read_only=False):
+        self.doc_ids = array('I') if doc_ids is None else doc_ids
+        self.token_starts = array('Q') if token_starts is None else token_starts
+        self.token_ends = array('Q') if token_ends is None else token_ends
+        self.tokens = array('I') if tokens is None else tokens
+        self.name_starts = array('Q') if name_starts is None else name_starts
+        self.name_ends = array('Q') if name_ends is None else name_ends
+        self.name_data = bytearray() if name_data is None else name_data
+        self.read_only = read_only
+        self.names = CorpusNames(self)
+        self.token_rows = CorpusTokens(self)
+        self._used_tokens = sum(self.token_ends) - sum(self.token_starts)
+        # filename -> doc id, built on the first lookup by the writer
+        self._doc_ids_by_name = None
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Corpus of (doc_id, filename, tokens) documents in ascending doc id order"""
+        corpus = cls()
+        for doc_id, filename, tokens in documents:
+            corpus.append(doc_id, filename, tokens)
+        return corpus
+
+    @classmethod
+    def from_columns(cls, doc_ids, token_offsets, tokens, filenames):
+        """Read-only corpus over the columns of a saved corpus, e.g. mapped views
+
+        The tokens of row i are tokens[token_offsets[i]:token_offsets[i + 1]].
+        """
+        name_starts, name_ends, name_data = array('Q'), array('Q'), bytearray()
+        for filename in filenames:
+            name_starts.append(len(name_data))
+            name_data += filename.encode('utf-8')
+            name_ends.append(len(name_data))
+        return cls(doc_ids, token_offsets[:-1], token_offsets[1:], tokens,
+                   name_starts, name_ends, bytes(name_data), read_only=True)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def name(self, row):
+        return self.name_data[self.name_starts[row]:self.name_ends[row]].decode('utf-8')
+
+    def tokens_of(self, row):
+        return self.tokens[self.token_starts[row]:self.token_ends[row]]
+
+    def row_of(self, filename):
+        """Row of the resume called filename, or -1"""
+        if self._doc_ids_by_name is None:
+            self._doc_ids_by_name = {self.name(row): doc_id for row, doc_id in enumerate(self.doc_ids)}
+        doc_id = self._doc_ids_by_name.get(filename)
+        if doc_id is None:
+            return -1
+        return self.row_of_doc(doc_id)
+
+    def row_of_doc(self, doc_id):
+        """Row of the resume with doc_id, or -1"""
+        row = bisect_left(self.doc_ids, doc_id)
+        if row < len(self.doc_ids) and self.doc_ids[row] == doc_id:
+            return row
+        return -1
+
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError('A corpus snapshot is read-only')
+
+    def append(self, doc_id, filename, tokens):
+        """Add a resume as the last row"""
+        self._check_writable()
+        if self.doc_ids and doc_id <= self.doc_ids[-1]:
+            raise ValueError(f'Doc id {doc_id} does not follow {self.doc_ids[-1]}')
+
+        self.doc_ids.append(doc_id)
+        self.token_starts.append(len(self.tokens))
+        self.tokens.extend(tokens)
+        self.token_ends.append(len(self.tokens))
+        self.name_starts.append(len(self.name_data))
+        self.name_data += filename.encode('utf-8')
+        self.name_ends.append(len(self.name_data))
+        self._used_tokens += len(tokens)
+        if self._doc_ids_by_name is not None:
+            self._doc_ids_by_name[filename] = doc_id
+
+    def remove(self, row):
+        """Drop a row and return its (doc_id, filename, tokens)"""
+        self._check_writable()
+        doc_id, filename, tokens = self.doc_ids[row], self.name(row), self.tokens_of(row)
+        for column in (self.doc_ids, self.token_starts, self.token_ends, self.name_starts, self.name_ends):
+            del column[row]
+        self._used_tokens -= len(tokens)
+        if self._doc_ids_by_name is not None:
+            del self._doc_ids_by_name[filename]
+
+        if len(self.tokens) > max(2 * self._used_tokens, COMPACT_MIN_TOKENS):
+            self._compact()
+        return doc_id, filename, tokens
+
+    def _compact(self):
+        """Copy the rows in use into new buffers, leaving the shared ones to snapshots"""
+        tokens, token_starts, token_ends = array(self.tokens.typecode), array('Q'), array('Q')
+        for start, end in zip(self.token_starts, self.token_ends):
+            token_starts.append(len(tokens))
+            tokens.extend(self.tokens[start:end])
+            token_ends.append(len(tokens))
+        name_data, name_starts, name_ends = bytearray(), array('Q'), array('Q')
+        for start, end in zip(self.name_starts, self.name_ends):
+            name_starts.append(len(name_data))
+            name_data += self.name_data[start:end]
+            name_ends.append(len(name_data))
+
+        self.tokens, self.token_starts, self.token_ends = tokens, token_starts, token_ends
+        self.name_data, self.name_starts, self.name_ends = name_data, name_starts, name_ends
+
+    def snapshot(self):
+        """Read-only corpus as it is now
+
+        The per-row columns are copied, a memcpy of 36 bytes per resume, and
+        the buffers are shared: the rows of the snapshot only reach the part
+        written so far, which appends never move.
+        """
+        if self.read_only:
+            return self
+        return ResumeCorpus(self.doc_ids[:], self.token_starts[:], self.token_ends[:], self.tokens,
+                            self.name_starts[:], self.name_ends[:], self.name_data, read_only=True)
+
+    def write_tokens(self, f):
+        """Write len(self) + 1 token offsets, the doc ids and the tokens to f
+
+        Row i holds tokens[offsets[i]:offsets[i + 1]], the layout read back
+        by from_columns. The token buffer is written as it is unless removed
+        resumes left gaps in it. Returns the number of tokens written.
+        """
+        if len(self.tokens) != self._used_tokens and not self.read_only:
+            self._compact()
+
+        offsets = array('Q', [0])
+        contiguous = True
+        for start, end in zip(self.token_starts, self.token_ends):
+            contiguous = contiguous and start == offsets[-1]
+            offsets.append(offsets[-1] + end - start)
+        offsets.tofile(f)
+        f.write(self.doc_ids)
+        # Views are released right away, so appends can resize the buffer again
+        with memoryview(self.tokens) as tokens:
+            if contiguous:
+                f.write(tokens[:offsets[-1]])
+            else:
+                for start, end in zip(self.token_starts, self.token_ends):
+                    f.write(tokens[start:end])
+        return offsets[-1]
+
+
+class CorpusNames:
+    """Sequence of the filenames of a corpus, by row"""
+
+    __slots__ = ('corpus',)
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.corpus.name(row)
+
+    def __iter__(self):
+        corpus = self.corpus
+        for start, end in zip(corpus.name_starts, corpus.name_ends):
+            yield corpus.name_data[start:end].decode('utf-8')
+
+    def __contains__(self, filename):
+        return self.corpus.row_of(filename) >= 0
+
+
+class CorpusTokens:
+    """Sequence of the token arrays of a corpus, by row"""
+
+    __slots__ = ('corpus',)
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.corpus.tokens_of(row)
+
+    def __iter__(self):
+        corpus = self.corpus
+        for start, end in zip(corpus.token_starts, corpus.token_ends):
+            yield corpus.tokens[start:end]
@@ -0,0 +1,126 @@
+"""
+Extraction Cache for AI-Powered Resume Ranker
+Content-addressed on-disk cache of extracted and preprocessed resume text,
+keyed by the SHA-256 of the file bytes and bounded in size with LRU eviction.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of {processed_text, truncation} per file content hash"""
+
+    def __init__(self, folder, max_bytes, version):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.max_bytes = max_bytes
+        # Entries written by a different preprocess_text are treated as misses
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Request threads and the ingestion worker share one cache
+        self._lock = threading.Lock()
+
+        # Least recently used first, rebuilt from the file mtimes on start-up
+        entries = []
+        for entry in os.scandir(folder):
+            if entry.is_file() and entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len('.json')], stat.st_size))
+        self.entries = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.total_bytes = sum(self.entries.values())
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + '.json')
+
+    @staticmethod
+    def make_key(sha256, extension):
+        # The same bytes parse differently as PDF, DOCX or plain text
+        return f'{sha256}.{extension.lower().lstrip(".")}'
+
+    def get(self, sha256, extension):
+        """Cached entry for the file content, or None"""
+        with self._lock:
+            return self._get(sha256, extension)
+
+    def _get(self, sha256, extension):
+        key = self.make_key(sha256, extension)
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is None or entry.get('version') != self.version:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, sha256, extension, processed_text, truncation=None):
+        """Store an extraction result and evict the oldest entries over budget"""
+        with self._lock:
+            self._put(sha256, extension, processed_text, truncation)
+
+    def _put(self, sha256, extension, processed_text, truncation):
+        key = self.make_key(sha256, extension)
+        data = json.dumps({
+            'version': self.version,
+            'processed_text': processed_text,
+            'truncation': truncation
+        })
+        size = len(data.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        # Per process, serve.py workers share the cache folder
+        temp_path = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, self._path(key))
+
+        self.total_bytes += size - self.entries.pop(key, 0)
+        self.entries[key] = size
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        self.total_bytes -= self.entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return self._stats()
+
+    def _stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'size_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'version': self.version
+        }
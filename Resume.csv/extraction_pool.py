@@ -0,0 +1,126 @@
+"""
+Parallel Extraction Pool for AI-Powered Resume Ranker
+Runs resume extraction and preprocessing in a ProcessPoolExecutor, since
+PyPDF2 is CPU-bound and holds the GIL, with a per-file timeout so that one
+pathological PDF cannot stall a whole upload.
+"""
+
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from text_extraction import extract_resume, ExtractionTimeout
+
+# Extra seconds the parent waits before declaring running workers stuck
+STALL_GRACE = 5
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout("Extraction timed out")
+
+
+def _extract_with_timeout(file_path, timeout, max_pages=None, max_bytes=None):
+    """Worker entry point, interrupts the extraction after timeout seconds where SIGALRM exists"""
+    use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_resume(file_path, max_pages, max_bytes)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ExtractionPool:
+    """Long-lived process pool returning extraction results in input order"""
+
+    def __init__(self, max_workers=None, timeout=60):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._executor = None
+        # One batch at a time already keeps every worker busy
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _discard_executor(self, terminate=False):
+        """Drop the current executor, killing its workers if they are stuck"""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if terminate:
+            terminate_workers = getattr(executor, 'terminate_workers', None)
+            if terminate_workers is not None:
+                terminate_workers()
+            else:
+                for process in list((executor._processes or {}).values()):
+                    process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract_many(self, file_paths, max_pages=None, max_bytes=None):
+        """Extract files in parallel
+
+        Returns one (processed_text, truncation) tuple or exception per path,
+        in the order of file_paths, so callers can insert deterministically.
+        """
+        with self._lock:
+            return self._extract_many(file_paths, max_pages, max_bytes)
+
+    def _extract_many(self, file_paths, max_pages, max_bytes):
+        results = [None] * len(file_paths)
+        remaining = list(range(len(file_paths)))
+
+        while remaining:
+            executor = self._get_executor()
+            futures = {
+                executor.submit(_extract_with_timeout, file_paths[i], self.timeout, max_pages, max_bytes): i
+                for i in remaining
+            }
+            remaining = []
+            not_done = set(futures)
+            broken = False
+
+            while not_done:
+                done, not_done = wait(
+                    not_done, timeout=self.timeout + STALL_GRACE, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        results[futures[future]] = future.result()
+                    except BrokenProcessPool as e:
+                        results[futures[future]] = e
+                        broken = True
+                    except Exception as e:
+                        results[futures[future]] = e
+
+                if not done:
+                    # Nothing finished for a whole timeout, so whatever is
+                    # running is stuck: kill it and retry the files not started
+                    for future in not_done:
+                        if future.running():
+                            results[futures[future]] = ExtractionTimeout("Extraction timed out")
+                        else:
+                            remaining.append(futures[future])
+                    if len(remaining) == len(not_done):
+                        # Not even one file started, give up instead of looping
+                        for i in remaining:
+                            results[i] = ExtractionTimeout("Extraction did not start")
+                        remaining = []
+                    remaining.sort()
+                    self._discard_executor(terminate=True)
+                    break
+
+            if broken:
+                self._discard_executor()
+
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            self._discard_executor()
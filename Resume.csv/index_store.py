@@ -0,0 +1,480 @@
+"""
+Persistent Resume Index for AI-Powered Resume Ranker
+Keeps the token arrays of the resumes, the interned vocabulary and the
+near-duplicates found at ingest in SQLite and the postings, norm sums,
+token arrays and semantic embeddings as flat binary arrays that are
+memory-mapped on start-up, so
+a restart reopens the corpus instead of re-parsing every upload. Every save
+writes a new generation of the binary files, so processes mapping the
+previous one keep a consistent view.
+"""
+
+import os
+import re
+import mmap
+import sqlite3
+import hashlib
+from array import array
+from itertools import compress
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from resume_index import ResumeIndex
+from mapped_index import MappedIndex
+from corpus_store import ResumeCorpus
+from near_duplicates import DuplicateIndex, Duplicate
+from semantic_index import SemanticIndex, HAS_SEMANTIC_INDEX
+
+DATABASE_FILENAME = 'resume_index.db'
+LOCK_FILENAME = 'index.lock'
+POSTINGS_FILENAME = 'postings-{}.bin'
+NORMS_FILENAME = 'norms-{}.bin'
+TOKENS_FILENAME = 'tokens-{}.bin'
+LSH_FILENAME = 'lsh-{}.bin'
+EMBEDDINGS_FILENAME = 'embeddings-{}.bin'
+SNAPSHOT_FILES = (POSTINGS_FILENAME, NORMS_FILENAME, TOKENS_FILENAME, LSH_FILENAME, EMBEDDINGS_FILENAME)
+SNAPSHOT_FILE = re.compile(r'^(postings|norms|tokens|lsh|embeddings)(-\d+)?\.bin$')
+
+# Bumped whenever the layout changes; older stores are dropped and rebuilt
+# from the upload folder
+SCHEMA_VERSION = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    tokens BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vocabulary (
+    position INTEGER PRIMARY KEY,
+    term TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+-- Near-duplicates of other resumes; collapsed ones are not in documents
+-- and keep their file stats and tokens here
+CREATE TABLE IF NOT EXISTS duplicates (
+    filename TEXT PRIMARY KEY,
+    duplicate_of TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    sha256 TEXT,
+    tokens BLOB
+);
+"""
+
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_array(mapped, typecode, start, count):
+    """Typed view of count items starting at byte offset start of a mapping"""
+    itemsize = array(typecode).itemsize
+    return memoryview(mapped)[start:start + count * itemsize].cast(typecode)
+
+
+def map_file(path, size):
+    """Read-only mapping of a file that must be size bytes long, or None"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size != size:
+            return None
+        if size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@contextmanager
+def writer_lock(folder):
+    """Exclusive lock on an index folder, held against other processes too
+
+    Without fcntl (Windows) only the locks of the callers apply.
+    """
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, LOCK_FILENAME), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class IndexStore:
+    """SQLite documents and vocabulary plus memory-mapped postings and norms
+
+    Several processes may open the same folder; changes must be made under
+    writer_lock(folder), readers only need the generation they mapped.
+    """
+
+    def __init__(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.connection = sqlite3.connect(
+            os.path.join(folder, DATABASE_FILENAME), check_same_thread=False
+        )
+        # Readers in other processes keep reading while a save commits
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        schema_version, = self.connection.execute("PRAGMA user_version").fetchone()
+        if schema_version != SCHEMA_VERSION:
+            self.connection.executescript(
+                "DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS vocabulary; DROP TABLE IF EXISTS meta; "
+                "DROP TABLE IF EXISTS duplicates;"
+            )
+            self._remove_snapshot()
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.executescript(SCHEMA)
+
+    def _path(self, filename):
+        return os.path.join(self.folder, filename)
+
+    def _remove_snapshot(self, keep=None):
+        """Delete the binary files of every generation but keep"""
+        kept = {filename.format(keep) for filename in SNAPSHOT_FILES}
+        for filename in os.listdir(self.folder):
+            if SNAPSHOT_FILE.match(filename) and filename not in kept:
+                try:
+                    os.remove(self._path(filename))
+                except OSError:
+                    pass
+
+    def _meta(self):
+        return dict(self.connection.execute("SELECT key, value FROM meta"))
+
+    def generation(self):
+        """Number of the last saved index, bumped by every save and clear"""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def load_documents(self):
+        """All stored documents as (doc_id, filename, token array), in upload order"""
+        documents = []
+        for doc_id, filename, blob in self.connection.execute(
+            "SELECT doc_id, filename, tokens FROM documents ORDER BY doc_id"
+        ):
+            tokens = array('I')
+            tokens.frombytes(blob)
+            documents.append((doc_id, filename, tokens))
+        return documents
+
+    def load_vocabulary(self):
+        """Terms of the interned vocabulary, indexed by term id"""
+        return [term for term, in self.connection.execute(
+            "SELECT term FROM vocabulary ORDER BY position"
+        )]
+
+    def document_stats(self):
+        """Map filename -> (size, mtime, sha256) for reconciling an upload folder
+
+        Collapsed duplicates are included, they came from the folder too.
+        """
+        rows = self.connection.execute(
+            "SELECT filename, size, mtime, sha256 FROM documents UNION ALL "
+            "SELECT filename, size, mtime, sha256 FROM duplicates WHERE tokens IS NOT NULL"
+        )
+        return {filename: (size, mtime, sha256) for filename, size, mtime, sha256 in rows}
+
+    def load_duplicates(self):
+        """Every stored Duplicate, flagged and collapsed, by filename"""
+        duplicates = {}
+        for filename, duplicate_of, similarity, size, mtime, sha256, blob in self.connection.execute(
+            "SELECT filename, duplicate_of, similarity, size, mtime, sha256, tokens FROM duplicates"
+        ):
+            tokens = stats = None
+            if blob is not None:
+                tokens = array('I')
+                tokens.frombytes(blob)
+                stats = (size, mtime, sha256)
+            duplicates[filename] = Duplicate(filename, duplicate_of, similarity, tokens, stats)
+        return duplicates
+
+    def load_duplicate_index(self):
+        """LSH buckets saved with the last index, or None if none were"""
+        meta = self._meta()
+        slots = meta.get('lsh_slots', 0)
+        if not slots:
+            return None
+        keys, doc_ids = array('Q'), array('I')
+        try:
+            with open(self._path(LSH_FILENAME.format(meta['generation'])), 'rb') as f:
+                keys.fromfile(f, slots)
+                doc_ids.fromfile(f, slots)
+        except (OSError, EOFError):
+            return None
+        return DuplicateIndex(keys, doc_ids, meta['lsh_used'], meta['lsh_entries'])
+
+    def load_semantic_index(self):
+        """SemanticIndex saved with the last index, over its mapped file, or None if none was"""
+        meta = self._meta()
+        docs = meta.get('semantic_docs', 0)
+        if not docs or not HAS_SEMANTIC_INDEX:
+            return None
+        shape = (meta['semantic_terms'], meta['semantic_dimensions'], meta['semantic_lists'], docs,
+                 'int8' if meta['semantic_int8'] else 'float32')
+        try:
+            mapped = map_file(self._path(EMBEDDINGS_FILENAME.format(meta['generation'])),
+                              SemanticIndex.file_size(*shape))
+        except OSError:
+            return None
+        if mapped is None:
+            return None
+        return SemanticIndex.from_buffer(mapped, *shape, meta['semantic_fitted'], meta['generation'])
+
+    # Document changes are only committed together with the next snapshot in
+    # save_index, so the documents table and the arrays always agree
+
+    def put_document(self, doc_id, filename, size, mtime, sha256, tokens):
+        self.connection.execute("DELETE FROM documents WHERE filename = ?", (filename,))
+        self.connection.execute(
+            "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+            (doc_id, filename, size, mtime, sha256, tokens.tobytes())
+        )
+
+    def touch_document(self, filename, size, mtime):
+        """Record new file stats for a document whose content did not change"""
+        for table in ('documents', 'duplicates'):
+            self.connection.execute(
+                f"UPDATE {table} SET size = ?, mtime = ? WHERE filename = ?",
+                (size, mtime, filename)
+            )
+
+    def delete_document(self, filename):
+        self.connection.execute("DELETE FROM documents WHERE filename = ?", (filename,))
+
+    def put_duplicate(self, duplicate):
+        size, mtime, sha256 = duplicate.stats if duplicate.collapsed else (None, None, None)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO duplicates VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (duplicate.filename, duplicate.duplicate_of, duplicate.similarity, size, mtime, sha256,
+             duplicate.tokens.tobytes() if duplicate.collapsed else None)
+        )
+
+    def delete_duplicate(self, filename):
+        self.connection.execute("DELETE FROM duplicates WHERE filename = ?", (filename,))
+
+    def clear(self):
+        """Drop every stored document and the index snapshot"""
+        generation = self.generation() + 1
+        with self.connection:
+            self.connection.execute("DELETE FROM documents")
+            self.connection.execute("DELETE FROM duplicates")
+            self.connection.execute("DELETE FROM vocabulary")
+            self.connection.execute("DELETE FROM meta")
+            self.connection.execute("INSERT INTO meta VALUES ('generation', ?)", (generation,))
+        self._remove_snapshot()
+
+    def close(self):
+        self.connection.close()
+
+    def save_index(self, index, vocabulary, corpus, duplicate_index=None, semantic_index=None):
+        """Write a new generation of the index arrays and the new vocabulary terms
+
+        corpus is the ResumeCorpus of the documents of index, in ranking order,
+        duplicate_index the DuplicateIndex of the corpus, if it is kept, and
+        semantic_index the SemanticIndex of the corpus, if there is one.
+
+        Every generation file is written in full, so a save costs time in
+        proportion to the corpus, about 50 µs per resume: saving after each
+        of n single uploads costs O(n²). Callers batch saves instead, see
+        Workspace.save and the checkpoints of batch_rank.
+        """
+        arrays = index.to_arrays(len(vocabulary))
+        generation = self.generation() + 1
+
+        # The files of the new generation are only referenced once the
+        # metadata naming it is committed
+        with open(self._path(POSTINGS_FILENAME.format(generation)), 'wb') as f:
+            arrays['offsets'].tofile(f)
+            arrays['doc_ids'].tofile(f)
+            arrays['tfs'].tofile(f)
+            arrays['max_tfs'].tofile(f)
+        with open(self._path(NORMS_FILENAME.format(generation)), 'wb') as f:
+            arrays['norm_sums'].tofile(f)
+            arrays['lengths'].tofile(f)
+            f.write(arrays['present'])
+        with open(self._path(TOKENS_FILENAME.format(generation)), 'wb') as f:
+            num_tokens = corpus.write_tokens(f)
+        if duplicate_index is not None:
+            with open(self._path(LSH_FILENAME.format(generation)), 'wb') as f:
+                duplicate_index.keys.tofile(f)
+                duplicate_index.doc_ids.tofile(f)
+        if semantic_index is not None:
+            with open(self._path(EMBEDDINGS_FILENAME.format(generation)), 'wb') as f:
+                semantic_index.write(f)
+
+        meta = {
+            'num_terms': len(vocabulary),
+            'num_postings': len(arrays['doc_ids']),
+            'num_docs': index.num_docs,
+            'num_tokens': num_tokens,
+            'next_doc_id': index.next_doc_id,
+            'lsh_slots': len(duplicate_index.keys) if duplicate_index is not None else 0,
+            'lsh_used': duplicate_index.used if duplicate_index is not None else 0,
+            'lsh_entries': duplicate_index.entries if duplicate_index is not None else 0,
+            'semantic_docs': len(semantic_index.doc_ids) if semantic_index is not None else 0,
+            'semantic_terms': len(semantic_index.term_vectors) if semantic_index is not None else 0,
+            'semantic_dimensions': semantic_index.dimensions if semantic_index is not None else 0,
+            'semantic_lists': len(semantic_index.centroids) if semantic_index is not None else 0,
+            'semantic_int8': int(semantic_index.quantization == 'int8') if semantic_index is not None else 0,
+            'semantic_fitted': semantic_index.fitted if semantic_index is not None else 0,
+            'generation': generation
+        }
+        with self.connection:
+            # The vocabulary only grows, so only the new terms are written
+            stored_terms, = self.connection.execute("SELECT COUNT(*) FROM vocabulary").fetchone()
+            self.connection.executemany(
+                "INSERT INTO vocabulary VALUES (?, ?)",
+                enumerate(vocabulary.terms[stored_terms:], start=stored_terms)
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items()
+            )
+
+        # Processes that mapped an older generation keep their mappings
+        self._remove_snapshot(keep=generation)
+
+    def _map_files(self, meta):
+        """Mappings of the postings, norms and tokens files described by meta, or None"""
+        generation = meta['generation']
+        num_terms, num_postings = meta['num_terms'], meta['num_postings']
+        num_docs, num_tokens = meta['num_docs'], meta['num_tokens']
+        postings_map = map_file(self._path(POSTINGS_FILENAME.format(generation)),
+                                8 * (num_terms + 1) + 8 * num_postings + 4 * num_terms)
+        # Norm sums, lengths and present flags of every doc id handed out so far
+        norms_map = map_file(self._path(NORMS_FILENAME.format(generation)), 29 * meta['next_doc_id'])
+        tokens_map = map_file(self._path(TOKENS_FILENAME.format(generation)),
+                              8 * (num_docs + 1) + 4 * num_docs + 4 * num_tokens)
+        if postings_map is None or norms_map is None or tokens_map is None:
+            return None
+        return postings_map, norms_map, tokens_map
+
+    def _index_from_maps(self, meta, postings_map, norms_map, index_class):
+        num_terms, num_postings, slots = meta['num_terms'], meta['num_postings'], meta['next_doc_id']
+        postings_start = 8 * (num_terms + 1)
+        arrays = (
+            read_array(postings_map, 'Q', 0, num_terms + 1),
+            read_array(postings_map, 'I', postings_start, num_postings),
+            read_array(postings_map, 'I', postings_start + 4 * num_postings, num_postings),
+            read_array(postings_map, 'I', postings_start + 8 * num_postings, num_terms),
+            read_array(norms_map, 'I', 24 * slots, slots),
+            read_array(norms_map, 'd', 0, 3 * slots),
+            read_array(norms_map, 'B', 28 * slots, slots),
+            meta['next_doc_id']
+        )
+        if index_class is MappedIndex:
+            return MappedIndex(*arrays, meta['generation'])
+        index = ResumeIndex.from_arrays(*arrays)
+        # Release the views so the mappings can be closed
+        for view in arrays[:-1]:
+            view.release()
+        return index
+
+    def load_index(self, doc_ids):
+        """Reopen the index snapshot, or None if it does not cover exactly doc_ids"""
+        meta = self._meta()
+        if 'num_terms' not in meta or meta['num_docs'] != len(doc_ids):
+            return None
+
+        try:
+            maps = self._map_files(meta)
+            if maps is None:
+                return None
+            postings_map, norms_map, tokens_map = maps
+            slots = meta['next_doc_id']
+            present = read_array(norms_map, 'B', 28 * slots, slots)
+            covered = list(compress(range(slots), present)) == sorted(doc_ids)
+            present.release()
+            if not covered:
+                return None
+            if meta['num_docs'] == 0:
+                index = ResumeIndex()
+                index.next_doc_id = meta['next_doc_id']
+                return index
+
+            index = self._index_from_maps(meta, postings_map, norms_map, ResumeIndex)
+            for mapped in maps:
+                mapped.close()
+            return index
+        except (OSError, ValueError):
+            return None
+
+    def map_index(self, attempts=3):
+        """Read-only view of the last saved index, shared with other processes
+
+        Returns (terms, index, corpus), where index is a MappedIndex and
+        corpus a read-only ResumeCorpus over the mapped token arrays, or
+        None if nothing was saved yet or the files do not
+        match the metadata. A save committing meanwhile deletes the files
+        about to be mapped, in which case the new generation is mapped.
+        """
+        for _ in range(attempts):
+            # One read transaction, so the metadata, vocabulary and documents agree
+            self.connection.execute("BEGIN")
+            try:
+                meta = self._meta()
+                if 'num_terms' not in meta:
+                    return None
+                terms = self.load_vocabulary()
+                filenames = dict(self.connection.execute("SELECT doc_id, filename FROM documents"))
+                maps = self._map_files(meta)
+            except FileNotFoundError:
+                continue
+            finally:
+                self.connection.rollback()
+            if maps is None or len(filenames) != meta['num_docs']:
+                return None
+
+            postings_map, norms_map, tokens_map = maps
+            num_docs = meta['num_docs']
+            doc_ids = read_array(tokens_map, 'I', 8 * (num_docs + 1), num_docs) if num_docs else ()
+            if any(doc_id not in filenames for doc_id in doc_ids):
+                return None
+
+            if num_docs:
+                index = self._index_from_maps(meta, postings_map, norms_map, MappedIndex)
+                corpus = ResumeCorpus.from_columns(
+                    doc_ids,
+                    read_array(tokens_map, 'Q', 0, num_docs + 1),
+                    read_array(tokens_map, 'I', 8 * (num_docs + 1) + 4 * num_docs, meta['num_tokens']),
+                    [filenames[doc_id] for doc_id in doc_ids]
+                )
+            else:
+                index = MappedIndex((0,), (), (), (), array('I'), array('d'), b'', meta['next_doc_id'],
+                                    meta['generation'])
+                corpus = ResumeCorpus(read_only=True)
+            return terms, index, corpus
+        return None
+
+    def stats(self):
+        """Generation, sizes and bytes on disk of the saved index"""
+        meta = self._meta()
+        generation = meta.get('generation', 0)
+        size = 0
+        for filename in SNAPSHOT_FILES:
+            path = self._path(filename.format(generation))
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return {
+            'generation': generation,
+            'resumes': meta.get('num_docs', 0),
+            'terms': meta.get('num_terms', 0),
+            'postings': meta.get('num_postings', 0),
+            'tokens': meta.get('num_tokens', 0),
+            'bytes': size
+        }
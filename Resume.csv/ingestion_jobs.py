@@ -0,0 +1,218 @@
+"""
+Ingestion Jobs for AI-Powered Resume Ranker
+Background queue that indexes large uploads in batches, so /upload can return
+a job id straight away and clients poll the job for per-file progress while
+ranking runs against whatever has been indexed so far.
+"""
+
+import time
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+
+
+class IngestionJob:
+    """Per-file status, throughput and ETA of one asynchronous upload
+
+    context identifies what the files are indexed into, e.g. a workspace id.
+    """
+
+    def __init__(self, files, context=None):
+        # A later file of the same name overwrote the earlier one on disk
+        unique = OrderedDict()
+        for file_path, filename in files:
+            unique.pop(filename, None)
+            unique[filename] = file_path
+        self.files = [(file_path, filename) for filename, file_path in unique.items()]
+
+        self.id = uuid.uuid4().hex
+        self.context = context
+        self.status = 'queued'
+        self.file_status = OrderedDict((filename, 'queued') for filename in unique)
+        self.failures = OrderedDict()
+        self.truncations = OrderedDict()
+        self.duplicates = OrderedDict()
+        self.processed = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.status == 'cancelled'
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def start(self):
+        """Mark the job running, returns False if it was cancelled while queued"""
+        with self._lock:
+            if self.status == 'cancelled':
+                return False
+            self.status = 'running'
+            self.started_at = time.time()
+            return True
+
+    def mark_processing(self, batch):
+        with self._lock:
+            for _, filename in batch:
+                if self.file_status[filename] == 'queued':
+                    self.file_status[filename] = 'processing'
+
+    def mark_done(self, batch, failures):
+        """Record the outcome of a batch, failures maps filename -> error"""
+        with self._lock:
+            for _, filename in batch:
+                if filename in failures:
+                    self.file_status[filename] = 'failed'
+                    self.failures[filename] = failures[filename]
+                else:
+                    self.file_status[filename] = 'indexed'
+            self.processed += len(batch)
+
+    def record_truncation(self, filename, truncation):
+        """Note a file indexed only up to the extraction limits"""
+        with self._lock:
+            self.truncations[filename] = truncation
+
+    def record_duplicate(self, duplicate):
+        """Note a file found to be a near-duplicate, a dict from Duplicate.to_dict()"""
+        with self._lock:
+            self.duplicates[duplicate['filename']] = duplicate
+
+    def finish(self):
+        with self._lock:
+            if self.status != 'cancelled':
+                self.status = 'completed'
+            self.finished_at = time.time()
+        self._done.set()
+
+    def cancel(self):
+        """Stop after the current batch; files not indexed yet stay out of the corpus"""
+        with self._lock:
+            if self.finished:
+                return
+            self.status = 'cancelled'
+            for filename, status in self.file_status.items():
+                if status in ('queued', 'processing'):
+                    self.file_status[filename] = 'cancelled'
+            if self.started_at is None:
+                self.finished_at = time.time()
+                self._done.set()
+
+    def wait(self, timeout=None):
+        """Block until the job has finished, returns whether it did"""
+        return self._done.wait(timeout)
+
+    def to_dict(self, include_files=True):
+        with self._lock:
+            end = self.finished_at or time.time()
+            elapsed = end - self.started_at if self.started_at is not None else 0
+            rate = self.processed / elapsed if elapsed > 0 else 0
+            remaining = len(self.files) - self.processed
+
+            job = {
+                'job_id': self.id,
+                'status': self.status,
+                'total_files': len(self.files),
+                'processed_files': self.processed,
+                'indexed_files': self.processed - len(self.failures),
+                'failed_files': len(self.failures),
+                'files_per_second': round(rate, 2),
+                'elapsed_seconds': round(elapsed, 2),
+                'eta_seconds': round(remaining / rate, 1) if rate and not self.finished else None,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'failed': [{'filename': filename, 'error': error}
+                           for filename, error in self.failures.items()],
+                'truncated': [{'filename': filename, **truncation}
+                              for filename, truncation in self.truncations.items()],
+                'duplicates': list(self.duplicates.values())
+            }
+            if include_files:
+                job['files'] = [{'filename': filename, 'status': status}
+                                for filename, status in self.file_status.items()]
+            return job
+
+
+class IngestionQueue:
+    """Single background worker indexing queued jobs batch by batch
+
+    process_batch(job, files) indexes a list of (file_path, filename) and
+    returns {filename: error} for the files that failed, or None if the job
+    was cancelled before the batch went in; finish_job(job) runs once a job
+    has no batches left, e.g. to save the index.
+    """
+
+    def __init__(self, process_batch, finish_job=None, batch_size=64, max_finished_jobs=100):
+        self.process_batch = process_batch
+        self.finish_job = finish_job
+        self.batch_size = max(batch_size, 1)
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, files, context=None):
+        job = IngestionJob(files, context)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                # Started lazily so spawned extraction workers never own one
+                self._worker = threading.Thread(target=self._run, name='ingestion-worker', daemon=True)
+                self._worker.start()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def active_jobs(self, context=None):
+        """Unfinished jobs, only those of the given context if there is one"""
+        with self._lock:
+            return [job for job in self.jobs.values()
+                    if not job.finished and (context is None or job.context == context)]
+
+    def cancel_all(self, context=None):
+        for job in self.active_jobs(context):
+            job.cancel()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished_jobs"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+            del self.jobs[job_id]
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if not job.start():
+                continue
+
+            for start in range(0, len(job.files), self.batch_size):
+                if job.cancelled:
+                    break
+                batch = job.files[start:start + self.batch_size]
+                job.mark_processing(batch)
+                try:
+                    failures = self.process_batch(job, batch)
+                except Exception as e:
+                    failures = {filename: str(e) or type(e).__name__ for _, filename in batch}
+                if failures is None:
+                    break
+                job.mark_done(batch, failures)
+
+            try:
+                if self.finish_job is not None:
+                    self.finish_job(job)
+            except Exception as e:
+                print(f"Error finishing ingestion job {job.id}: {e}")
+            job.finish()
@@ -0,0 +1,135 @@
+"""
+Job Queries for AI-Powered Resume Ranker
+Compiles a job description and its keyword weights once into a preprocessed,
+weighted query vector, a BM25 query and a KeywordMatcher. Compiled jobs are kept in an LRU
+cache keyed by a hash of the description and keyword weights, so repeated
+/rank calls and requisitions reused after a reset skip all job-side work.
+"""
+
+import json
+import weakref
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+from tokenizer import tokenize
+from keyword_matcher import KeywordMatcher
+from bm25 import Bm25Query
+
+
+def job_key(job_description, keywords=None):
+    """Hash of a job description and the keyword weights given with it"""
+    payload = json.dumps([job_description, sorted((keywords or {}).items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def job_keywords(job_description, keywords=None):
+    """Normalise the given keywords or extract them from the job description
+
+    Without keywords, the 20 most frequent words of the description weigh
+    1.0 each, leaving out those of three letters.
+    """
+    if keywords:
+        return {keyword.lower(): weight for keyword, weight in keywords.items()}
+    most_common = Counter(tokenize(job_description)).most_common(20)
+    return {word: 1.0 for word, _ in most_common if len(word) > 3}
+
+
+def resolved_for(resolved, target):
+    """Whether state resolved against an object, held by a weakref, belongs to target"""
+    return resolved is not None and resolved() is target
+
+
+class JobQuery:
+    """Preprocessed terms, query vector and keyword matcher of one job
+
+    The per-corpus state is kept with weak references to the vocabulary and
+    index it was resolved against: JobQueryCache is shared by every
+    workspace, and must not keep superseded or unloaded indexes alive.
+    """
+
+    def __init__(self, key, job_description, keywords):
+        self.key = key
+        self.job_description = job_description
+        self.keywords = keywords
+        self.term_counts = Counter(tokenize(job_description))
+        self.matcher = KeywordMatcher(keywords)
+        self._ids = (None, 0, {})
+        self._vector = (None, None, None)
+        self._bm25 = (None, None, None)
+
+    def term_ids(self, vocabulary):
+        """{term id: count} of the description, unknown terms get negative ids
+
+        Resolved again only after the vocabulary has grown.
+        """
+        resolved_vocabulary, size, query_tf = self._ids
+        if not resolved_for(resolved_vocabulary, vocabulary) or size != len(vocabulary):
+            terms = list(self.term_counts)
+            query_tf = dict(zip(vocabulary.lookup(terms), self.term_counts.values()))
+            self._ids = (weakref.ref(vocabulary), len(vocabulary), query_tf)
+        return query_tf
+
+    def vector(self, index, vocabulary):
+        """TF-IDF query vector for the corpus, reused until the index changes"""
+        vector_index, version, vector = self._vector
+        if not resolved_for(vector_index, index) or version != index.version:
+            vector = index.query_vector(self.term_ids(vocabulary))
+            self._vector = (weakref.ref(index), index.version, vector)
+        return vector
+
+    def bm25_query(self, index, vocabulary):
+        """Bm25Query for the corpus, reused until the index changes
+
+        The weight of a keyword is added to the count of each of its terms,
+        so keywords boost their terms within the one BM25 score instead of
+        adding a separate keyword score that would need every resume.
+        """
+        query_index, version, query = self._bm25
+        if not resolved_for(query_index, index) or version != index.version:
+            weights = dict(self.term_ids(vocabulary))
+            for term_ids, weight in self.matcher.phrase_ids(vocabulary):
+                for term in term_ids:
+                    weights[term] = weights.get(term, 0) + weight
+            query = Bm25Query(index, weights)
+            self._bm25 = (weakref.ref(index), index.version, query)
+        return query
+
+
+class JobQueryCache:
+    """LRU cache of compiled JobQuery objects by job_key"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            query = self.entries.get(key)
+            if query is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return query
+
+    def put(self, query):
+        with self._lock:
+            self.entries[query.key] = query
+            self.entries.move_to_end(query.key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries
+            }
@@ -0,0 +1,136 @@
+"""
+Keyword Matcher for AI-Powered Resume Ranker
+Compiles the weighted keywords of a job once into phrases of tokens and
+matches them against the postings and token arrays of the corpus, so a
+keyword only hits whole words ("java" no longer matches "javascript") and a
+multi-word keyword like "machine learning" has to appear as consecutive words.
+"""
+
+import weakref
+
+from tokenizer import tokenize, short_words
+
+
+def find_phrases(phrases, postings, rows_of_docs, resume_tokens):
+    """Rows of the resumes containing each phrase, a list per phrase
+
+    phrases are tuples of two or more term ids. The candidates of a phrase
+    are the documents holding all of its terms, intersecting the shortest
+    postings first. Every candidate document is then scanned once for all
+    the phrases it may hold, looked up by their first term, so the cost
+    follows the candidate documents rather than phrases x corpus.
+    """
+    pending = {}
+    for position, phrase in enumerate(phrases):
+        term_postings = sorted((postings.get(term, {}) for term in set(phrase)), key=len)
+        candidates = term_postings[0].keys()
+        for other in term_postings[1:]:
+            if not candidates:
+                break
+            candidates = [doc_id for doc_id in candidates if doc_id in other]
+        for doc_id in candidates:
+            pending.setdefault(doc_id, []).append(position)
+
+    rows = [[] for _ in phrases]
+    for doc_id, positions in pending.items():
+        row = rows_of_docs[doc_id]
+        tokens = resume_tokens[row]
+        starts = {}
+        for position in positions:
+            starts.setdefault(phrases[position][0], []).append(position)
+
+        remaining = len(positions)
+        for i, token in enumerate(tokens):
+            if token not in starts:
+                continue
+            for position in starts[token]:
+                phrase = phrases[position]
+                if rows[position] and rows[position][-1] == row:
+                    continue
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    rows[position].append(row)
+                    remaining -= 1
+            if not remaining:
+                break
+
+    return rows
+
+
+class KeywordMatcher:
+    """Weighted keywords of one job, compiled into phrases of terms
+
+    Keywords are tokenized like the resumes. Keywords with the same terms
+    add up their weights. Words of two characters or less ('5', 'ai', the
+    'c' of 'c++') are not in the token arrays of the resumes, so a keyword
+    holding one cannot be matched as written; instead of widening it to its
+    other words ('5 years' to 'years') it is left out and listed in
+    self.ignored, like keywords without any term. Stop words are dropped
+    from resumes and keywords alike, so 'ruby on rails' still matches.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = keywords
+        self.ignored = []
+        phrase_weights = {}
+        for keyword, weight in keywords.items():
+            terms = tuple(tokenize(keyword))
+            if not terms or short_words(keyword):
+                self.ignored.append(keyword)
+                continue
+            phrase_weights[terms] = phrase_weights.get(terms, 0) + weight
+        self.phrases = list(phrase_weights.items())
+        self._resolved = (None, 0, [])
+
+    def phrase_ids(self, vocabulary):
+        """(term ids, weight) of the phrases whose terms are all in the vocabulary
+
+        The vocabulary only grows, so the ids are resolved again only after
+        new terms were interned.
+        """
+        resolved_vocabulary, size, phrase_ids = self._resolved
+        if resolved_vocabulary is None or resolved_vocabulary() is not vocabulary or size != len(vocabulary):
+            phrase_ids = []
+            for terms, weight in self.phrases:
+                term_ids = tuple(vocabulary.lookup(terms))
+                if min(term_ids) >= 0:
+                    phrase_ids.append((term_ids, weight))
+            # Weakly, the matcher lives in the job cache shared by every workspace
+            self._resolved = (weakref.ref(vocabulary), len(vocabulary), phrase_ids)
+        return phrase_ids
+
+    def scores(self, vocabulary, postings, rows_of_docs, resume_tokens):
+        """Summed weight of the keywords found in every resume"""
+        phrase_ids = self.phrase_ids(vocabulary)
+        multi_term = [term_ids for term_ids, _ in phrase_ids if len(term_ids) > 1]
+        phrase_rows = iter(find_phrases(multi_term, postings, rows_of_docs, resume_tokens))
+
+        scores = [0] * len(resume_tokens)
+        for term_ids, weight in phrase_ids:
+            if len(term_ids) == 1:
+                rows = [rows_of_docs[doc_id] for doc_id in postings.get(term_ids[0], ())]
+            else:
+                rows = next(phrase_rows)
+            for row in rows:
+                scores[row] += weight
+        return scores
+
+    def doc_scores(self, vocabulary, postings, doc_ids, token_rows):
+        """Summed weight of the keywords found in each of a few resumes
+
+        doc_ids and their token arrays, token_rows, are looked up directly
+        instead of walking the postings of every keyword, for shortlists.
+        """
+        scores = [0] * len(doc_ids)
+        for term_ids, weight in self.phrase_ids(vocabulary):
+            term_postings = [postings.get(term, ()) for term in set(term_ids)]
+            for i, doc_id in enumerate(doc_ids):
+                if not all(doc_id in holders for holders in term_postings):
+                    continue
+                if len(term_ids) > 1:
+                    tokens = token_rows[i]
+                    if not any(tuple(tokens[start:start + len(term_ids)]) == term_ids
+                               for start in range(len(tokens) - len(term_ids) + 1)
+                               if tokens[start] == term_ids[0]):
+                        continue
+                scores[i] += weight
+        return scores
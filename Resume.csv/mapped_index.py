@@ -0,0 +1,136 @@
+"""
+Mapped Index for AI-Powered Resume Ranker
+Read-only ResumeIndex over the flat arrays of a saved index, typically views
+of memory-mapped files. Nothing is copied into dicts, so every worker process
+serving the same index shares one copy of it through the page cache.
+"""
+
+from bisect import bisect_left
+
+from resume_index import ResumeIndex, DocumentColumns
+
+
+def _find(sorted_ids, doc_id):
+    """Position of doc_id in an ascending sequence, or -1"""
+    position = bisect_left(sorted_ids, doc_id)
+    if position < len(sorted_ids) and sorted_ids[position] == doc_id:
+        return position
+    return -1
+
+
+class TermPostings:
+    """{doc_id: tf} of one term as two parallel arrays sorted by doc id"""
+
+    def __init__(self, doc_ids, tfs):
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def __iter__(self):
+        return iter(self._doc_ids)
+
+    def __contains__(self, doc_id):
+        return _find(self._doc_ids, doc_id) >= 0
+
+    def __getitem__(self, doc_id):
+        position = _find(self._doc_ids, doc_id)
+        if position < 0:
+            raise KeyError(doc_id)
+        return self._tfs[position]
+
+    def get(self, doc_id, default=None):
+        position = _find(self._doc_ids, doc_id)
+        return self._tfs[position] if position >= 0 else default
+
+    def keys(self):
+        return self._doc_ids
+
+    def values(self):
+        return self._tfs
+
+    def items(self):
+        return zip(self._doc_ids, self._tfs)
+
+
+class MappedPostings:
+    """term id -> TermPostings, read from CSR-style offsets into doc id and tf arrays"""
+
+    def __init__(self, offsets, doc_ids, tfs):
+        self._offsets = offsets
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+        self._num_terms = None
+
+    def get(self, term, default=None):
+        if term < 0 or term >= len(self._offsets) - 1:
+            return default
+        start, stop = self._offsets[term], self._offsets[term + 1]
+        if start == stop:
+            return default
+        return TermPostings(self._doc_ids[start:stop], self._tfs[start:stop])
+
+    def arrays(self, term):
+        """(doc ids, tfs) views of the postings of term, empty for unknown terms"""
+        if term < 0 or term >= len(self._offsets) - 1:
+            return self._doc_ids[:0], self._tfs[:0]
+        start, stop = self._offsets[term], self._offsets[term + 1]
+        return self._doc_ids[start:stop], self._tfs[start:stop]
+
+    def __contains__(self, term):
+        return self.get(term) is not None
+
+    def __getitem__(self, term):
+        term_postings = self.get(term)
+        if term_postings is None:
+            raise KeyError(term)
+        return term_postings
+
+    def __len__(self):
+        if self._num_terms is None:
+            offsets = self._offsets
+            self._num_terms = sum(offsets[term] != offsets[term + 1] for term in range(len(offsets) - 1))
+        return self._num_terms
+
+    def items(self):
+        for term in range(len(self._offsets) - 1):
+            term_postings = self.get(term)
+            if term_postings is not None:
+                yield term, term_postings
+
+
+class MappedIndex(ResumeIndex):
+    """ResumeIndex read straight from the arrays written by to_arrays
+
+    The norm sums were refreshed before the arrays were written, so scoring
+    never needs to change them; every method that would raises TypeError.
+    version is the generation of the saved index.
+    """
+
+    def __init__(self, offsets, doc_ids, tfs, max_tfs, lengths, norm_sums, present, next_doc_id, version):
+        self.postings = MappedPostings(offsets, doc_ids, tfs)
+        self.max_tfs = max_tfs
+        self.doc_lengths = DocumentColumns(lengths, present)
+        # Absent doc ids have a length of 0
+        self.total_length = sum(lengths)
+        self._norm_sums = DocumentColumns(norm_sums, present, 3, self.doc_lengths.count)
+        self.next_doc_id = next_doc_id
+        self.version = version
+        self._dirty_terms = ()
+
+    def snapshot(self):
+        return self
+
+    def _refresh_norm_sums(self):
+        pass
+
+    def posting_arrays(self, term):
+        return self.postings.arrays(term)
+
+    def add_document(self, terms, doc_id=None):
+        raise TypeError('A mapped index is read-only')
+
+    def remove_document(self, doc_id, terms):
+        raise TypeError('A mapped index is read-only')
+
@@ -0,0 +1,192 @@
+"""
+Metrics for AI-Powered Resume Ranker
+Process-wide counters, gauges and stage timings, rendered in the Prometheus
+text exposition format by /metrics. Stages of the ranking pipeline are timed
+with span(); a request that asks for a profile also gets its own breakdown
+of the stages it went through.
+Each worker process of serve.py keeps its own metrics.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = 'resume_ranker_'
+
+# Upper bounds of the stage duration histogram buckets, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """Counters, duration histograms and metrics collected when rendered
+
+    Counters and histograms are updated under one lock, a couple of dict
+    updates per stage, so timing stays on while profiling is off.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+        self._collected = []
+        self._help = {}
+        self._local = threading.local()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        """Add seconds to the histogram name"""
+        self._observe((name, tuple(sorted(labels.items()))), seconds)
+
+    def _observe(self, key, seconds):
+        bucket = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = [0, 0.0, [0] * (len(BUCKETS) + 1)]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2][bucket] += 1
+
+    def observe_stage(self, stage, seconds):
+        """Record one run of stage, and add it to the profile of this thread if any"""
+        self._observe(('stage_duration_seconds', (('stage', stage),)), seconds)
+        profile = getattr(self._local, 'profile', None)
+        if profile is not None:
+            profile[stage] = profile.get(stage, 0.0) + seconds
+
+    def span(self, stage):
+        """Context manager timing a stage"""
+        return Span(self, stage)
+
+    def collect(self, name, help_text, collect, kind='gauge'):
+        """Metric read from collect() when rendered
+
+        collect returns a number, or {labels: number} with labels a tuple of
+        (label, value) pairs. kind is 'counter' for totals kept elsewhere,
+        like the hits of a cache.
+        """
+        self.describe(name, help_text)
+        self._collected.append((name, kind, collect))
+
+    def start_profile(self):
+        """Collect the stages timed by this thread until stop_profile"""
+        self._local.profile = {}
+
+    def stop_profile(self):
+        """{stage: seconds} since start_profile, None if no profile was started"""
+        profile = getattr(self._local, 'profile', None)
+        self._local.profile = None
+        return profile
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {key: (count, total, list(buckets))
+                       for key, (count, total, buckets) in self._timings.items()}
+
+        lines = []
+        by_name = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(by_name):
+            self._header(lines, name, 'counter')
+            for labels, value in sorted(by_name[name]):
+                lines.append(f'{PREFIX}{name}{format_labels(labels)} {format_value(value)}')
+
+        previous = None
+        for name, labels in sorted(timings):
+            if name != previous:
+                self._header(lines, name, 'histogram')
+                previous = name
+            count, total, buckets = timings[name, labels]
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (math.inf,), buckets):
+                cumulative += bucket_count
+                le = '+Inf' if bound == math.inf else repr(bound)
+                lines.append(f'{PREFIX}{name}_bucket{format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{PREFIX}{name}_sum{format_labels(labels)} {format_value(total)}')
+            lines.append(f'{PREFIX}{name}_count{format_labels(labels)} {count}')
+
+        for name, kind, collect in self._collected:
+            try:
+                values = collect()
+            except Exception as e:
+                print(f"Error collecting metric {name}: {e}")
+                continue
+            self._header(lines, name, kind)
+            if not isinstance(values, dict):
+                values = {(): values}
+            for labels, value in sorted(values.items()):
+                lines.append(f'{PREFIX}{name}{format_labels(labels)} {format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, lines, name, kind):
+        if name in self._help:
+            lines.append(f'# HELP {PREFIX}{name} {self._help[name]}')
+        lines.append(f'# TYPE {PREFIX}{name} {kind}')
+
+
+class Span:
+    """Times the block it wraps as one run of a stage"""
+
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.observe_stage(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    """{name="value",...} of a tuple of (name, value) pairs, empty for none"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def server_timing(profile):
+    """Server-Timing header value of a {stage: seconds} profile, in milliseconds"""
+    return ', '.join(f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in profile.items())
+
+
+# Registry of this process
+metrics = Metrics()
+span = metrics.span
+
+metrics.describe('documents_indexed_total', 'Resumes added to an index')
+metrics.describe('documents_removed_total', 'Resumes removed from an index')
+metrics.describe('duplicates_total', 'Near-duplicate resumes found at ingest, flagged or collapsed')
+metrics.describe('extractions_total', 'Resume files extracted, cache misses only')
+metrics.describe('extraction_errors_total', 'Resume files that failed to extract or were read only in part')
+metrics.describe('requests_total', 'HTTP requests by endpoint and status code')
+metrics.describe('stage_duration_seconds', 'Duration of the stages of uploads and rankings')
+metrics.describe('request_duration_seconds', 'Duration of HTTP requests by endpoint')
@@ -0,0 +1,212 @@
+"""
+Near-Duplicate Detection for AI-Powered Resume Ranker
+MinHash signatures over shingles of consecutive tokens and an LSH index of
+their bands, so every new resume is checked against the corpus by probing a
+few buckets instead of comparing it with each resume. Candidates sharing a
+band are confirmed with the Jaccard similarity of their shingle sets.
+NumPy is optional and only makes signatures faster; both paths agree.
+"""
+
+import random
+from array import array
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Shingles are runs of this many consecutive tokens
+SHINGLE_SIZE = 3
+
+# LSH_BANDS bands of LSH_ROWS MinHash values: resumes sharing every value of
+# any band become candidates, likely from a Jaccard similarity of about
+# (1 / LSH_BANDS) ** (1 / LSH_ROWS) = 0.6 up
+LSH_BANDS = 8
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+# Shingles and MinHash values are reduced modulo a 31-bit prime, so every
+# product fits in 64 bits for NumPy; band keys modulo a 61-bit one
+PRIME = (1 << 31) - 1
+BAND_PRIME = (1 << 61) - 1
+SHINGLE_MULTIPLIER = 0x9E3779B1
+
+_rng = random.Random(20240521)
+PERMUTATIONS = [(_rng.randrange(1, PRIME), _rng.randrange(PRIME)) for _ in range(NUM_PERMUTATIONS)]
+if HAS_NUMPY:
+    _A = np.array([[a] for a, _ in PERMUTATIONS], dtype=np.uint64)
+    _B = np.array([[b] for _, b in PERMUTATIONS], dtype=np.uint64)
+
+
+def shingle_hashes(tokens, size=SHINGLE_SIZE):
+    """Set of the hashes of every run of size token ids, the whole resume if shorter"""
+    if len(tokens) < size:
+        windows = [tokens] if len(tokens) else []
+    elif HAS_NUMPY:
+        # Every partial value is below PRIME, so each product fits in 64 bits
+        ids = np.asarray(tokens, dtype=np.uint64) + np.uint64(1)
+        values = ids[:len(ids) - size + 1] % np.uint64(PRIME)
+        for i in range(1, size):
+            values = (values * np.uint64(SHINGLE_MULTIPLIER) + ids[i:len(ids) - size + 1 + i]) % np.uint64(PRIME)
+        return set(values.tolist())
+    else:
+        windows = zip(*[tokens[i:len(tokens) - size + 1 + i] for i in range(size)])
+    hashes = set()
+    for window in windows:
+        value = 0
+        for token in window:
+            value = (value * SHINGLE_MULTIPLIER + token + 1) % PRIME
+        hashes.add(value)
+    return hashes
+
+
+def signature(shingles):
+    """MinHash of a shingle set under NUM_PERMUTATIONS hash functions, None if it is empty"""
+    if not shingles:
+        return None
+    if HAS_NUMPY:
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        return array('I', ((_A * values + _B) % np.uint64(PRIME)).min(axis=1).tolist())
+    return array('I', [min([(a * value + b) % PRIME for value in shingles]) for a, b in PERMUTATIONS])
+
+
+def band_keys(minhash):
+    """One non-zero key per LSH band of a signature, distinct across bands"""
+    keys = array('Q')
+    for band in range(LSH_BANDS):
+        key = band + 1
+        for value in minhash[band * LSH_ROWS:(band + 1) * LSH_ROWS]:
+            key = (key * SHINGLE_MULTIPLIER + value + 1) % BAND_PRIME
+        keys.append(key or 1)
+    return keys
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class DuplicateIndex:
+    """LSH buckets of the canonical resumes, band key -> doc ids
+
+    One open-addressing table in two parallel arrays instead of a dict per
+    band: key 0 marks a free slot and REMOVED the doc id of a deleted entry,
+    so a resume costs LSH_BANDS * 12 bytes over the free slots rather than
+    LSH_BANDS dict entries and int objects. The arrays are saved with the
+    index and loaded back as they are.
+    """
+
+    REMOVED = 0xFFFFFFFF
+    MIN_SLOTS = 1024
+
+    def __init__(self, keys=None, doc_ids=None, used=0, entries=0):
+        if keys is None:
+            keys = array('Q', bytes(8 * self.MIN_SLOTS))
+            doc_ids = array('I', bytes(4 * self.MIN_SLOTS))
+        self.keys = keys
+        self.doc_ids = doc_ids
+        # Slots taken, removed entries included, and live entries
+        self.used = used
+        self.entries = entries
+
+    def __len__(self):
+        """Number of resumes in the buckets"""
+        return self.entries // LSH_BANDS
+
+    def _slots(self, key):
+        """Slots of the probe sequence of key, up to the first free one"""
+        mask = len(self.keys) - 1
+        slot = key & mask
+        while self.keys[slot]:
+            yield slot
+            slot = (slot + 1) & mask
+
+    def candidates(self, keys):
+        """Doc ids sharing at least one band key"""
+        found = set()
+        for key in keys:
+            for slot in self._slots(key):
+                if self.keys[slot] == key and self.doc_ids[slot] != self.REMOVED:
+                    found.add(self.doc_ids[slot])
+        return found
+
+    def add(self, doc_id, keys):
+        if 2 * (self.used + len(keys)) > len(self.keys):
+            self._resize()
+        mask = len(self.keys) - 1
+        for key in keys:
+            slot = key & mask
+            while self.keys[slot]:
+                slot = (slot + 1) & mask
+            self.keys[slot] = key
+            self.doc_ids[slot] = doc_id
+        self.used += len(keys)
+        self.entries += len(keys)
+
+    def remove(self, doc_id, keys):
+        for key in keys:
+            for slot in self._slots(key):
+                if self.keys[slot] == key and self.doc_ids[slot] == doc_id:
+                    # The key stays, so probes for later keys still pass the slot
+                    self.doc_ids[slot] = self.REMOVED
+                    self.entries -= 1
+                    break
+
+    def _resize(self):
+        """Move the live entries into a table at most a quarter full, dropping removed ones"""
+        slots = self.MIN_SLOTS
+        while slots < 4 * (self.entries + LSH_BANDS):
+            slots *= 2
+        old_keys, old_doc_ids = self.keys, self.doc_ids
+        self.keys = array('Q', bytes(8 * slots))
+        self.doc_ids = array('I', bytes(4 * slots))
+        mask = slots - 1
+        for key, doc_id in zip(old_keys, old_doc_ids):
+            if key and doc_id != self.REMOVED:
+                slot = key & mask
+                while self.keys[slot]:
+                    slot = (slot + 1) & mask
+                self.keys[slot] = key
+                self.doc_ids[slot] = doc_id
+        self.used = self.entries
+
+
+class Duplicate:
+    """A resume found to be a near-duplicate of an earlier, canonical one
+
+    Collapsed duplicates are kept out of the index, so their tokens and
+    file stats (size, mtime, sha256) are held here instead.
+    """
+
+    __slots__ = ('filename', 'duplicate_of', 'similarity', 'tokens', 'stats')
+
+    def __init__(self, filename, duplicate_of, similarity, tokens=None, stats=None):
+        self.filename = filename
+        self.duplicate_of = duplicate_of
+        self.similarity = similarity
+        self.tokens = tokens
+        self.stats = stats
+
+    @property
+    def collapsed(self):
+        return self.tokens is not None
+
+    def to_dict(self):
+        return {
+            'filename': self.filename,
+            'duplicate_of': self.duplicate_of,
+            'similarity': round(self.similarity * 100, 2),
+            'collapsed': self.collapsed
+        }
+
+
+def duplicate_groups(duplicates):
+    """Duplicates grouped under their canonical resume, largest groups first"""
+    groups = {}
+    for duplicate in sorted(duplicates, key=lambda duplicate: duplicate.filename):
+        groups.setdefault(duplicate.duplicate_of, []).append(duplicate.to_dict())
+    return [{'filename': filename, 'duplicates': members}
+            for filename, members in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))]
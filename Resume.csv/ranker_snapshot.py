@@ -0,0 +1,349 @@
+"""
+Ranker Snapshots for AI-Powered Resume Ranker
+Immutable view of a ranker's corpus and job description. The ranker
+publishes a new snapshot after every change, so /rank reads a consistent
+corpus without taking the writer lock while uploads build the next version.
+"""
+
+import threading
+
+from keyword_matcher import find_phrases
+from bm25 import bm25_scores, bm25_top, bm25_doc_scores
+from metrics import span
+from vector_backend import CsrScoringBackend, HAS_VECTOR_BACKEND, np
+from top_k import select_top, score_summary
+
+
+class RankerSnapshot:
+    """Scoring and ranking over one published version of the corpus
+
+    The index is a ResumeIndex.snapshot() or a MappedIndex, the corpus a
+    read-only ResumeCorpus.snapshot() and the vocabulary is append-only, so
+    any number of threads can rank against a snapshot while the ranker
+    moves on. doc_ids, resume_names and resume_tokens are the columns of
+    the corpus, row by row, and duplicates maps the filename of each
+    near-duplicate resume to its Duplicate. scoring is 'tfidf' for the
+    TF-IDF cosine plus keyword score, or 'bm25'. semantic_retriever, if
+    given, shortlists the resumes of a page by their LSA embeddings.
+    previous is the snapshot this one follows, whose CSR backend is updated
+    rather than compiled again.
+    """
+
+    SIMILARITY_WEIGHT = 0.7
+    KEYWORD_WEIGHT = 0.3
+
+    def __init__(self, vocabulary, index, corpus, job_query, vector_backend_min_resumes, duplicates=None,
+                 scoring='tfidf', semantic_retriever=None, previous=None):
+        self.vocabulary = vocabulary
+        self.index = index
+        self.corpus = corpus.snapshot()
+        self.doc_ids = self.corpus.doc_ids
+        self.resume_names = self.corpus.names
+        self.resume_tokens = self.corpus.token_rows
+        self.job_query = job_query
+        self.vector_backend_min_resumes = vector_backend_min_resumes
+        self.duplicates = dict(duplicates or {})
+        self.scoring = scoring
+        self.semantic_retriever = semantic_retriever
+        self.vector_backend = None
+        if HAS_VECTOR_BACKEND:
+            self.vector_backend = CsrScoringBackend(vocabulary, previous.vector_backend if previous is not None else None)
+        self._rows_of_docs = None
+        # Only held while the CSR matrix of this snapshot is compiled
+        self._build_lock = threading.Lock()
+
+    def with_job_query(self, job_query):
+        """The same corpus ranked against another job"""
+        snapshot = RankerSnapshot.__new__(RankerSnapshot)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.job_query = job_query
+        return snapshot
+
+    def use_vector_backend(self):
+        """Whether the corpus is large enough for the CSR backend"""
+        return (self.vector_backend is not None
+                and len(self.resume_tokens) >= self.vector_backend_min_resumes)
+
+    def calculate_scores(self):
+        """Calculate similarity scores for all resumes"""
+        return self.calculate_job_scores(self.job_query)
+
+    def calculate_job_scores(self, job_query, keyword_scores=None, max_keyword_score=None):
+        """Calculate similarity scores for all resumes against one job
+
+        A shard of a sharded corpus (shards.py) scores on the postings path
+        and passes the raw keyword_scores it already found with the best
+        keyword score of all shards, max_keyword_score, which normalises them
+        instead of its own best one.
+        """
+        if not self.resume_tokens:
+            return []
+
+        if self.scoring == 'bm25':
+            with span('bm25'):
+                return bm25_scores(self.index, job_query.bm25_query(self.index, self.vocabulary), self.doc_ids)
+
+        if self.use_vector_backend():
+            return self.calculate_score_matrix([job_query])[:, 0].tolist()
+
+        # Cosine similarity between job description and each resume, using
+        # only the postings of the job description terms
+        with span('tfidf'):
+            query_vector = job_query.vector(self.index, self.vocabulary)
+        with span('cosine'):
+            doc_scores = self.index.cosine_scores(query_vector)
+            similarities = [doc_scores.get(doc_id, 0) for doc_id in self.doc_ids]
+
+        # Calculate keyword-based scores from the postings of the keyword terms
+        with span('keywords'):
+            if keyword_scores is None:
+                keyword_scores = self.keyword_scores(job_query)
+
+            # Normalize keyword scores
+            if keyword_scores:
+                if max_keyword_score is None:
+                    max_keyword_score = max(keyword_scores)
+                if max_keyword_score > 0:
+                    keyword_scores = [score / max_keyword_score for score in keyword_scores]
+
+        # Combine similarity and keyword scores
+        with span('combine'):
+            final_scores = []
+            for i in range(len(similarities)):
+                combined_score = (similarities[i] * self.SIMILARITY_WEIGHT) + (keyword_scores[i] * self.KEYWORD_WEIGHT)
+                final_scores.append(combined_score)
+
+        return final_scores
+
+    def keyword_scores(self, job_query):
+        """Summed weight of the keywords of one job found in every resume"""
+        return job_query.matcher.scores(self.vocabulary, self.index.postings, self.rows_of_docs(), self.resume_tokens)
+
+    def shortlist_scores(self, job_query, rows):
+        """Scores of the resumes at rows against one job, looking up only those resumes
+
+        The scores are those of calculate_job_scores, except that keyword
+        scores are normalised by the best one on the shortlist rather than
+        in the whole corpus.
+        """
+        doc_ids = [self.doc_ids[row] for row in rows]
+        if self.scoring == 'bm25':
+            return bm25_doc_scores(self.index, job_query.bm25_query(self.index, self.vocabulary), doc_ids)
+
+        query_vector = job_query.vector(self.index, self.vocabulary)
+        doc_scores = self.index.cosine_scores(query_vector, doc_ids)
+        keyword_scores = job_query.matcher.doc_scores(self.vocabulary, self.index.postings, doc_ids,
+                                                      [self.resume_tokens[row] for row in rows])
+        max_keyword_score = max(keyword_scores, default=0)
+        if max_keyword_score > 0:
+            keyword_scores = [score / max_keyword_score for score in keyword_scores]
+
+        return [doc_scores.get(doc_id, 0) * self.SIMILARITY_WEIGHT + keyword_score * self.KEYWORD_WEIGHT
+                for doc_id, keyword_score in zip(doc_ids, keyword_scores)]
+
+    def rows_of_docs(self):
+        """Row of every doc id"""
+        if self._rows_of_docs is None:
+            self._rows_of_docs = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        return self._rows_of_docs
+
+    def phrase_rows(self, phrases):
+        """Rows of the resumes containing each phrase of term ids"""
+        return find_phrases(phrases, self.index.postings, self.rows_of_docs(), self.resume_tokens)
+
+    def calculate_score_matrix(self, jobs):
+        """Scores of every resume (rows) against every JobQuery (columns)"""
+        backend = self.built_vector_backend()
+
+        with span('tfidf'):
+            query_vectors = [job_query.vector(self.index, self.vocabulary) for job_query in jobs]
+        with span('cosine'):
+            similarities = backend.cosine_score_matrix(query_vectors)
+        with span('keywords'):
+            keyword_scores = backend.keyword_score_matrix([job_query.matcher for job_query in jobs], self.phrase_rows)
+
+            # Normalize keyword scores per job
+            max_keyword_scores = keyword_scores.max(axis=0) if len(keyword_scores) else 0
+            keyword_scores = keyword_scores / np.where(max_keyword_scores > 0, max_keyword_scores, 1)
+
+        with span('combine'):
+            return similarities * self.SIMILARITY_WEIGHT + keyword_scores * self.KEYWORD_WEIGHT
+
+    def built_vector_backend(self):
+        """The CSR backend compiled for this snapshot"""
+        with span('csr_build'), self._build_lock:
+            self.vector_backend.build(self.index, self.doc_ids, self.resume_tokens)
+        return self.vector_backend
+
+    def build_results(self, scores, top_k=None, offset=0, min_score=None):
+        """Turn a score per resume into ranked result rows, best first
+
+        Only the rows of the requested page are built; min_score is a
+        percentage like the returned scores.
+        """
+        if min_score is not None:
+            min_score = min_score / 100
+        with span('select'):
+            order = select_top(scores, top_k, offset, min_score)
+
+        return self.result_rows([(i, scores[i]) for i in order], offset)
+
+    def result_rows(self, ranked, offset=0):
+        """Result rows of (row, score) pairs, best first, ranked from offset + 1"""
+        results = []
+        for rank, (i, score) in enumerate(ranked, start=offset + 1):
+            score = round(float(score) * 100, 2)
+            result = {
+                'rank': rank,
+                'filename': self.resume_names[i],
+                'score': score,
+                'similarity_percentage': score
+            }
+            duplicate = self.duplicates.get(result['filename'])
+            if duplicate is not None:
+                result['duplicate_of'] = duplicate.duplicate_of
+            results.append(result)
+
+        return results
+
+    def bm25_page(self, top_k, offset=0, min_score=None):
+        """(row, score) of a page of the BM25 ranking found with MaxScore pruning
+
+        None unless the snapshot scores with BM25 and the page has a top_k,
+        or when the page needs resumes that do not match the job at all.
+        """
+        if self.scoring != 'bm25' or top_k is None or not self.resume_tokens:
+            return None
+        query = self.job_query.bm25_query(self.index, self.vocabulary)
+        with span('bm25'):
+            ranked = bm25_top(self.index, query, self.doc_ids, offset + top_k,
+                              min_score / 100 if min_score is not None else None)
+        return ranked[offset:] if ranked is not None else None
+
+    def semantic_top(self, limit, min_score=None):
+        """((row, score) of the limit best resumes on the semantic shortlist, lists probed)
+
+        The shortlist holds the resumes whose LSA embeddings are nearest to
+        the job and is re-scored with shortlist_scores; ties keep upload
+        order. None without a semantic stage, when the corpus is no larger
+        than the shortlist or the job has no term known to the embeddings.
+        """
+        retriever = self.semantic_retriever
+        if retriever is None or len(self.resume_tokens) <= max(retriever.shortlist, limit):
+            return None
+        with span('semantic'):
+            semantic = retriever.index_for(self)
+            query_embedding = None
+            if semantic is not None:
+                query_embedding = semantic.embed_query(self.job_query.vector(self.index, self.vocabulary))
+            if query_embedding is None:
+                return None
+            doc_ids, probed = semantic.search(query_embedding, max(retriever.shortlist, limit), retriever.probes)
+        rows = sorted(self.corpus.row_of_doc(doc_id) for doc_id in doc_ids.tolist())
+
+        with span('rescore'):
+            scores = self.shortlist_scores(self.job_query, rows)
+        with span('select'):
+            order = select_top(scores, limit, 0, min_score)
+        return [(rows[i], scores[i]) for i in order], probed
+
+    def rank_resumes(self, top_k=None, offset=0, min_score=None):
+        """Rank resumes and return results"""
+        ranked = self.bm25_page(top_k, offset, min_score)
+        if ranked is not None:
+            return self.result_rows(ranked, offset)
+        return self.build_results(self.calculate_scores(), top_k, offset, min_score)
+
+    def rank_page(self, top_k=None, offset=0, min_score=None, exhaustive=False, recall=False):
+        """Rank resumes and return one page of results with stats over all matches
+
+        A page with a top_k is ranked among the semantic shortlist, if there
+        is one, or found with pruning in BM25 mode, unless exhaustive is set;
+        it then has no total_matches and stats, which take every score.
+        With recall, a shortlisted page also reports the share of the
+        exhaustive top offset + top_k found on the shortlist.
+        """
+        semantic = None
+        if not exhaustive and top_k is not None:
+            semantic = self.semantic_top(offset + top_k, min_score / 100 if min_score is not None else None)
+        if semantic is not None:
+            ranked, probed = semantic
+            semantic = {'shortlist': max(self.semantic_retriever.shortlist, offset + top_k), 'lists_probed': probed}
+            if recall:
+                with span('recall'):
+                    semantic['recall_at_k'] = self.recall_at_k([row for row, _ in ranked], offset + top_k, min_score)
+            ranked = ranked[offset:]
+        elif not exhaustive:
+            ranked = self.bm25_page(top_k, offset, min_score)
+        else:
+            ranked = None
+        if ranked is not None:
+            page = {
+                'results': self.result_rows(ranked, offset),
+                'total_resumes': len(self.resume_tokens),
+                'total_matches': None,
+                'offset': offset,
+                'top_k': top_k,
+                'stats': None,
+                'pruned': True
+            }
+            if semantic is not None:
+                page['semantic'] = semantic
+            return page
+
+        scores = self.calculate_scores()
+        with span('stats'):
+            stats = score_summary(scores, min_score / 100 if min_score is not None else None)
+
+        return {
+            'results': self.build_results(scores, top_k, offset, min_score),
+            'total_resumes': len(scores),
+            'total_matches': stats['count'],
+            'offset': offset,
+            'top_k': top_k,
+            'stats': stats,
+            'pruned': False
+        }
+
+    def recall_at_k(self, rows, k, min_score=None):
+        """Share of the exhaustive top k (as percentages over min_score) among rows"""
+        scores = self.calculate_scores()
+        expected = select_top(scores, k, 0, min_score / 100 if min_score is not None else None)
+        if not expected:
+            return 1.0
+        return round(len(set(expected) & set(rows)) / len(expected), 4)
+
+    def rank_many(self, titles, job_queries, top_k=10, best_job_per_candidate=False):
+        """Rank the resumes against several compiled jobs sharing one corpus index
+
+        With the vector backend the whole jobs x resumes score matrix comes
+        out of a single pass over the CSR matrix.
+        """
+        if not self.resume_tokens or not job_queries:
+            score_columns = [[] for _ in job_queries]
+        elif self.use_vector_backend() and self.scoring != 'bm25':
+            score_columns = [column.tolist() for column in self.calculate_score_matrix(job_queries).T]
+        else:
+            score_columns = [self.calculate_job_scores(job_query) for job_query in job_queries]
+
+        ranking = {
+            'jobs': [{
+                'title': title,
+                'results': self.build_results(scores, top_k),
+                'total_resumes': len(scores)
+            } for title, scores in zip(titles, score_columns)]
+        }
+
+        if best_job_per_candidate:
+            candidates = []
+            for i, name in enumerate(self.resume_names):
+                best = max(range(len(job_queries)), key=lambda j: score_columns[j][i]) if job_queries else None
+                candidates.append({
+                    'filename': name,
+                    'best_job': titles[best] if best is not None else None,
+                    'score': round(score_columns[best][i] * 100, 2) if best is not None else 0
+                })
+            candidates.sort(key=lambda x: x['score'], reverse=True)
+            ranking['best_job_per_candidate'] = candidates
+
+        return ranking
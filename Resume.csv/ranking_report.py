@@ -0,0 +1,195 @@
+"""
+Ranking Reports for AI-Powered Resume Ranker
+Writes the full ranking of a published snapshot as Excel, CSV, JSON Lines
+or Parquet without the client posting the results back. Rows are produced
+one at a time from the ranked order of the scores and written as they come,
+to a write-only workbook, CSV or JSON Lines chunks or Parquet row groups,
+and the summary is
+gathered in the same pass, so memory does not grow with the rows.
+Parquet needs pyarrow, which is optional.
+"""
+
+import io
+import csv
+import json
+import threading
+from collections import OrderedDict
+
+from top_k import select_top
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PARQUET = True
+except ImportError:
+    pa = pq = None
+    HAS_PARQUET = False
+
+REPORT_COLUMNS = ['rank', 'filename', 'score', 'similarity_percentage']
+
+# Rows per CSV or JSON Lines chunk sent to the client and per Parquet row group
+CSV_CHUNK_ROWS = 1000
+PARQUET_ROW_GROUP_ROWS = 10000
+
+REPORT_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def ranking_id_of(snapshot):
+    """Id of the ranking of a snapshot: its index version and job
+
+    Worker processes mapping the same saved index generation give the same
+    id to the same ranking, so any of them can write its report.
+    """
+    return f'{snapshot.index.version}-{snapshot.job_query.key[:16]}'
+
+
+class RankingStore:
+    """LRU of the snapshots recently ranked by /rank, by workspace and ranking id
+
+    Snapshots share their index with the live ranker, so keeping a few
+    costs only the postings changed since.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, workspace_id, snapshot):
+        key = (workspace_id, ranking_id_of(snapshot))
+        with self._lock:
+            self.entries[key] = snapshot
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return key[1]
+
+    def get(self, workspace_id, ranking_id):
+        with self._lock:
+            snapshot = self.entries.get((workspace_id, ranking_id))
+            if snapshot is not None:
+                self.entries.move_to_end((workspace_id, ranking_id))
+            return snapshot
+
+    def discard(self, workspace_id):
+        """Forget the rankings of a workspace, e.g. once it is reset or deleted"""
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == workspace_id]:
+                del self.entries[key]
+
+
+class ReportSummary:
+    """Count, mean and extremes of the scores of the rows written so far"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.highest = None
+        self.lowest = None
+
+    def add(self, score):
+        self.count += 1
+        self.total += score
+        self.highest = score if self.highest is None else max(self.highest, score)
+        self.lowest = score if self.lowest is None else min(self.lowest, score)
+
+    def rows(self):
+        return [
+            ['Total Resumes', self.count],
+            ['Average Score', round(self.total / self.count, 2) if self.count else 0],
+            ['Highest Score', round(self.highest, 2) if self.count else 0],
+            ['Lowest Score', round(self.lowest, 2) if self.count else 0]
+        ]
+
+
+def ranking_rows(snapshot, min_score=None, top_k=None):
+    """[rank, filename, score, similarity_percentage] of every ranked resume, best first
+
+    Scores are computed once for the whole corpus, rows are made on demand.
+    top_k, if given, stops after the best top_k resumes.
+    """
+    scores = snapshot.calculate_scores()
+    order = select_top(scores, top_k, 0, min_score / 100 if min_score is not None else None)
+    names = snapshot.resume_names
+    for rank, i in enumerate(order, start=1):
+        score = round(float(scores[i]) * 100, 2)
+        yield [rank, names[i], score, score]
+
+
+def write_xlsx(rows, fileobj, columns=REPORT_COLUMNS, score_column=2):
+    """Rows to a 'Resume Rankings' sheet and their summary to a 'Summary' sheet
+
+    The write-only workbook keeps each sheet in a temporary file until it
+    is saved to fileobj instead of holding its cells. The summary covers
+    the score_column of the rows, or is left empty when it is None.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Resume Rankings')
+    sheet.append(columns)
+    summary = ReportSummary()
+    for row in rows:
+        if score_column is not None:
+            summary.add(row[score_column])
+        sheet.append(row)
+
+    summary_sheet = workbook.create_sheet('Summary')
+    summary_sheet.append(['Metric', 'Value'])
+    for row in summary.rows():
+        summary_sheet.append(row)
+    workbook.save(fileobj)
+
+
+def csv_chunks(rows, columns=REPORT_COLUMNS):
+    """CSV text of the rows in chunks of CSV_CHUNK_ROWS rows, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_chunks(rows, columns=REPORT_COLUMNS):
+    """One JSON object per row, keyed by the columns, in chunks of CSV_CHUNK_ROWS rows"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row))) + '\n')
+        if len(lines) == CSV_CHUNK_ROWS:
+            yield ''.join(lines)
+            lines = []
+    yield ''.join(lines)
+
+
+def write_parquet(rows, fileobj):
+    """Rows to a Parquet file, one row group per PARQUET_ROW_GROUP_ROWS rows"""
+    schema = pa.schema([('rank', pa.int64()), ('filename', pa.string()),
+                        ('score', pa.float64()), ('similarity_percentage', pa.float64())])
+    writer = pq.ParquetWriter(fileobj, schema)
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == PARQUET_ROW_GROUP_ROWS:
+                writer.write_table(parquet_table(batch, schema))
+                batch = []
+        if batch:
+            writer.write_table(parquet_table(batch, schema))
+    finally:
+        writer.close()
+
+
+def parquet_table(rows, schema):
+    columns = list(zip(*rows))
+    return pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                                schema=schema)
@@ -0,0 +1,402 @@
+"""
+Sparse Inverted Index for AI-Powered Resume Ranker
+Keeps postings lists and per-document norm statistics so that ranking only
+touches the terms of the job description instead of the whole vocabulary.
+Terms are the integer ids of a tokenizer.Vocabulary.
+Read-only snapshots share their postings with the live index, which copies
+whatever it changes afterwards, so readers never see a half-applied update.
+Document lengths and norm sums are arrays indexed by doc id rather than
+dicts of Python objects, and are written to disk and mapped back as they are.
+The total length and the highest tf of every term are kept up to date as
+documents come and go, for BM25 and its score upper bounds.
+"""
+
+import math
+from array import array
+from collections import Counter
+from itertools import compress
+
+
+class DocumentColumns:
+    """{doc_id: value} kept in arrays indexed by doc id
+
+    Every doc id below len(present) has width values in values, and
+    present flags the ones in use. Both may also be read-only views of a
+    mapped file. Doc ids are handed out in order, so the arrays stay dense.
+    """
+
+    def __init__(self, values, present, width=1, count=None):
+        self.values = values
+        self.present = present
+        self.width = width
+        self.count = bytes(present).count(1) if count is None else count
+
+    @classmethod
+    def empty(cls, typecode, width=1):
+        return cls(array(typecode), bytearray(), width, 0)
+
+    def copy(self):
+        return DocumentColumns(self.values[:], self.present[:], self.width, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return compress(range(len(self.present)), self.present)
+
+    def __contains__(self, doc_id):
+        return 0 <= doc_id < len(self.present) and self.present[doc_id] == 1
+
+    def __getitem__(self, doc_id):
+        if doc_id not in self:
+            raise KeyError(doc_id)
+        if self.width == 1:
+            return self.values[doc_id]
+        start = doc_id * self.width
+        return tuple(self.values[start:start + self.width])
+
+    def __setitem__(self, doc_id, value):
+        missing = doc_id + 1 - len(self.present)
+        if missing > 0:
+            self.present.extend(bytes(missing))
+            self.values.frombytes(bytes(missing * self.width * self.values.itemsize))
+        if not self.present[doc_id]:
+            self.present[doc_id] = 1
+            self.count += 1
+        if self.width == 1:
+            self.values[doc_id] = value
+        else:
+            start = doc_id * self.width
+            for offset, item in enumerate(value):
+                self.values[start + offset] = item
+
+    def __delitem__(self, doc_id):
+        if doc_id not in self:
+            raise KeyError(doc_id)
+        self.present[doc_id] = 0
+        self.count -= 1
+        start = doc_id * self.width
+        for offset in range(self.width):
+            self.values[start + offset] = 0
+
+    def keys(self):
+        return list(self)
+
+    def dense(self, slots):
+        """Copies of values and present padded with absent docs to slots doc ids"""
+        values = self.values[:]
+        present = bytearray(self.present)
+        missing = slots - len(present)
+        if missing > 0:
+            present.extend(bytes(missing))
+            values.frombytes(bytes(missing * self.width * values.itemsize))
+        return values, present
+
+
+class ResumeIndex:
+    """Inverted index from term id to {doc_id: term frequency}"""
+
+    def __init__(self):
+        self.postings = {}
+        self.doc_lengths = DocumentColumns.empty('I')
+        self.total_length = 0
+        self.next_doc_id = 0
+        self.version = 0
+
+        # Highest tf of each term id in any document. Removals leave it as
+        # it is, still an upper bound, and saving the index makes it exact
+        self.max_tfs = array('I')
+        # Postings of a term as (doc ids, tfs) arrays, by term, for the
+        # postings dicts they were made from
+        self._posting_arrays = {}
+
+        # Per-document sums used to rebuild TF-IDF norms for any corpus size:
+        # norm^2 = S0 * L^2 - 2 * S1 * L + S2 with L = log(N) and
+        # a_t = log(1 + df_t), S0 = sum(tf^2), S1 = sum(tf^2 * a_t),
+        # S2 = sum(tf^2 * a_t^2), stored as S0, S1, S2 per doc id
+        self._norm_sums = DocumentColumns.empty('d', 3)
+
+        # a_t currently folded into the norm sums of every document holding
+        # the term, and the terms whose df moved since they were folded
+        self._folded_a = {}
+        self._dirty_terms = set()
+
+        # After snapshot() the containers are shared until the next change,
+        # and postings only once copied are owned (None: all)
+        self._shared = False
+        self._owned_terms = None
+
+    @property
+    def num_docs(self):
+        return len(self.doc_lengths)
+
+    def snapshot(self):
+        """Read-only copy of the index as it is now, sharing its postings
+
+        The norm sums are refreshed first, so readers of the snapshot never
+        write to it.
+        """
+        self._refresh_norm_sums()
+        snapshot = type(self).__new__(type(self))
+        snapshot.__dict__.update(self.__dict__)
+        snapshot._dirty_terms = set()
+
+        self._shared = True
+        self._owned_terms = set()
+        return snapshot
+
+    def _unshare(self):
+        """Copy the containers shared with the last snapshot before a change"""
+        if self._shared:
+            self.postings = dict(self.postings)
+            # A copy of the document columns is a memcpy of a few bytes per doc
+            self.doc_lengths = self.doc_lengths.copy()
+            self._norm_sums = self._norm_sums.copy()
+            self.max_tfs = self.max_tfs[:]
+            self._folded_a = dict(self._folded_a)
+            self._shared = False
+
+    def _own_postings(self, term):
+        """Postings of term that can be changed without touching a snapshot"""
+        term_postings = self.postings.get(term)
+        if term_postings is None:
+            term_postings = self.postings[term] = {}
+        elif self._owned_terms is not None and term not in self._owned_terms:
+            term_postings = self.postings[term] = dict(term_postings)
+        if self._owned_terms is not None:
+            self._owned_terms.add(term)
+        self._posting_arrays.pop(term, None)
+        return term_postings
+
+    def add_document(self, terms, doc_id=None):
+        """Index a sequence of term ids and return the new document id"""
+        self._unshare()
+        if doc_id is None:
+            doc_id = self.next_doc_id
+        self.next_doc_id = max(self.next_doc_id, doc_id + 1)
+
+        # Fold the new document with the same a_t the other documents use, so
+        # a single refresh of the dirty terms brings everyone up to date
+        doc_sums = [0.0, 0.0, 0.0]
+        max_tfs = self.max_tfs
+        for term, tf in Counter(terms).items():
+            self._own_postings(term)[doc_id] = tf
+            if term >= len(max_tfs):
+                max_tfs.frombytes(bytes(4 * (term + 1 - len(max_tfs))))
+            if tf > max_tfs[term]:
+                max_tfs[term] = tf
+            a = self._folded_a.setdefault(term, 0.0)
+            tf_sq = tf * tf
+            doc_sums[0] += tf_sq
+            doc_sums[1] += tf_sq * a
+            doc_sums[2] += tf_sq * a * a
+            self._dirty_terms.add(term)
+
+        self._norm_sums[doc_id] = doc_sums
+        self.doc_lengths[doc_id] = len(terms)
+        self.total_length += len(terms)
+        self.version += 1
+        return doc_id
+
+    def remove_document(self, doc_id, terms):
+        """Remove a document previously indexed with the given terms"""
+        if doc_id not in self.doc_lengths:
+            return
+
+        self._unshare()
+        for term in set(terms):
+            if doc_id not in self.postings.get(term, ()):
+                continue
+            term_postings = self._own_postings(term)
+            del term_postings[doc_id]
+            if term_postings:
+                self._dirty_terms.add(term)
+            else:
+                # Last holder of the term, nothing left to correct
+                del self.postings[term]
+                del self._folded_a[term]
+                self._dirty_terms.discard(term)
+
+        del self._norm_sums[doc_id]
+        self.total_length -= self.doc_lengths[doc_id]
+        del self.doc_lengths[doc_id]
+        self.version += 1
+
+    def document_frequency(self, term):
+        return len(self.postings.get(term, ()))
+
+    def max_tf(self, term):
+        """Upper bound of the tf of term in any document"""
+        return self.max_tfs[term] if 0 <= term < len(self.max_tfs) else 0
+
+    def posting_arrays(self, term):
+        """(doc ids, tfs) of term as arrays sorted by doc id, empty for unknown terms
+
+        Doc ids are handed out in ascending order, so the postings dicts
+        already hold them sorted. The arrays are kept for as long as the
+        postings they were made from, shared by the snapshots.
+        """
+        term_postings = self.postings.get(term)
+        if not term_postings:
+            return array('I'), array('I')
+        cached = self._posting_arrays.get(term)
+        if cached is None or cached[0] is not term_postings:
+            cached = (term_postings, array('I', term_postings.keys()), array('I', term_postings.values()))
+            self._posting_arrays[term] = cached
+        return cached[1], cached[2]
+
+    def _refresh_norm_sums(self):
+        """Bring the norm sums up to date for terms whose df changed
+
+        Only the postings of the dirty terms are touched, so ranking after a
+        handful of uploads costs the delta rather than a full rebuild.
+        """
+        if self._dirty_terms:
+            self._unshare()
+        norm_values = self._norm_sums.values
+        for term in self._dirty_terms:
+            term_postings = self.postings[term]
+            old_a = self._folded_a[term]
+            new_a = math.log(1 + self.document_frequency(term))
+            if new_a == old_a:
+                continue
+
+            delta_a = new_a - old_a
+            delta_a_sq = new_a * new_a - old_a * old_a
+            for doc_id, tf in term_postings.items():
+                tf_sq = tf * tf
+                norm_values[3 * doc_id + 1] += tf_sq * delta_a
+                norm_values[3 * doc_id + 2] += tf_sq * delta_a_sq
+            self._folded_a[term] = new_a
+
+        self._dirty_terms.clear()
+
+    def to_arrays(self, num_terms):
+        """Flatten the postings and norm sums into typed arrays for persistence
+
+        The postings of term id t are doc_ids/tfs[offsets[t]:offsets[t + 1]]
+        for every id below num_terms, empty for terms no document holds.
+        Postings are sorted by doc id, so a MappedIndex can search them in
+        place, max_tfs holds the highest tf of every term, and the lengths,
+        norm sums and present flags of the documents are their columns
+        padded to next_doc_id ids.
+        """
+        self._refresh_norm_sums()
+
+        offsets = array('Q', [0])
+        doc_ids = array('I')
+        tfs = array('I')
+        max_tfs = array('I', bytes(4 * num_terms))
+        for term in range(num_terms):
+            term_postings = self.postings.get(term)
+            if term_postings:
+                for doc_id in sorted(term_postings):
+                    doc_ids.append(doc_id)
+                    tfs.append(term_postings[doc_id])
+                max_tfs[term] = max(term_postings.values())
+            offsets.append(len(doc_ids))
+
+        lengths, present = self.doc_lengths.dense(self.next_doc_id)
+        norm_sums, _ = self._norm_sums.dense(self.next_doc_id)
+
+        return {
+            'offsets': offsets,
+            'doc_ids': doc_ids,
+            'tfs': tfs,
+            'max_tfs': max_tfs,
+            'lengths': lengths,
+            'norm_sums': norm_sums,
+            'present': present
+        }
+
+    @classmethod
+    def from_arrays(cls, offsets, doc_ids, tfs, max_tfs, lengths, norm_sums, present, next_doc_id):
+        """Rebuild an index from the arrays produced by to_arrays"""
+        index = cls()
+        for term in range(len(offsets) - 1):
+            start, stop = offsets[term], offsets[term + 1]
+            if start == stop:
+                continue
+            index.postings[term] = dict(zip(doc_ids[start:stop], tfs[start:stop]))
+            # The arrays were written with every norm sum refreshed
+            index._folded_a[term] = math.log(1 + stop - start)
+
+        index.doc_lengths = DocumentColumns(copy_array('I', lengths), bytearray(present))
+        index.total_length = sum(index.doc_lengths.values)
+        index._norm_sums = DocumentColumns(copy_array('d', norm_sums), bytearray(present), 3,
+                                           index.doc_lengths.count)
+        index.max_tfs = copy_array('I', max_tfs)
+        index.next_doc_id = next_doc_id
+        index.version = 1
+        return index
+
+    def query_vector(self, query_tf):
+        """TF-IDF weights of a query and its norm, for the current corpus
+
+        query_tf maps term ids, as returned by Vocabulary.lookup, to their
+        count in the query. IDF comes from the resumes only:
+        idf_t = log(N) - log(1 + df_t). Terms no resume holds only add to
+        the norm. Returns ({term: weight}, norm).
+        """
+        if not self.num_docs:
+            return {}, 0.0
+
+        log_n = math.log(self.num_docs)
+        weights = {}
+        query_norm_sq = 0.0
+        for term, query_count in query_tf.items():
+            idf = log_n - math.log(1 + self.document_frequency(term))
+            weight = query_count * idf
+            query_norm_sq += weight * weight
+            if term in self.postings:
+                weights[term] = weight
+        return weights, math.sqrt(query_norm_sq)
+
+    def cosine_scores(self, query_vector, doc_ids=None):
+        """Cosine similarity between a query_vector and every matching document
+
+        Only the postings of the query terms are touched and only documents
+        sharing at least one term with the query are returned. Given doc_ids,
+        only those documents are looked up in the postings, e.g. a shortlist.
+        """
+        self._refresh_norm_sums()
+
+        weights, query_norm = query_vector
+        if query_norm <= 0:
+            return {}
+
+        log_n = math.log(self.num_docs)
+        dots = {}
+        for term, weight in weights.items():
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+            # The document side of the product carries the same idf
+            weight *= log_n - math.log(1 + self.document_frequency(term))
+            if doc_ids is None:
+                for doc_id, tf in term_postings.items():
+                    dots[doc_id] = dots.get(doc_id, 0.0) + weight * tf
+            else:
+                for doc_id in doc_ids:
+                    tf = term_postings.get(doc_id)
+                    if tf:
+                        dots[doc_id] = dots.get(doc_id, 0.0) + weight * tf
+
+        scores = {}
+        norm_values = self._norm_sums.values
+        for doc_id, dot in dots.items():
+            start = 3 * doc_id
+            s0, s1, s2 = norm_values[start], norm_values[start + 1], norm_values[start + 2]
+            doc_norm_sq = s0 * log_n * log_n - 2 * s1 * log_n + s2
+            if doc_norm_sq <= 0 or dot == 0:
+                continue
+            scores[doc_id] = dot / (query_norm * math.sqrt(doc_norm_sq))
+
+        return scores
+
+
+def copy_array(typecode, values):
+    """Array of typecode holding a copy of values, a memcpy for arrays and views"""
+    copy = array(typecode)
+    copy.frombytes(memoryview(values).cast('B'))
+    return copy
@@ -0,0 +1,630 @@
+"""
+Resume Ranker for AI-Powered Resume Ranker
+BasicResumeRanker and its configuration, without the web app: importing this
+module creates no folder, process or workspace, so scripts such as
+batch_rank.py and the benchmarks can rank without app_basic's start-up.
+"""
+
+import os
+from resume_index import ResumeIndex
+from corpus_store import ResumeCorpus
+from near_duplicates import DuplicateIndex, Duplicate, shingle_hashes, signature, band_keys, jaccard
+from tokenizer import Vocabulary
+from job_query import JobQuery, job_key, job_keywords
+from index_store import IndexStore, file_sha256
+from text_extraction import extract_text_from_pdf, extract_text_from_docx, preprocess_text, extract_resume
+from ranker_snapshot import RankerSnapshot
+from semantic_index import SemanticRetriever, HAS_SEMANTIC_INDEX
+from metrics import metrics, span
+
+# Configuration
+ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
+
+# Worker processes extracting bulk uploads, and seconds allowed per file
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', os.cpu_count() or 1))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 60))
+
+# Per-document extraction limits: PDF pages and bytes of extracted text
+# (0 disables a limit); longer documents are indexed truncated
+EXTRACTION_MAX_PAGES = int(os.environ.get('EXTRACTION_MAX_PAGES', 100))
+EXTRACTION_MAX_BYTES = int(os.environ.get('EXTRACTION_MAX_BYTES', 2 * 1024 * 1024))
+
+# Files indexed per step of an asynchronous upload job
+INGESTION_BATCH_SIZE = int(os.environ.get('INGESTION_BATCH_SIZE', 64))
+
+# Corpus size from which the NumPy/SciPy CSR backend is used for scoring
+VECTOR_BACKEND_MIN_RESUMES = int(os.environ.get('VECTOR_BACKEND_MIN_RESUMES', 2000))
+
+# 'tfidf' scores the TF-IDF cosine plus the keyword score, 'bm25' scores
+# BM25 with the keyword weights added to their terms, and finds a page of
+# the top k with MaxScore pruning
+SCORING = os.environ.get('SCORING', 'tfidf').lower()
+SCORING_MODES = ('tfidf', 'bm25')
+
+# Optional semantic stage: resumes are embedded by LSA (a truncated SVD of
+# the TF-IDF matrix) into SEMANTIC_DIMENSIONS dimensions, stored as 'int8' or
+# 'float32', and a /rank page re-scores only the SEMANTIC_SHORTLIST resumes
+# nearest to the job, found by probing SEMANTIC_PROBES lists of an IVF
+# index. Needs NumPy and SciPy.
+SEMANTIC_SEARCH = os.environ.get('SEMANTIC_SEARCH', '').lower() in ('1', 'true', 'yes', 'on')
+SEMANTIC_DIMENSIONS = int(os.environ.get('SEMANTIC_DIMENSIONS', 128))
+SEMANTIC_QUANTIZATION = os.environ.get('SEMANTIC_QUANTIZATION', 'int8').lower()
+SEMANTIC_SHORTLIST = int(os.environ.get('SEMANTIC_SHORTLIST', 1000))
+SEMANTIC_PROBES = int(os.environ.get('SEMANTIC_PROBES', 32))
+
+# Near-duplicate resumes are detected at ingest by MinHash/LSH: 'flag' indexes
+# and reports them, 'collapse' keeps them out of the index until the resume
+# they duplicate is removed, 'off' skips the check. Resumes whose shingle
+# Jaccard similarity reaches DUPLICATE_THRESHOLD are near-duplicates.
+DUPLICATE_MODE = os.environ.get('DUPLICATE_MODE', 'flag').lower()
+DUPLICATE_THRESHOLD = float(os.environ.get('DUPLICATE_THRESHOLD', 0.8))
+DUPLICATE_MODES = ('off', 'flag', 'collapse')
+
+class BasicResumeRanker:
+    """Resume corpus and job description, changed by one writer at a time
+    
+    Changes publish a new RankerSnapshot; readers rank against
+    self.snapshot without locking while the next version is built.
+    add_resume only marks the snapshot stale, so that loops of single
+    inserts publish once, on the next read through the ranker itself.
+    """
+    SIMILARITY_WEIGHT = RankerSnapshot.SIMILARITY_WEIGHT
+    KEYWORD_WEIGHT = RankerSnapshot.KEYWORD_WEIGHT
+    
+    def __init__(self, vector_backend_min_resumes=None, extraction_cache=None, extraction_pool=None,
+                 max_pages=None, max_bytes=None, job_cache=None, duplicate_mode=None,
+                 duplicate_threshold=None, scoring=None, semantic=None):
+        self.job_keywords = {}
+        self.job_cache = job_cache
+        self.job_query = JobQuery(job_key(""), "", {})
+        # Resumes as token arrays of ids interned in one shared vocabulary,
+        # kept in the columns of a ResumeCorpus
+        self.vocabulary = Vocabulary()
+        self.corpus = ResumeCorpus()
+        self.job_description = ""
+        self.index = ResumeIndex()
+        self.store = None
+        self.read_only = False
+        self.extraction_cache = extraction_cache
+        self.extraction_pool = extraction_pool
+        self.max_pages = EXTRACTION_MAX_PAGES if max_pages is None else max_pages
+        self.max_bytes = EXTRACTION_MAX_BYTES if max_bytes is None else max_bytes
+        
+        if vector_backend_min_resumes is None:
+            vector_backend_min_resumes = VECTOR_BACKEND_MIN_RESUMES
+        self.vector_backend_min_resumes = vector_backend_min_resumes
+        self.scoring = SCORING if scoring is None else scoring
+        if self.scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {', '.join(SCORING_MODES)}")
+        
+        self.semantic_retriever = None
+        if SEMANTIC_SEARCH if semantic is None else semantic:
+            if HAS_SEMANTIC_INDEX:
+                self.semantic_retriever = SemanticRetriever(SEMANTIC_DIMENSIONS, SEMANTIC_QUANTIZATION,
+                                                            SEMANTIC_SHORTLIST, SEMANTIC_PROBES)
+            else:
+                print("NumPy and SciPy are not installed, semantic search is disabled")
+        
+        self.duplicate_mode = DUPLICATE_MODE if duplicate_mode is None else duplicate_mode
+        if self.duplicate_mode not in DUPLICATE_MODES:
+            raise ValueError(f"duplicate_mode must be one of {', '.join(DUPLICATE_MODES)}")
+        self.duplicate_threshold = DUPLICATE_THRESHOLD if duplicate_threshold is None else duplicate_threshold
+        # Near-duplicates by filename, and the LSH buckets of every other
+        # resume, loaded on the first change that needs them
+        self.duplicates = {}
+        self.duplicate_index = None
+        self.snapshot = None
+        self._publish()
+        
+    @property
+    def resume_tokens(self):
+        return self.corpus.token_rows
+    
+    @property
+    def resume_names(self):
+        return self.corpus.names
+    
+    @property
+    def doc_ids(self):
+        return self.corpus.doc_ids
+    
+    def extract_text_from_pdf(self, pdf_path):
+        """Extract text from PDF file"""
+        return extract_text_from_pdf(pdf_path)
+    
+    def extract_text_from_docx(self, docx_path):
+        """Extract text from DOCX file"""
+        return extract_text_from_docx(docx_path)
+    
+    def preprocess_text(self, text):
+        """Basic text preprocessing"""
+        return preprocess_text(text)
+    
+    def build_job_keywords(self, job_description, keywords=None):
+        """Normalise the given keywords or extract them from the job description"""
+        return job_keywords(job_description, keywords)
+    
+    def compile_job(self, job_description, keywords=None):
+        """Preprocessed query and keyword matcher of a job, compiled once per description and keywords"""
+        key = job_key(job_description, keywords)
+        job_query = self.job_cache.get(key) if self.job_cache is not None else None
+        if job_query is None:
+            job_query = JobQuery(key, job_description, self.build_job_keywords(job_description, keywords))
+            if self.job_cache is not None:
+                self.job_cache.put(job_query)
+        return job_query
+    
+    def set_job_description(self, job_description, keywords=None):
+        """Set job description and keywords for ranking"""
+        self.job_query = self.compile_job(job_description, keywords)
+        self.job_description = job_description
+        self.job_keywords = self.job_query.keywords
+        if self._stale:
+            self._publish()
+        else:
+            self.snapshot = self.snapshot.with_job_query(self.job_query)
+    
+    def _publish(self):
+        """Make the current corpus visible to readers as a new snapshot"""
+        self._stale = False
+        with span('publish'):
+            self.snapshot = RankerSnapshot(
+                self.vocabulary, self.index.snapshot(), self.corpus, self.job_query,
+                self.vector_backend_min_resumes, self.duplicates, self.scoring, self.semantic_retriever,
+                self.snapshot
+            )
+    
+    def _cached_extraction(self, file_path, sha256):
+        """(processed_text, truncation) from the extraction cache, or None on a miss"""
+        if self.extraction_cache is None:
+            return None
+        cached = self.extraction_cache.get(sha256, os.path.splitext(file_path)[1])
+        return (cached['processed_text'], cached.get('truncation')) if cached is not None else None
+    
+    def _cache_extraction(self, file_path, sha256, processed_text, truncation):
+        if self.extraction_cache is not None:
+            self.extraction_cache.put(sha256, os.path.splitext(file_path)[1], processed_text, truncation)
+    
+    def add_resume(self, file_path, filename):
+        """Add a resume to the ranking system"""
+        with span('hash'):
+            sha256 = file_sha256(file_path)
+        cached = self._cached_extraction(file_path, sha256)
+        
+        if cached is None:
+            try:
+                with span('extract'):
+                    cached = extract_resume(file_path, self.max_pages, self.max_bytes)
+            except Exception as e:
+                count_extractions([e])
+                raise
+            count_extractions([cached])
+            self._cache_extraction(file_path, sha256, *cached)
+        
+        with span('index'):
+            duplicate = self._insert_resume(file_path, filename, sha256, cached[0])
+        if duplicate is None or not duplicate.collapsed:
+            metrics.inc('documents_indexed_total')
+        self._stale = True
+    
+    def add_resumes(self, files):
+        """Add several (file_path, filename) resumes, extracting them in parallel
+        
+        Cache misses go through the extraction pool; results are inserted in
+        the given order once they are all back, so document ids do not depend
+        on which worker finished first. Returns {filename: error} for the
+        files that failed or timed out.
+        """
+        extracted, failures = self.extract_resumes(files)
+        self.insert_resumes(extracted)
+        return failures
+    
+    def extract_resumes(self, files):
+        """Extract (file_path, filename) resumes without touching the index
+        
+        Returns the (file_path, filename, sha256, processed_text, truncation)
+        entries that succeeded, in the given order, and {filename: error} for
+        the rest. truncation is None unless the extraction limits cut the
+        document short.
+        """
+        prepared = []
+        with span('hash'):
+            for file_path, filename in files:
+                sha256 = file_sha256(file_path)
+                cached = self._cached_extraction(file_path, sha256) or (None, None)
+                prepared.append([file_path, filename, sha256, *cached])
+        
+        misses = [entry for entry in prepared if entry[3] is None]
+        with span('extract'):
+            if self.extraction_pool is not None:
+                results = self.extraction_pool.extract_many(
+                    [entry[0] for entry in misses], self.max_pages, self.max_bytes
+                )
+            else:
+                results = []
+                for entry in misses:
+                    try:
+                        results.append(extract_resume(entry[0], self.max_pages, self.max_bytes))
+                    except Exception as e:
+                        results.append(e)
+        count_extractions(results)
+        
+        failures = {}
+        for entry, result in zip(misses, results):
+            if isinstance(result, Exception):
+                failures[entry[1]] = str(result) or type(result).__name__
+                continue
+            entry[3], entry[4] = result
+            self._cache_extraction(entry[0], entry[2], entry[3], entry[4])
+        
+        extracted = [tuple(entry) for entry in prepared if entry[3] is not None]
+        return extracted, failures
+    
+    def insert_resumes(self, extracted):
+        """Index the entries returned by extract_resumes
+        
+        Returns the near-duplicates among them, as dicts for a response.
+        """
+        duplicates = []
+        with span('index'):
+            for file_path, filename, sha256, processed_text, _ in extracted:
+                duplicate = self._insert_resume(file_path, filename, sha256, processed_text)
+                if duplicate is not None:
+                    duplicates.append(duplicate.to_dict())
+        metrics.inc('documents_indexed_total',
+                    len(extracted) - sum(duplicate['collapsed'] for duplicate in duplicates))
+        self._publish()
+        return duplicates
+    
+    def _insert_resume(self, file_path, filename, sha256, processed_text):
+        """Index an extracted resume, replacing any resume with the same filename
+        
+        Returns its Duplicate if it is a near-duplicate of another resume.
+        """
+        if self.corpus.row_of(filename) >= 0 or filename in self.duplicates:
+            # A re-upload overwrites the file, so it replaces the old entry
+            self._remove_resume(filename)
+        
+        tokens = self.vocabulary.encode(processed_text.split())
+        stats = None
+        if self.store is not None:
+            stat = os.stat(file_path)
+            stats = (stat.st_size, stat.st_mtime, sha256)
+        return self._index_tokens(filename, tokens, stats)
+    
+    def _index_tokens(self, filename, tokens, stats):
+        """Index the tokens of a resume unless they collapse into a near-duplicate
+        
+        stats are the (size, mtime, sha256) of its file, stored with it.
+        Returns the Duplicate found, if any.
+        """
+        duplicate = keys = None
+        if self.duplicate_mode != 'off':
+            with span('dedupe'):
+                shingles = shingle_hashes(tokens)
+                keys = self._band_keys(shingles)
+                duplicate = self._find_duplicate(filename, shingles, keys)
+        
+        if duplicate is not None and self.duplicate_mode == 'collapse':
+            duplicate.tokens, duplicate.stats = tokens, stats
+            self._record_duplicate(duplicate)
+            return duplicate
+        
+        doc_id = self.index.add_document(tokens)
+        self.corpus.append(doc_id, filename, tokens)
+        if self.store is not None:
+            self.store.put_document(doc_id, filename, *stats, tokens)
+        
+        if duplicate is not None:
+            self._record_duplicate(duplicate)
+        elif keys is not None:
+            # Only resumes that duplicate nothing go into the buckets
+            self.duplicate_index.add(doc_id, keys)
+        return duplicate
+    
+    def _band_keys(self, shingles):
+        minhash = signature(shingles)
+        return band_keys(minhash) if minhash is not None else None
+    
+    def _find_duplicate(self, filename, shingles, keys):
+        """Duplicate of the most similar resume sharing an LSH band, if similar enough"""
+        if keys is None:
+            return None
+        best_row, best_similarity = -1, 0.0
+        for doc_id in self._load_duplicate_index().candidates(keys):
+            row = self.corpus.row_of_doc(doc_id)
+            similarity = jaccard(shingles, shingle_hashes(self.corpus.tokens_of(row)))
+            if similarity >= self.duplicate_threshold and similarity > best_similarity:
+                best_row, best_similarity = row, similarity
+        if best_row < 0:
+            return None
+        return Duplicate(filename, self.corpus.name(best_row), best_similarity)
+    
+    def _record_duplicate(self, duplicate):
+        self.duplicates[duplicate.filename] = duplicate
+        if self.store is not None:
+            self.store.put_duplicate(duplicate)
+        metrics.inc('duplicates_total', action='collapse' if duplicate.collapsed else 'flag')
+    
+    def _load_duplicate_index(self):
+        """LSH buckets of the resumes, as saved with the index or built from the corpus"""
+        if self.duplicate_index is None:
+            duplicate_index = self.store.load_duplicate_index() if self.store is not None else None
+            if duplicate_index is None:
+                duplicate_index = DuplicateIndex()
+                for row, doc_id in enumerate(self.corpus.doc_ids):
+                    if self.corpus.name(row) in self.duplicates:
+                        continue
+                    keys = self._band_keys(shingle_hashes(self.corpus.tokens_of(row)))
+                    if keys is not None:
+                        duplicate_index.add(doc_id, keys)
+            self.duplicate_index = duplicate_index
+        return self.duplicate_index
+    
+    def remove_resume(self, filename):
+        """Remove a resume from the ranking system"""
+        if not self._remove_resume(filename):
+            return False
+        self._publish()
+        return True
+    
+    def _remove_resume(self, filename):
+        """Remove a resume without publishing a snapshot"""
+        duplicate = self.duplicates.get(filename)
+        if duplicate is not None and duplicate.collapsed:
+            # Never indexed, only its record goes
+            self._forget_duplicate(filename)
+            return True
+        
+        row = self.corpus.row_of(filename)
+        if row < 0:
+            return False
+        
+        if duplicate is None and self.duplicate_mode != 'off':
+            # Loaded while it still matches the saved corpus
+            self._load_duplicate_index()
+        doc_id, _, tokens = self.corpus.remove(row)
+        
+        # Decrement the index statistics instead of rebuilding them
+        self.index.remove_document(doc_id, tokens)
+        
+        if self.store is not None:
+            self.store.delete_document(filename)
+        metrics.inc('documents_removed_total')
+        
+        if duplicate is not None:
+            self._forget_duplicate(filename)
+        else:
+            if self.duplicate_mode != 'off':
+                keys = self._band_keys(shingle_hashes(tokens))
+                if keys is not None:
+                    self.duplicate_index.remove(doc_id, keys)
+            self._promote_duplicates(filename)
+        return True
+    
+    def _forget_duplicate(self, filename):
+        del self.duplicates[filename]
+        if self.store is not None:
+            self.store.delete_duplicate(filename)
+    
+    def _promote_duplicates(self, filename):
+        """Check the near-duplicates of a removed resume again
+        
+        The first of them no longer duplicates anything and takes its place,
+        the others become its duplicates if they are similar enough.
+        """
+        for duplicate in [duplicate for duplicate in self.duplicates.values()
+                          if duplicate.duplicate_of == filename]:
+            self._forget_duplicate(duplicate.filename)
+            if duplicate.collapsed:
+                self._index_tokens(duplicate.filename, duplicate.tokens, duplicate.stats)
+                continue
+            
+            if self.duplicate_mode == 'off':
+                continue
+            row = self.corpus.row_of(duplicate.filename)
+            shingles = shingle_hashes(self.corpus.tokens_of(row))
+            keys = self._band_keys(shingles)
+            match = self._find_duplicate(duplicate.filename, shingles, keys)
+            if match is not None:
+                self._record_duplicate(match)
+            elif keys is not None:
+                self.duplicate_index.add(self.corpus.doc_ids[row], keys)
+    
+    def open_index(self, folder, read_only=False):
+        """Attach a persistent index folder and warm start from it
+        
+        With read_only the last saved index is memory-mapped instead of
+        loaded into dicts, so processes serving the same folder share it;
+        such a ranker can rank but not change the corpus. self.read_only
+        tells whether the mapping worked, otherwise the index is loaded as
+        usual without saving anything.
+        """
+        self.store = IndexStore(folder)
+        self.read_only = False
+        if read_only:
+            mapped = self.store.map_index()
+            if mapped is not None:
+                terms, self.index, self.corpus = mapped
+                self.vocabulary = Vocabulary(terms)
+                self.duplicates = self.store.load_duplicates()
+                self.read_only = True
+                self._load_semantic_index()
+                self._publish()
+                return
+        
+        vocabulary = Vocabulary(self.store.load_vocabulary())
+        documents = self.store.load_documents()
+        corpus = ResumeCorpus.from_documents(documents)
+        
+        index = self.store.load_index(corpus.doc_ids)
+        if index is None:
+            # Missing or stale snapshot, rebuild it from the stored tokens
+            index = ResumeIndex()
+            for doc_id, _, tokens in documents:
+                index.add_document(tokens, doc_id)
+            if not read_only:
+                self.store.save_index(index, vocabulary, corpus)
+        del documents
+        
+        self.vocabulary = vocabulary
+        self.index = index
+        self.corpus = corpus
+        self.duplicates = self.store.load_duplicates()
+        self.duplicate_index = None
+        self._load_semantic_index()
+        self._publish()
+    
+    def _load_semantic_index(self):
+        """Start the semantic stage from the embeddings saved with the index, if any"""
+        if self.semantic_retriever is not None:
+            semantic = self.store.load_semantic_index()
+            retriever = self.semantic_retriever
+            if (semantic is not None and semantic.quantization == retriever.quantization
+                    and semantic.dimensions == retriever.dimensions):
+                retriever.resume(semantic, self.index, self.corpus.doc_ids)
+    
+    def save_index(self):
+        """Write the index snapshot to the attached store, if any"""
+        if self.store is not None:
+            with span('save'):
+                duplicate_index = self._load_duplicate_index() if self.duplicate_mode != 'off' else None
+                semantic_index = None
+                if self.semantic_retriever is not None and len(self.corpus):
+                    # Saved embeddings spare every process mapping the index from fitting its own
+                    semantic_index = self.semantic_retriever.index_for(self.current_snapshot())
+                self.store.save_index(self.index, self.vocabulary, self.corpus, duplicate_index, semantic_index)
+    
+    def folder_changed(self, folder):
+        """Whether sync_folder(folder) may have anything to do, judging by file sizes and mtimes"""
+        if self.store is not None:
+            known = self.store.document_stats()
+        else:
+            known = dict.fromkeys([*self.resume_names, *self.duplicates])
+        
+        for entry in os.scandir(folder):
+            if not entry.is_file() or not allowed_file(entry.name):
+                continue
+            if entry.name not in known:
+                return True
+            stats = known.pop(entry.name)
+            if stats is not None:
+                stat = entry.stat()
+                if stats[:2] != (stat.st_size, stat.st_mtime):
+                    return True
+        return bool(known)
+    
+    def sync_folder(self, folder):
+        """Reconcile the corpus with the resume files in a folder
+        
+        Files with the same size and mtime, or the same SHA-256, as their
+        stored copy are kept; new or modified files are extracted again and
+        files that disappeared are removed. Returns whether anything changed.
+        """
+        if self.store is not None:
+            known = self.store.document_stats()
+        else:
+            known = dict.fromkeys([*self.resume_names, *self.duplicates])
+        
+        changed = touched = False
+        to_extract = []
+        for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+            if not entry.is_file() or not allowed_file(entry.name):
+                continue
+            
+            if entry.name in known:
+                stats = known.pop(entry.name)
+                if stats is None:
+                    continue
+                
+                size, mtime, sha256 = stats
+                stat = entry.stat()
+                if size == stat.st_size and mtime == stat.st_mtime:
+                    continue
+                if file_sha256(entry.path) == sha256:
+                    self.store.touch_document(entry.name, stat.st_size, stat.st_mtime)
+                    touched = True
+                    continue
+            
+            to_extract.append((entry.path, entry.name))
+        
+        if to_extract:
+            failures = self.add_resumes(to_extract)
+            for filename, error in failures.items():
+                print(f"Error indexing {filename}: {error}")
+            changed = True
+        
+        for filename in known:
+            self._remove_resume(filename)
+            changed = True
+        if known:
+            self._publish()
+        
+        # New stats of touched files are only committed with a save as well;
+        # an unchanged folder saves nothing, the whole index is rewritten
+        if changed or touched:
+            self.save_index()
+        return changed
+    
+    # Reads go through the last published snapshot, see ranker_snapshot.py
+    
+    def current_snapshot(self):
+        """Snapshot including every change so far, publishing it if needed
+        
+        Only for the thread that changes the ranker; concurrent readers use
+        self.snapshot.
+        """
+        if self._stale:
+            self._publish()
+        return self.snapshot
+    
+    def use_vector_backend(self):
+        return self.current_snapshot().use_vector_backend()
+    
+    def calculate_scores(self):
+        """Calculate similarity scores for all resumes"""
+        return self.current_snapshot().calculate_scores()
+    
+    def calculate_job_scores(self, job_query):
+        return self.current_snapshot().calculate_job_scores(job_query)
+    
+    def calculate_score_matrix(self, jobs):
+        return self.current_snapshot().calculate_score_matrix(jobs)
+    
+    def rows_of_docs(self):
+        return self.current_snapshot().rows_of_docs()
+    
+    def phrase_rows(self, phrases):
+        return self.current_snapshot().phrase_rows(phrases)
+    
+    def build_results(self, scores, top_k=None, offset=0, min_score=None):
+        return self.current_snapshot().build_results(scores, top_k, offset, min_score)
+    
+    def rank_resumes(self, top_k=None, offset=0, min_score=None):
+        """Rank resumes and return results"""
+        return self.current_snapshot().rank_resumes(top_k, offset, min_score)
+    
+    def rank_page(self, top_k=None, offset=0, min_score=None, exhaustive=False, recall=False):
+        """Rank resumes and return one page of results with stats over all matches"""
+        return self.current_snapshot().rank_page(top_k, offset, min_score, exhaustive, recall)
+    
+    def rank_many(self, jobs, top_k=10, best_job_per_candidate=False):
+        """Rank the resumes against several jobs sharing one corpus index
+        
+        Each job is a dict with a 'job_description' and optional 'keywords'
+        and 'title'.
+        """
+        titles = [job.get('title') or f'Job {i + 1}' for i, job in enumerate(jobs)]
+        compiled_jobs = [self.compile_job(job['job_description'], job.get('keywords')) for job in jobs]
+        return self.current_snapshot().rank_many(titles, compiled_jobs, top_k, best_job_per_candidate)
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def count_extractions(results):
+    """Count fresh extraction results, exceptions and documents read only in part are errors"""
+    errors = sum(isinstance(result, Exception) or (result[1] is not None and 'error' in result[1])
+                 for result in results)
+    metrics.inc('extractions_total', len(results))
+    if errors:
+        metrics.inc('extraction_errors_total', errors)
@@ -0,0 +1,302 @@
+"""
+Semantic Retrieval for AI-Powered Resume Ranker
+Latent semantic analysis (LSA) of the corpus: a truncated SVD of the TF-IDF
+resume-term matrix, fitted locally with a randomized range finder, projects
+resumes and job descriptions into a few dozen dimensions in which terms that
+occur together share directions. Resume embeddings are kept as int8 (or
+float32) rows in an inverted-file (IVF) index of k-means lists, so a job
+only compares itself with the resumes of the few lists nearest to it. The
+shortlist it returns is re-scored by the ranker.
+Needs NumPy and SciPy; HAS_SEMANTIC_INDEX tells whether they are usable.
+"""
+
+import math
+import threading
+
+from metrics import span
+from vector_backend import HAS_VECTOR_BACKEND, np
+
+HAS_SEMANTIC_INDEX = HAS_VECTOR_BACKEND
+
+QUANTIZATIONS = ('int8', 'float32')
+
+# Extra random directions and power iterations of the randomized SVD
+OVERSAMPLES = 10
+POWER_ITERATIONS = 2
+
+# The projection is fitted on at most this many resumes, and terms held by
+# fewer than MIN_DF of them get no direction of their own
+FIT_RESUMES = 50000
+MIN_DF = 2
+
+# Lloyd iterations of the spherical k-means behind the IVF lists, fitted on
+# up to KMEANS_SAMPLE resumes per list
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 32
+MAX_LISTS = 4096
+
+# New resumes are projected with the fitted model until the corpus has grown
+# or shrunk by this factor since the fit, then the model is fitted again
+REFIT_FACTOR = 2
+
+# Resumes embedded per step, to bound the dense intermediate matrices
+EMBED_CHUNK = 65536
+
+SEED = 20240601
+
+
+def fit_projection(matrix, dimensions, rng):
+    """Term vectors (columns x dimensions) of a truncated SVD of a sparse matrix
+
+    Halko et al.'s randomized range finder: the rows are sketched onto a few
+    random directions, refined by power iterations, and the SVD is taken of
+    the small matrix spanned by the sketch.
+    """
+    width = min(dimensions + OVERSAMPLES, *matrix.shape)
+    sketch = matrix @ rng.standard_normal((matrix.shape[1], width))
+    for _ in range(POWER_ITERATIONS):
+        sketch, _ = np.linalg.qr(sketch)
+        sketch, _ = np.linalg.qr(matrix.T @ sketch)
+        sketch = matrix @ sketch
+    basis, _ = np.linalg.qr(sketch)
+    small = np.asarray((matrix.T @ basis).T)
+    _, _, right = np.linalg.svd(small, full_matrices=False)
+    return right[:min(dimensions, width)].T
+
+
+def normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def quantize(vectors, quantization):
+    """(codes, scales) of unit rows: int8 codes scaled by max |value| / 127, or the rows as they are"""
+    if quantization == 'float32':
+        return vectors.astype(np.float32), np.ones(len(vectors), dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127
+    safe_scales = np.where(scales > 0, scales, 1)
+    codes = np.rint(vectors / safe_scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def spherical_kmeans(vectors, lists, rng):
+    """Unit centroids of lists clusters of unit rows, by cosine similarity"""
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=lists)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        # Empty lists keep their centroid
+        centroids[filled] = normalize_rows(np.add.reduceat(vectors[order], starts, axis=0))
+    return centroids
+
+
+class SemanticIndex:
+    """LSA embeddings of one version of the corpus in an IVF index
+
+    term_vectors project a TF-IDF vector over the vocabulary (as it was at
+    fit time) onto the LSA dimensions. Resume i is doc_ids[i], embedded as
+    codes[i] * scales[i] and filed under the list of its nearest centroid,
+    assignments[i]. Rows are ordered by doc id. Instances are never changed:
+    updated() returns a new index sharing the fitted model, so snapshots
+    of older versions keep searching theirs. The arrays may be read-only
+    views of a mapped file.
+    """
+
+    def __init__(self, term_vectors, centroids, fitted, doc_ids, codes, scales, assignments, version):
+        self.term_vectors = term_vectors
+        self.centroids = centroids
+        # Number of resumes the model was fitted on
+        self.fitted = fitted
+        self.doc_ids = doc_ids
+        self.codes = codes
+        self.scales = scales
+        self.assignments = assignments
+        self.version = version
+
+        self.list_rows = np.argsort(assignments, kind='stable')
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=len(centroids)))])
+
+    @property
+    def dimensions(self):
+        return self.term_vectors.shape[1]
+
+    @property
+    def quantization(self):
+        return 'int8' if self.codes.dtype == np.int8 else 'float32'
+
+    @classmethod
+    def build(cls, tfidf_matrix, doc_ids, dimensions, quantization, version):
+        """Fit the projection and the lists on the L2-normalised TF-IDF rows of doc_ids
+
+        Returns None when the corpus is too small to fit anything.
+        """
+        rng = np.random.default_rng(SEED)
+        num_docs, num_terms = tfidf_matrix.shape
+        sample = np.arange(num_docs)
+        if num_docs > FIT_RESUMES:
+            sample = np.sort(rng.choice(num_docs, FIT_RESUMES, replace=False))
+        fit_matrix = tfidf_matrix[sample]
+        terms = np.flatnonzero(np.bincount(fit_matrix.indices, minlength=num_terms) >= MIN_DF)
+        if min(len(sample), len(terms)) < 2:
+            return None
+
+        term_vectors = np.zeros((num_terms, min(dimensions, len(sample), len(terms))), dtype=np.float32)
+        term_vectors[terms] = fit_projection(fit_matrix[:, terms], dimensions, rng)
+
+        lists = max(1, min(int(math.sqrt(num_docs)), MAX_LISTS))
+        kmeans_sample = sample
+        if len(sample) > KMEANS_SAMPLE * lists:
+            kmeans_sample = np.sort(rng.choice(sample, KMEANS_SAMPLE * lists, replace=False))
+        centroids = spherical_kmeans(cls._embed(tfidf_matrix[kmeans_sample], term_vectors), lists, rng)
+
+        semantic = cls(term_vectors, centroids, num_docs, np.empty(0, dtype=np.uint32),
+                       np.empty((0, term_vectors.shape[1]), dtype=np.int8 if quantization == 'int8' else np.float32),
+                       np.empty(0, dtype=np.float32), np.empty(0, dtype=np.uint32), version)
+        return semantic._with_rows(np.asarray(doc_ids, dtype=np.uint32), tfidf_matrix, np.ones(0, dtype=bool),
+                                   version)
+
+    @staticmethod
+    def _embed(tfidf_rows, term_vectors):
+        """Unit LSA embeddings of TF-IDF rows, ignoring terms interned after the fit"""
+        return normalize_rows(np.asarray(tfidf_rows[:, :len(term_vectors)] @ term_vectors, dtype=np.float32))
+
+    def _with_rows(self, new_doc_ids, tfidf_rows, keep, version):
+        """Index of the kept rows plus the embeddings of new_doc_ids, whose TF-IDF rows are given"""
+        codes, scales, assignments = [self.codes[keep]], [self.scales[keep]], [self.assignments[keep]]
+        for start in range(0, len(new_doc_ids), EMBED_CHUNK):
+            vectors = self._embed(tfidf_rows[start:start + EMBED_CHUNK], self.term_vectors)
+            assignments.append(np.argmax(vectors @ self.centroids.T, axis=1).astype(np.uint32))
+            chunk_codes, chunk_scales = quantize(vectors, self.quantization)
+            codes.append(chunk_codes)
+            scales.append(chunk_scales)
+
+        doc_ids = np.concatenate([self.doc_ids[keep], new_doc_ids])
+        # Doc ids are handed out in order, so new ones nearly always come last
+        order = np.argsort(doc_ids, kind='stable')
+        return SemanticIndex(self.term_vectors, self.centroids, self.fitted, doc_ids[order],
+                             np.concatenate(codes)[order], np.concatenate(scales)[order],
+                             np.concatenate(assignments)[order], version)
+
+    def needs_refit(self, num_docs):
+        return not self.fitted / REFIT_FACTOR <= num_docs <= self.fitted * REFIT_FACTOR
+
+    def covers(self, doc_ids):
+        return len(self.doc_ids) == len(doc_ids) and np.array_equal(self.doc_ids, doc_ids)
+
+    def relabelled(self, version):
+        semantic = SemanticIndex.__new__(SemanticIndex)
+        semantic.__dict__.update(self.__dict__)
+        semantic.version = version
+        return semantic
+
+    def updated(self, tfidf_matrix, doc_ids, version):
+        """Index of another version of the corpus, embedding only its new resumes
+
+        tfidf_matrix holds the TF-IDF rows of doc_ids, which are sorted.
+        """
+        keep = np.isin(self.doc_ids, doc_ids, assume_unique=True)
+        new_rows = np.flatnonzero(~np.isin(doc_ids, self.doc_ids, assume_unique=True))
+        return self._with_rows(doc_ids[new_rows], tfidf_matrix[new_rows], keep, version)
+
+    def embed_query(self, query_vector):
+        """Unit embedding of a query vector ({term id: weight}, norm), None if no term is known"""
+        weights, _ = query_vector
+        terms = [term for term in weights if term < len(self.term_vectors)]
+        if not terms:
+            return None
+        vector = np.asarray([weights[term] for term in terms], dtype=np.float32) @ self.term_vectors[terms]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    def search(self, query_embedding, shortlist, probes):
+        """(doc ids, lists probed) of the shortlist resumes nearest to the query embedding
+
+        The probes lists whose centroids are nearest are searched, and more
+        of them while they hold fewer than shortlist resumes.
+        """
+        order = np.argsort(-(self.centroids @ query_embedding))
+        sizes = np.cumsum(np.diff(self.list_offsets)[order])
+        count = max(probes, int(np.searchsorted(sizes, shortlist)) + 1)
+        rows = np.concatenate([self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]]
+                               for i in order[:count]])
+        similarities = (self.codes[rows].astype(np.float32) @ query_embedding) * self.scales[rows]
+        if len(rows) > shortlist:
+            rows = rows[np.argpartition(-similarities, shortlist - 1)[:shortlist]]
+        return self.doc_ids[rows], min(count, len(order))
+
+    def write(self, f):
+        """Write the arrays to f in the layout read back by from_buffer"""
+        for values in (self.term_vectors, self.centroids, self.doc_ids, self.scales, self.assignments, self.codes):
+            f.write(np.ascontiguousarray(values).tobytes())
+
+    @staticmethod
+    def file_size(terms, dimensions, lists, docs, quantization):
+        return 4 * dimensions * (terms + lists) + 12 * docs + (1 if quantization == 'int8' else 4) * docs * dimensions
+
+    @classmethod
+    def from_buffer(cls, buffer, terms, dimensions, lists, docs, quantization, fitted, version):
+        """Index over the arrays written by write, without copying them"""
+        offset = 0
+        arrays = []
+        for dtype, shape in ((np.float32, (terms, dimensions)), (np.float32, (lists, dimensions)),
+                             (np.uint32, (docs,)), (np.float32, (docs,)), (np.uint32, (docs,)),
+                             (np.int8 if quantization == 'int8' else np.float32, (docs, dimensions))):
+            count = math.prod(shape)
+            arrays.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape))
+            offset += count * np.dtype(dtype).itemsize
+        term_vectors, centroids, doc_ids, scales, assignments, codes = arrays
+        return cls(term_vectors, centroids, fitted, doc_ids, codes, scales, assignments, version)
+
+
+class SemanticRetriever:
+    """Semantic stage of a ranker: its latest SemanticIndex, kept up to date with the snapshots
+
+    Shared by the snapshots of one ranker. The first snapshot searching a new
+    version of the corpus updates the index under a lock.
+    """
+
+    def __init__(self, dimensions, quantization, shortlist, probes):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {', '.join(QUANTIZATIONS)}")
+        self.dimensions = dimensions
+        self.quantization = quantization
+        self.shortlist = shortlist
+        self.probes = probes
+        self.current = None
+        self._lock = threading.Lock()
+
+    def resume(self, semantic, index, doc_ids):
+        """Start from embeddings saved with an index, reopened as index over doc_ids
+
+        Saved embeddings carry the generation they were saved with, while a
+        reopened ResumeIndex counts its own changes, so they only become the
+        index of its version if they cover doc_ids; otherwise the next
+        snapshot updates them.
+        """
+        covers = semantic.covers(np.frombuffer(doc_ids, dtype=np.uint32))
+        with self._lock:
+            self.current = semantic.relabelled(index.version if covers else None)
+
+    def index_for(self, snapshot):
+        """SemanticIndex of the corpus of snapshot, or None if it is too small to fit"""
+        version = snapshot.index.version
+        with self._lock:
+            semantic = self.current
+            if semantic is not None and semantic.version == version:
+                return semantic
+            doc_ids = np.frombuffer(snapshot.doc_ids, dtype=np.uint32)
+            if semantic is not None and semantic.covers(doc_ids):
+                semantic = semantic.relabelled(version)
+            else:
+                tfidf_matrix = snapshot.built_vector_backend().tfidf_matrix
+                with span('semantic_build'):
+                    if semantic is None or semantic.needs_refit(len(doc_ids)):
+                        semantic = SemanticIndex.build(tfidf_matrix, doc_ids, self.dimensions,
+                                                       self.quantization, version)
+                    else:
+                        semantic = semantic.updated(tfidf_matrix, doc_ids, version)
+            self.current = semantic
+            return semantic
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Production Server for AI-Powered Resume Ranker
+Serves app_basic with gunicorn: a pool of preforked worker processes, each
+with a few threads, that map the saved index of every workspace read-only
+instead of loading their own copy. /rank scales over all cores while the
+corpus is held once in the page cache; writes take a lock on the index folder
+and every worker maps the new index on its next request.
+
+Usage: python serve.py [--workers N] [--threads N] [--bind HOST:PORT] [--timeout SECONDS]
+"""
+
+import os
+import sys
+import argparse
+
+try:
+    from gunicorn.app.base import BaseApplication
+    HAS_GUNICORN = True
+except ImportError:
+    BaseApplication = object
+    HAS_GUNICORN = False
+
+# Configuration, overridable through the environment or the command line
+SERVE_BIND = os.environ.get('SERVE_BIND', '0.0.0.0:8080')
+SERVE_WORKERS = int(os.environ.get('SERVE_WORKERS', os.cpu_count() or 1))
+SERVE_THREADS = int(os.environ.get('SERVE_THREADS', 4))
+SERVE_TIMEOUT = int(os.environ.get('SERVE_TIMEOUT', 120))
+
+
+class ResumeRankerServer(BaseApplication):
+    """gunicorn application importing app_basic in every worker after the fork
+
+    The app is not preloaded, so no worker inherits the ingestion thread or
+    the extraction pool of the master, and each maps the index on its own.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app_basic import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the resume ranker with worker processes')
+    parser.add_argument('--bind', default=SERVE_BIND)
+    parser.add_argument('--workers', type=int, default=SERVE_WORKERS)
+    parser.add_argument('--threads', type=int, default=SERVE_THREADS)
+    parser.add_argument('--timeout', type=int, default=SERVE_TIMEOUT)
+    args = parser.parse_args()
+
+    if not HAS_GUNICORN:
+        print("gunicorn is not installed: pip install gunicorn (not available on Windows), "
+              "or use python app_basic.py for development")
+        return 1
+
+    os.environ['SHARED_INDEX'] = '1'
+    # Extraction pools are per worker, split the cores between them
+    os.environ.setdefault('EXTRACTION_WORKERS', str(max((os.cpu_count() or 1) // max(args.workers, 1), 1)))
+
+    ResumeRankerServer({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'timeout': args.timeout,
+        'preload_app': False,
+        'accesslog': '-'
+    }).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""
+Sharded Corpus for AI-Powered Resume Ranker
+Splits the corpus over shards that each hold the index of their resumes in
+a worker process of their own, so neither memory nor ranking is bound to
+one process. A coordinator interns the terms, sends every resume to the
+shard its filename hashes to and keeps the statistics of the whole corpus:
+the number of resumes, their total length and the document frequency and
+highest tf of every term. It broadcasts them to the shards after every
+change, so idf, document norms and BM25 weights are the corpus-wide ones
+and every resume scores as it would in a single BasicResumeRanker. A job is
+fanned out to every shard and their top k are merged.
+The shards run in local processes; they are driven by plain messages over
+a multiprocessing Connection, which may as well cross machines.
+"""
+
+import zlib
+import heapq
+import threading
+import multiprocessing
+from array import array
+from collections import Counter
+from itertools import islice
+
+from tokenizer import Vocabulary
+from resume_index import ResumeIndex
+from corpus_store import ResumeCorpus
+from job_query import JobQuery, job_key, job_keywords
+from ranker_snapshot import RankerSnapshot
+from text_extraction import extract_resume
+from top_k import select_top
+from metrics import span
+
+SCORING_MODES = ('tfidf', 'bm25')
+
+
+def shard_of(filename, num_shards):
+    """Shard holding the resume called filename, so a re-upload replaces it in place"""
+    return zlib.crc32(filename.encode('utf-8')) % num_shards
+
+
+class ShardIndex(ResumeIndex):
+    """ResumeIndex of one shard, weighting terms by the statistics of the whole corpus
+
+    num_docs, document_frequency and max_tf answer for all shards, as last
+    broadcast by the coordinator, and so does total_length once the
+    broadcast that follows every change has arrived. Query vectors,
+    document norms and BM25 queries then come out as in an unsharded index.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.corpus_docs = 0
+        self.corpus_dfs = array('I')
+        self.corpus_max_tfs = array('I')
+
+    @property
+    def num_docs(self):
+        return self.corpus_docs
+
+    def document_frequency(self, term):
+        return self.corpus_dfs[term] if 0 <= term < len(self.corpus_dfs) else 0
+
+    def max_tf(self, term):
+        return self.corpus_max_tfs[term] if 0 <= term < len(self.corpus_max_tfs) else 0
+
+    def _unshare(self):
+        if self._shared:
+            self.corpus_dfs = self.corpus_dfs[:]
+            self.corpus_max_tfs = self.corpus_max_tfs[:]
+        super()._unshare()
+
+    def set_statistics(self, num_docs, total_length, terms):
+        """Take the corpus statistics broadcast by the coordinator
+
+        terms maps the ids of the terms whose df or highest tf changed to
+        their new (df, max tf). The norms of the documents of this shard
+        holding a term whose df changed are refreshed before the next query.
+        """
+        self._unshare()
+        self.corpus_docs = num_docs
+        self.total_length = total_length
+        size = max(terms, default=-1) + 1
+        for column in (self.corpus_dfs, self.corpus_max_tfs):
+            if size > len(column):
+                column.frombytes(bytes(4 * (size - len(column))))
+
+        for term, (df, max_tf) in terms.items():
+            if df != self.corpus_dfs[term] and term in self.postings:
+                self._dirty_terms.add(term)
+            self.corpus_dfs[term] = df
+            self.corpus_max_tfs[term] = max_tf
+        self.version += 1
+
+
+class Shard:
+    """The resumes of one shard, their index and the current job, in its worker process
+
+    The vocabulary is a copy of the coordinator's, kept in step with the
+    terms sent along with every batch, so term ids and compiled jobs are
+    the same everywhere. Resumes also keep the corpus-wide id the
+    coordinator gave them, global_ids row by row, which ascend with the
+    rows like the doc ids of the shard: ties within the top k of a shard
+    fall in the order they take in the whole corpus.
+    """
+
+    def __init__(self, scoring):
+        self.scoring = scoring
+        self.vocabulary = Vocabulary()
+        self.index = ShardIndex()
+        self.corpus = ResumeCorpus()
+        self.global_ids = array('Q')
+        self.job_query = JobQuery(job_key(''), '', {})
+        self.snapshot = None
+        self.keyword_scores = None
+
+    def size(self):
+        return len(self.corpus)
+
+    def add(self, terms, documents):
+        """Intern the terms new to the coordinator and index (global id, filename, tokens) resumes
+
+        Returns the tokens of the resumes they replaced.
+        """
+        for term in terms:
+            self.vocabulary.intern(term)
+        replaced = []
+        for global_id, filename, tokens in documents:
+            removed = self.remove(filename)
+            if removed is not None:
+                replaced.append(removed)
+            doc_id = self.index.add_document(tokens)
+            self.corpus.append(doc_id, filename, tokens)
+            self.global_ids.append(global_id)
+        self.snapshot = None
+        return replaced
+
+    def remove(self, filename):
+        """Drop a resume and return its tokens, None if this shard does not hold it"""
+        row = self.corpus.row_of(filename)
+        if row < 0:
+            return None
+        doc_id, _, tokens = self.corpus.remove(row)
+        self.index.remove_document(doc_id, tokens)
+        del self.global_ids[row]
+        self.snapshot = None
+        return tokens
+
+    def set_statistics(self, num_docs, total_length, terms):
+        """Take the corpus statistics that follow every change and publish a new snapshot
+
+        Like the ranker's own publish after a change, this refreshes the
+        norms now rather than in the next query.
+        """
+        self.index.set_statistics(num_docs, total_length, terms)
+        self.snapshot = None
+        self.current_snapshot()
+
+    def set_job(self, job_description, keywords):
+        """Compile the job, its keywords already normalised or extracted by the coordinator"""
+        self.job_query = JobQuery(job_key(job_description, keywords), job_description, keywords)
+        if self.snapshot is not None:
+            self.snapshot = self.snapshot.with_job_query(self.job_query)
+        self.keyword_scores = None
+
+    def current_snapshot(self):
+        """Snapshot of the shard for ranking, scored on the postings path
+
+        The CSR backend would compute idf from the shard alone.
+        """
+        if self.snapshot is None:
+            self.snapshot = RankerSnapshot(self.vocabulary, self.index.snapshot(), self.corpus, self.job_query,
+                                           float('inf'), scoring=self.scoring)
+            self.keyword_scores = None
+        return self.snapshot
+
+    def max_keyword_score(self):
+        """Best keyword score of the job in this shard, keeping the scores for the next top()"""
+        snapshot = self.current_snapshot()
+        self.keyword_scores = snapshot.keyword_scores(self.job_query) if snapshot.resume_tokens else []
+        return max(self.keyword_scores, default=0)
+
+    def top(self, limit, min_score, max_keyword_score):
+        """(score, global id, filename) of the limit best resumes of the shard, best first
+
+        min_score is a percentage as for rank_page, and max_keyword_score
+        the best keyword score of all shards in TF-IDF mode.
+        """
+        snapshot = self.current_snapshot()
+        ranked = snapshot.bm25_page(limit, 0, min_score)
+        if ranked is None:
+            scores = snapshot.calculate_job_scores(self.job_query, self.keyword_scores, max_keyword_score)
+            order = select_top(scores, limit, 0, min_score / 100 if min_score is not None else None)
+            ranked = [(row, scores[row]) for row in order]
+        self.keyword_scores = None
+        return [(float(score), self.global_ids[row], snapshot.resume_names[row]) for row, score in ranked]
+
+
+SHARD_METHODS = ('size', 'add', 'remove', 'set_statistics', 'set_job', 'max_keyword_score', 'top')
+
+
+def serve_shard(connection, scoring):
+    """Worker loop of a shard: answer (method, args) messages until 'stop' or EOF
+
+    Every message gets ('ok', result) or ('error', message) back.
+    """
+    shard = Shard(scoring)
+    while True:
+        try:
+            method, args = connection.recv()
+        except EOFError:
+            break
+        if method == 'stop':
+            connection.send(('ok', None))
+            break
+        try:
+            if method not in SHARD_METHODS:
+                raise ValueError(f"Unknown shard method {method}")
+            connection.send(('ok', getattr(shard, method)(*args)))
+        except Exception as e:
+            connection.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class ShardedRanker:
+    """Coordinator of a corpus split over num_shards worker processes
+
+    Holds the vocabulary and corpus statistics but no resumes. Calls are
+    serialised by a lock and every shard answers a call in parallel with
+    the others. Near-duplicate detection and the semantic stage are left
+    to BasicResumeRanker.
+    """
+
+    def __init__(self, num_shards, scoring='tfidf'):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {', '.join(SCORING_MODES)}")
+        self.num_shards = num_shards
+        self.scoring = scoring
+        self.vocabulary = Vocabulary()
+        self.job_description = ""
+        self.job_keywords = {}
+
+        # Corpus statistics, and the terms whose df or highest tf changed
+        # since the last broadcast. Like ResumeIndex.max_tfs, removals leave
+        # the highest tfs as they are, still upper bounds
+        self.num_docs = 0
+        self.total_length = 0
+        self.dfs = array('I')
+        self.max_tfs = array('I')
+        self._changed_terms = set()
+        self._synced_terms = 0
+        self._next_id = 0
+
+        self._lock = threading.Lock()
+        self._connections = []
+        self._processes = []
+        context = multiprocessing.get_context()
+        for _ in range(num_shards):
+            connection, child = context.Pipe()
+            process = context.Process(target=serve_shard, args=(child, scoring), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def _call(self, calls):
+        """Send (shard, method, args) calls, then wait for every result, in order"""
+        for shard, method, args in calls:
+            self._connections[shard].send((method, args))
+        results = []
+        for shard, method, _ in calls:
+            status, result = self._connections[shard].recv()
+            if status != 'ok':
+                raise RuntimeError(f"Shard {shard} failed in {method}: {result}")
+            results.append(result)
+        return results
+
+    def _broadcast(self, method, *args):
+        return self._call([(shard, method, args) for shard in range(self.num_shards)])
+
+    def _count(self, tokens, sign):
+        """Add a resume's tokens to the corpus statistics, or take them out with sign -1"""
+        counts = Counter(tokens)
+        missing = len(self.vocabulary) - len(self.dfs)
+        if missing > 0:
+            self.dfs.frombytes(bytes(4 * missing))
+            self.max_tfs.frombytes(bytes(4 * missing))
+        for term, tf in counts.items():
+            self.dfs[term] += sign
+            if tf > self.max_tfs[term]:
+                self.max_tfs[term] = tf
+        self._changed_terms.update(counts)
+        self.num_docs += sign
+        self.total_length += sign * len(tokens)
+
+    def _publish_statistics(self):
+        terms = {term: (self.dfs[term], self.max_tfs[term]) for term in self._changed_terms}
+        self._changed_terms = set()
+        with span('statistics'):
+            self._broadcast('set_statistics', self.num_docs, self.total_length, terms)
+
+    def add_resumes(self, files):
+        """Extract and index (file_path, filename) resumes, returning {filename: error} of failures"""
+        extracted, failures = [], {}
+        with span('extract'):
+            for file_path, filename in files:
+                try:
+                    processed_text, truncation = extract_resume(file_path)
+                except Exception as e:
+                    failures[filename] = str(e) or type(e).__name__
+                    continue
+                extracted.append((file_path, filename, None, processed_text, truncation))
+        self.insert_resumes(extracted)
+        return failures
+
+    def insert_resumes(self, extracted):
+        """Index the (file_path, filename, sha256, processed_text, truncation) entries of extract_resumes
+
+        Each shard gets its resumes, and every shard the new terms, in one
+        message; the statistics follow in a second one.
+        """
+        with self._lock, span('index'):
+            batches = [[] for _ in range(self.num_shards)]
+            for _, filename, _, processed_text, _ in extracted:
+                tokens = self.vocabulary.encode(processed_text.split())
+                self._count(tokens, 1)
+                batches[shard_of(filename, self.num_shards)].append((self._next_id, filename, tokens))
+                self._next_id += 1
+
+            terms = self.vocabulary.terms[self._synced_terms:]
+            self._synced_terms = len(self.vocabulary)
+            replies = self._call([(shard, 'add', (terms, batch)) for shard, batch in enumerate(batches)])
+            for replaced in replies:
+                for tokens in replaced:
+                    self._count(tokens, -1)
+            self._publish_statistics()
+
+    def remove_resume(self, filename):
+        """Remove a resume from its shard, returning whether there was one"""
+        with self._lock:
+            tokens = self._call([(shard_of(filename, self.num_shards), 'remove', (filename,))])[0]
+            if tokens is None:
+                return False
+            self._count(tokens, -1)
+            self._publish_statistics()
+            return True
+
+    def set_job_description(self, job_description, keywords=None):
+        """Set job description and keywords for ranking in every shard"""
+        with self._lock:
+            self.job_keywords = job_keywords(job_description, keywords)
+            self._broadcast('set_job', job_description, self.job_keywords)
+            self.job_description = job_description
+
+    def shard_sizes(self):
+        """Number of resumes held by each shard"""
+        with self._lock:
+            return self._broadcast('size')
+
+    def rank_page(self, top_k=None, offset=0, min_score=None):
+        """Rank resumes across the shards and return one page of results
+
+        Every shard returns its own top offset + top_k, merged by score with
+        ties in upload order. In TF-IDF mode the shards first report their
+        best keyword score, which normalises the keyword scores of all.
+        There are no stats over all matches.
+        """
+        limit = offset + top_k if top_k is not None else None
+        with self._lock:
+            max_keyword_score = None
+            if self.scoring == 'tfidf':
+                with span('keywords'):
+                    max_keyword_score = max(self._broadcast('max_keyword_score'))
+            with span('shards'):
+                shard_tops = self._broadcast('top', limit, min_score, max_keyword_score)
+
+        with span('merge'):
+            merged = heapq.merge(*shard_tops, key=lambda entry: (-entry[0], entry[1]))
+            page = list(islice(merged, offset, limit))
+
+        results = []
+        for rank, (score, _, filename) in enumerate(page, start=offset + 1):
+            score = round(score * 100, 2)
+            results.append({
+                'rank': rank,
+                'filename': filename,
+                'score': score,
+                'similarity_percentage': score
+            })
+        return {
+            'results': results,
+            'total_resumes': self.num_docs,
+            'total_matches': None,
+            'offset': offset,
+            'top_k': top_k,
+            'stats': None,
+            'shards': self.num_shards
+        }
+
+    def shutdown(self):
+        """Stop the shard processes"""
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.send(('stop', ()))
+                    connection.recv()
+                except (OSError, EOFError):
+                    pass
+                connection.close()
+            for process in self._processes:
+                process.join(5)
+                if process.is_alive():
+                    process.terminate()
+            self._connections, self._processes = [], []
@@ -0,0 +1,112 @@
+"""Saving and reopening the persistent index"""
+
+import os
+
+import pytest
+
+from resume_ranker import BasicResumeRanker
+from semantic_index import HAS_SEMANTIC_INDEX, np
+
+JOB_DESCRIPTION = "Python developer with Django, SQL and machine learning"
+
+
+def write_resumes(folder, start, count):
+    os.makedirs(folder, exist_ok=True)
+    for number in range(start, start + count):
+        with open(os.path.join(folder, f'resume_{number}.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"Python developer {number} with Django, SQL and {'machine learning' if number % 3 else 'Java'}")
+
+
+def open_ranker(index_folder, read_only=False, scoring='tfidf', semantic=False):
+    # Scored on the postings path, which the mapped index serves as well
+    ranker = BasicResumeRanker(vector_backend_min_resumes=float('inf'), duplicate_mode='off', scoring=scoring,
+                               semantic=semantic)
+    if semantic:
+        ranker.semantic_retriever.dimensions = 4
+    ranker.open_index(index_folder, read_only)
+    return ranker
+
+
+def scores(ranker):
+    ranker.set_job_description(JOB_DESCRIPTION, {'python': 2.0, 'machine learning': 1.0})
+    snapshot = ranker.current_snapshot()
+    return dict(zip(snapshot.resume_names, snapshot.calculate_scores()))
+
+
+def test_sync_of_an_unchanged_folder_saves_nothing(tmp_path):
+    upload_folder, index_folder = str(tmp_path / 'uploads'), str(tmp_path / 'index')
+    write_resumes(upload_folder, 0, 5)
+    ranker = open_ranker(index_folder)
+    assert ranker.sync_folder(upload_folder)
+    generation = ranker.store.generation()
+    ranker.store.close()
+
+    ranker = open_ranker(index_folder)
+    assert not ranker.sync_folder(upload_folder)
+    assert ranker.store.generation() == generation
+
+    write_resumes(upload_folder, 5, 1)
+    assert ranker.sync_folder(upload_folder)
+    assert ranker.store.generation() == generation + 1
+    ranker.store.close()
+
+
+@pytest.mark.parametrize('scoring', ['tfidf', 'bm25'])
+def test_reopened_index_scores_like_the_saved_one(tmp_path, scoring):
+    upload_folder, index_folder = str(tmp_path / 'uploads'), str(tmp_path / 'index')
+    write_resumes(upload_folder, 0, 30)
+    ranker = open_ranker(index_folder, scoring=scoring)
+    ranker.sync_folder(upload_folder)
+    for number in range(0, 30, 4):
+        ranker.remove_resume(f'resume_{number}.txt')
+    ranker.save_index()
+    expected = scores(ranker)
+    ranker.store.close()
+
+    for read_only in (False, True):
+        ranker = open_ranker(index_folder, read_only, scoring)
+        assert ranker.read_only == read_only
+        assert scores(ranker) == pytest.approx(expected, abs=1e-12)
+        ranker.store.close()
+
+
+@pytest.mark.parametrize('semantic', [False, pytest.param(True, marks=pytest.mark.skipif(
+    not HAS_SEMANTIC_INDEX, reason="NumPy and SciPy are not installed"))])
+def test_resumes_added_after_a_reopen(tmp_path, semantic):
+    upload_folder, index_folder = str(tmp_path / 'uploads'), str(tmp_path / 'index')
+    write_resumes(upload_folder, 0, 30)
+    ranker = open_ranker(index_folder, semantic=semantic)
+    ranker.sync_folder(upload_folder)
+    ranker.remove_resume('resume_5.txt')
+    ranker.save_index()
+    ranker.store.close()
+
+    ranker = open_ranker(index_folder, semantic=semantic)
+    # One at a time until the reopened index has counted as many changes as
+    # the store saved generations, which the saved embeddings carry
+    number = 30
+    while ranker.index.version < ranker.store.generation():
+        write_resumes(upload_folder, number, 1)
+        ranker.add_resumes([(os.path.join(upload_folder, f'resume_{number}.txt'), f'resume_{number}.txt')])
+        number += 1
+    assert number > 30
+    os.remove(os.path.join(upload_folder, 'resume_5.txt'))
+
+    # The same resumes indexed in one go, without a store
+    fresh = BasicResumeRanker(vector_backend_min_resumes=float('inf'), duplicate_mode='off', semantic=False)
+    fresh.add_resumes([(entry.path, entry.name) for entry in os.scandir(upload_folder)])
+    assert scores(ranker) == pytest.approx(scores(fresh), abs=1e-12)
+
+    if semantic:
+        snapshot = ranker.current_snapshot()
+        semantic_index = ranker.semantic_retriever.index_for(snapshot)
+        assert semantic_index.covers(np.frombuffer(snapshot.doc_ids, dtype=np.uint32))
+
+    # Saved again and reopened, both ways
+    ranker.save_index()
+    expected = scores(ranker)
+    ranker.store.close()
+    for read_only in (False, True):
+        ranker = open_ranker(index_folder, read_only)
+        assert scores(ranker) == pytest.approx(expected, abs=1e-12)
+        ranker.store.close()
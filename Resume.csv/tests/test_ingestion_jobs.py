@@ -0,0 +1,100 @@
+"""Asynchronous upload jobs indexed batch by batch in the background"""
+
+import os
+import threading
+import time
+
+from ingestion_jobs import IngestionQueue
+from resume_ranker import BasicResumeRanker
+
+
+def write_file(folder, filename, content):
+    path = os.path.join(folder, filename)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path, filename
+
+
+def queue_for(ranker, started=None, release=None):
+    """IngestionQueue indexing into ranker like app_basic's, optionally held before the first batch"""
+    finished = []
+
+    def process_batch(job, files):
+        if started is not None and not started.is_set():
+            started.set()
+            assert release.wait(10)
+        extracted, failures = ranker.extract_resumes(files)
+        for duplicate in ranker.insert_resumes(extracted):
+            job.record_duplicate(duplicate)
+        for _, filename, _, _, truncation in extracted:
+            if truncation is not None:
+                job.record_truncation(filename, truncation)
+        return failures
+
+    return IngestionQueue(process_batch, finished.append, batch_size=2), finished
+
+
+def poll(queue, job_id, timeout=10):
+    """Status of a job, polled until it has finished"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.get(job_id).to_dict()
+        if status['finished_at'] is not None:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f'Job {job_id} did not finish')
+
+
+def test_job_lifecycle(tmp_path):
+    folder = str(tmp_path)
+    ranker = BasicResumeRanker(duplicate_mode='off', semantic=False, max_bytes=200)
+    started, release = threading.Event(), threading.Event()
+    queue, finished = queue_for(ranker, started, release)
+    files = [write_file(folder, f'resume_{number}.txt', f"Python developer {number} with Django".encode())
+             for number in range(3)]
+    files.append(write_file(folder, 'long.txt', b"machine learning engineer " * 50))
+    # Gone before it was indexed, in a batch of its own
+    files.append((os.path.join(folder, 'missing.txt'), 'missing.txt'))
+
+    job = queue.submit(files, 'default')
+    assert started.wait(10)
+    status = job.to_dict()
+    assert status['status'] == 'running'
+    assert status['total_files'] == 5 and status['processed_files'] == 0
+    assert [file['status'] for file in status['files']] == ['processing', 'processing', 'queued', 'queued', 'queued']
+    assert queue.active_jobs('default') == [job] and queue.active_jobs('other') == []
+
+    release.set()
+    status = poll(queue, job.id)
+    assert status['status'] == 'completed'
+    assert (status['processed_files'], status['indexed_files'], status['failed_files']) == (5, 4, 1)
+    assert status['eta_seconds'] is None
+    assert [failure['filename'] for failure in status['failed']] == ['missing.txt']
+    assert [truncated['filename'] for truncated in status['truncated']] == ['long.txt']
+    assert {file['filename']: file['status'] for file in status['files']} == {
+        'resume_0.txt': 'indexed', 'resume_1.txt': 'indexed', 'resume_2.txt': 'indexed',
+        'long.txt': 'indexed', 'missing.txt': 'failed'}
+    assert finished == [job]
+    assert queue.active_jobs() == []
+    assert sorted(ranker.resume_names) == ['long.txt', 'resume_0.txt', 'resume_1.txt', 'resume_2.txt']
+
+
+def test_job_cancelled_while_queued(tmp_path):
+    folder = str(tmp_path)
+    ranker = BasicResumeRanker(duplicate_mode='off', semantic=False)
+    started, release = threading.Event(), threading.Event()
+    queue, finished = queue_for(ranker, started, release)
+
+    first = queue.submit([write_file(folder, 'a.txt', b"Python developer")])
+    assert started.wait(10)
+    second = queue.submit([write_file(folder, 'b.txt', b"Java developer")])
+    assert second.to_dict()['status'] == 'queued'
+    second.cancel()
+    release.set()
+
+    assert poll(queue, first.id)['status'] == 'completed'
+    status = poll(queue, second.id)
+    assert status['status'] == 'cancelled'
+    assert status['files'] == [{'filename': 'b.txt', 'status': 'cancelled'}]
+    assert finished == [first]
+    assert list(ranker.resume_names) == ['a.txt']
@@ -0,0 +1,43 @@
+"""Keyword compilation and matching against the token arrays of a corpus"""
+
+from keyword_matcher import KeywordMatcher
+from resume_ranker import BasicResumeRanker
+from text_extraction import preprocess_text
+
+RESUMES = {
+    'five_years.txt': "Python developer with 5 years of Django experience, Ruby on Rails",
+    'two_years.txt': "Python developer with 2 years of Flask experience",
+    'no_years.txt': "Java developer, machine learning and C++ developer work",
+}
+
+
+def keyword_scores(keywords):
+    ranker = BasicResumeRanker(duplicate_mode='off', scoring='tfidf')
+    ranker.insert_resumes([(None, filename, None, preprocess_text(text), None)
+                           for filename, text in RESUMES.items()])
+    ranker.set_job_description("python developer", keywords)
+    snapshot = ranker.current_snapshot()
+    return dict(zip(snapshot.resume_names, snapshot.keyword_scores(ranker.job_query))), ranker.job_query
+
+
+def test_keywords_with_short_words_are_ignored_not_widened():
+    matcher = KeywordMatcher({'5 years': 1.5, 'c++ developer': 1.0, 'ai': 1.0, 'python': 2.0})
+    assert matcher.ignored == ['5 years', 'c++ developer', 'ai']
+    assert matcher.phrases == [(('python',), 2.0)]
+
+
+def test_stop_words_inside_a_keyword_still_match():
+    matcher = KeywordMatcher({'Ruby on Rails': 1.0})
+    assert matcher.ignored == []
+    assert matcher.phrases == [(('ruby', 'rails'), 1.0)]
+
+
+def test_ignored_keyword_matches_no_resume():
+    scores, job_query = keyword_scores({'5 years': 1.5})
+    assert job_query.matcher.ignored == ['5 years']
+    assert set(scores.values()) == {0}
+
+
+def test_phrases_match_whole_consecutive_words():
+    scores, _ = keyword_scores({'django': 1.0, 'machine learning': 2.0, 'ruby on rails': 0.5})
+    assert scores == {'five_years.txt': 1.5, 'two_years.txt': 0, 'no_years.txt': 2.0}
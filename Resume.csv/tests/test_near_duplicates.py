@@ -0,0 +1,70 @@
+"""Near-duplicate resumes found with MinHash and LSH at ingest"""
+
+import random
+
+from near_duplicates import duplicate_groups
+from resume_ranker import BasicResumeRanker
+
+WORDS = ['python', 'java', 'django', 'spring', 'sql', 'docker', 'kubernetes', 'aws', 'react', 'pandas',
+         'spark', 'kafka', 'team', 'project', 'developed', 'built', 'senior', 'engineer', 'services', 'data']
+
+
+def resume_text(seed, length=120):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(length))
+
+
+def edited(text):
+    """text with two of its words replaced, as after a light edit"""
+    words = text.split()
+    words[10] = 'kotlin'
+    words[70] = 'terraform'
+    return ' '.join(words)
+
+
+def ranker_with(duplicate_mode, *resumes):
+    ranker = BasicResumeRanker(duplicate_mode=duplicate_mode, semantic=False)
+    duplicates = ranker.insert_resumes([(None, filename, None, text, None) for filename, text in resumes])
+    return ranker, duplicates
+
+
+def test_edited_resume_is_flagged():
+    original = resume_text(1)
+    ranker, duplicates = ranker_with('flag', ('original.txt', original), ('edited.txt', edited(original)),
+                                     ('other.txt', resume_text(2)))
+
+    assert [(duplicate['filename'], duplicate['duplicate_of']) for duplicate in duplicates] == [
+        ('edited.txt', 'original.txt')]
+    assert duplicates[0]['similarity'] >= ranker.duplicate_threshold
+    assert 'other.txt' not in ranker.duplicates
+    assert [group['filename'] for group in duplicate_groups(ranker.duplicates.values())] == ['original.txt']
+    # Flagged duplicates are still ranked
+    assert len(ranker.resume_names) == 3
+
+
+def test_removed_resumes_leave_the_groups():
+    original = resume_text(3)
+    ranker, _ = ranker_with('flag', ('original.txt', original), ('edited.txt', edited(original)),
+                            ('other.txt', resume_text(4)))
+
+    ranker.remove_resume('edited.txt')
+    assert duplicate_groups(ranker.duplicates.values()) == []
+
+    ranker.insert_resumes([(None, 'edited.txt', None, edited(original), None)])
+    assert ranker.duplicates['edited.txt'].duplicate_of == 'original.txt'
+    # The duplicate of a removed original no longer duplicates anything
+    ranker.remove_resume('original.txt')
+    assert duplicate_groups(ranker.duplicates.values()) == []
+    assert sorted(ranker.resume_names) == ['edited.txt', 'other.txt']
+
+
+def test_collapsed_duplicate_takes_the_place_of_its_removed_original():
+    original = resume_text(5)
+    ranker, duplicates = ranker_with('collapse', ('original.txt', original), ('edited.txt', edited(original)))
+
+    assert duplicates[0]['collapsed']
+    assert list(ranker.resume_names) == ['original.txt']
+
+    ranker.remove_resume('original.txt')
+    assert list(ranker.resume_names) == ['edited.txt']
+    assert not ranker.duplicates
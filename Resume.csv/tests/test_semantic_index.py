@@ -0,0 +1,73 @@
+"""Embeddings saved with the index stay in step with the corpus after a restart"""
+
+import os
+
+import pytest
+
+from resume_ranker import BasicResumeRanker
+from semantic_index import HAS_SEMANTIC_INDEX, np
+
+pytestmark = pytest.mark.skipif(not HAS_SEMANTIC_INDEX, reason="NumPy and SciPy are not installed")
+
+SKILLS = ['python', 'django', 'java', 'spring', 'react', 'sql', 'docker', 'kubernetes', 'aws', 'spark', 'kafka']
+
+
+def write_resume(folder, name, text):
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path, name
+
+
+def resume_text(number):
+    return ' '.join(f"{SKILLS[(number * j) % len(SKILLS)]} project{(number + j) % 13}" for j in range(30))
+
+
+def open_ranker(index_folder):
+    ranker = BasicResumeRanker(duplicate_mode='off', semantic=True)
+    # Fewer dimensions than terms, so the saved embeddings are loaded again
+    ranker.semantic_retriever.dimensions = 8
+    ranker.semantic_retriever.shortlist = 20
+    ranker.semantic_retriever.probes = 2
+    ranker.open_index(index_folder)
+    return ranker
+
+
+def test_uploads_after_restart_are_embedded(tmp_path):
+    upload_folder, index_folder = str(tmp_path / 'uploads'), str(tmp_path / 'index')
+    os.makedirs(upload_folder)
+    for number in range(120):
+        write_resume(upload_folder, f'r{number:04d}.txt', resume_text(number))
+
+    ranker = open_ranker(index_folder)
+    ranker.sync_folder(upload_folder)
+    ranker.save_index()
+    ranker.store.close()
+
+    ranker = open_ranker(index_folder)
+    job_description = "python django sql docker project3"
+    ranker.set_job_description(job_description)
+    # The embeddings carry the generation they were saved with and the
+    # reopened index counts its own changes: upload until the numbers meet
+    new_names = []
+    number = 1000
+    while ranker.index.version < ranker.store.generation():
+        # Closer to the job than any resume saved before the restart
+        new_names.append(write_resume(upload_folder, f'r{number}.txt', (job_description + " ") * 10)[1])
+        ranker.add_resumes([(os.path.join(upload_folder, new_names[-1]), new_names[-1])])
+        number += 1
+    assert new_names
+
+    snapshot = ranker.current_snapshot()
+    semantic = ranker.semantic_retriever.index_for(snapshot)
+    assert semantic.covers(np.frombuffer(snapshot.doc_ids, dtype=np.uint32))
+    page = ranker.rank_page(5)
+    assert 'semantic' in page
+    assert set(new_names) <= {result['filename'] for result in page['results']}
+
+    # The embeddings saved next cover the new resumes too
+    ranker.save_index()
+    ranker.store.close()
+    ranker = open_ranker(index_folder)
+    assert len(ranker.semantic_retriever.current.doc_ids) == 120 + len(new_names)
+    ranker.store.close()
@@ -0,0 +1,95 @@
+"""Scores of the NumPy/SciPy CSR backend against the pure-Python scoring path"""
+
+import random
+
+import pytest
+
+from resume_ranker import BasicResumeRanker
+from text_extraction import preprocess_text
+from vector_backend import CsrScoringBackend, HAS_VECTOR_BACKEND
+
+pytestmark = pytest.mark.skipif(not HAS_VECTOR_BACKEND, reason="NumPy and SciPy are not installed")
+
+SKILLS = ['python', 'java', 'javascript', 'react', 'sql', 'machine', 'learning', 'docker', 'kubernetes',
+          'aws', 'spring', 'boot', 'django', 'flask', 'pandas', 'spark']
+FILLER = ['experience', 'team', 'project', 'developed', 'built', 'senior', 'years', 'engineer']
+
+JOB_DESCRIPTION = """We are looking for a Senior Python Developer with machine learning
+experience, SQL databases, Docker and AWS. Knowledge of Django or Flask is a plus."""
+JOBS = [
+    {'title': 'keywords', 'job_description': JOB_DESCRIPTION,
+     'keywords': {'Python': 2.0, 'Machine Learning': 1.5, 'Docker': 1.0, 'SQL': 1.0, 'node': 0.5}},
+    {'title': 'auto keywords', 'job_description': JOB_DESCRIPTION},
+    {'title': 'java', 'job_description': "Java engineer for Spring Boot services", 'keywords': {'spring boot': 1.0}},
+]
+
+
+def resumes(count, seed=42):
+    rng = random.Random(seed)
+    for number in range(count):
+        words = rng.choices(SKILLS, k=rng.randint(5, 40)) + rng.choices(FILLER, k=rng.randint(5, 40))
+        rng.shuffle(words)
+        yield (None, f'resume_{number}.txt', None, preprocess_text(' '.join(words)), None)
+
+
+def rankers():
+    """The same corpus scored on the postings path and on the CSR backend"""
+    pure = BasicResumeRanker(vector_backend_min_resumes=float('inf'), duplicate_mode='off')
+    vectorised = BasicResumeRanker(vector_backend_min_resumes=0, duplicate_mode='off')
+    extracted = list(resumes(200))
+    pure.insert_resumes(extracted)
+    vectorised.insert_resumes(extracted)
+    assert not pure.current_snapshot().use_vector_backend()
+    assert vectorised.current_snapshot().use_vector_backend()
+    return pure, vectorised
+
+
+@pytest.mark.parametrize('job', JOBS, ids=[job['title'] for job in JOBS])
+def test_scores_match(job):
+    pure, vectorised = rankers()
+    for ranker in (pure, vectorised):
+        ranker.set_job_description(job['job_description'], job.get('keywords'))
+
+    assert vectorised.current_snapshot().calculate_scores() == pytest.approx(
+        pure.current_snapshot().calculate_scores(), abs=1e-9)
+    assert ([result['filename'] for result in vectorised.rank_page(20)['results']]
+            == [result['filename'] for result in pure.rank_page(20)['results']])
+
+
+def test_scores_match_after_removals():
+    pure, vectorised = rankers()
+    for ranker in (pure, vectorised):
+        ranker.set_job_description(JOB_DESCRIPTION)
+        ranker.current_snapshot().calculate_scores()
+        for number in range(0, 200, 7):
+            ranker.remove_resume(f'resume_{number}.txt')
+        ranker.insert_resumes(list(resumes(10, seed=7))[3:])
+
+    assert vectorised.current_snapshot().calculate_scores() == pytest.approx(
+        pure.current_snapshot().calculate_scores(), abs=1e-9)
+
+
+def test_batch_scores_match():
+    pure, vectorised = rankers()
+    expected = pure.rank_many(JOBS, top_k=10, best_job_per_candidate=True)
+    ranking = vectorised.rank_many(JOBS, top_k=10, best_job_per_candidate=True)
+    assert ranking == expected
+
+
+def test_updated_backend_matches_a_fresh_build():
+    _, vectorised = rankers()
+    vectorised.set_job_description(JOB_DESCRIPTION)
+    built = vectorised.current_snapshot().built_vector_backend()
+    for number in range(0, 200, 9):
+        vectorised.remove_resume(f'resume_{number}.txt')
+    vectorised.insert_resumes([(None, f'new_{number}.txt', None, text, None)
+                               for number, (_, _, _, text, _) in enumerate(resumes(15, seed=3))])
+
+    snapshot = vectorised.current_snapshot()
+    assert snapshot.vector_backend.previous is built
+    updated = snapshot.built_vector_backend()
+    fresh = CsrScoringBackend(vectorised.vocabulary)
+    fresh.build(snapshot.index, snapshot.doc_ids)
+    assert updated.previous is None
+    assert (updated.tf_matrix != fresh.tf_matrix).nnz == 0
+    assert abs(updated.tfidf_matrix - fresh.tfidf_matrix).max() < 1e-12
@@ -0,0 +1,115 @@
+"""Workspace eviction releases the memory of the unloaded workspace, deferred saves reach the disk"""
+
+import gc
+import os
+import threading
+import weakref
+
+from job_query import JobQueryCache
+from ranking_report import RankingStore
+from resume_ranker import BasicResumeRanker
+from workspaces import WorkspaceRegistry
+
+
+def write_resumes(folder, count):
+    os.makedirs(folder)
+    for number in range(count):
+        with open(os.path.join(folder, f'resume_{number}.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"Python developer {number} with Django and machine learning experience")
+
+
+def test_evicted_workspace_index_is_garbage_collected(tmp_path):
+    # Shared across workspaces as in app_basic
+    job_cache = JobQueryCache()
+    rankings = RankingStore()
+    registry = WorkspaceRegistry(
+        str(tmp_path), lambda: BasicResumeRanker(job_cache=job_cache, duplicate_mode='off'),
+        max_loaded=1, on_evict=rankings.discard
+    )
+    write_resumes(os.path.join(str(tmp_path), 'alice', 'uploads'), 5)
+
+    with registry.use('alice') as workspace:
+        workspace.set_job_description("python developer", {'django': 1.0, 'machine learning': 2.0})
+        ranker = workspace.ranker
+        assert ranker.rank_page(3)['results']
+        rankings.put('alice', ranker.snapshot)
+        held = [weakref.ref(ranker.index), weakref.ref(ranker.vocabulary), weakref.ref(ranker.snapshot.index)]
+    del workspace, ranker
+
+    with registry.use('bob'):
+        pass
+    gc.collect()
+
+    assert registry.evictions == 1
+    assert 'alice' not in registry.workspaces
+    assert len(job_cache.entries) == 1
+    assert [ref() for ref in held] == [None, None, None]
+
+
+def test_deferred_saves_are_written_on_unload(tmp_path):
+    registry = WorkspaceRegistry(str(tmp_path), lambda: BasicResumeRanker(duplicate_mode='off'), save_interval=3600)
+    upload_folder = os.path.join(str(tmp_path), 'alice', 'uploads')
+    write_resumes(upload_folder, 3)
+
+    def upload(workspace, number):
+        filename = f'late_{number}.txt'
+        with open(os.path.join(upload_folder, filename), 'w', encoding='utf-8') as f:
+            f.write(f"Java engineer {number} with Spring experience")
+        extracted, _ = workspace.ranker.extract_resumes([(os.path.join(upload_folder, filename), filename)])
+        with workspace.writing() as ranker:
+            ranker.insert_resumes(extracted)
+            workspace.save(ranker, defer=True)
+
+    with registry.use('alice') as workspace:
+        store = workspace.ranker.store
+        generation = store.generation()
+        upload(workspace, 1)
+        assert store.generation() == generation + 1
+        upload(workspace, 2)
+        upload(workspace, 3)
+        assert store.generation() == generation + 1
+        assert workspace.unsaved
+
+        workspace.unload()
+        assert not workspace.unsaved
+
+    # Opened without sync_folder, so only what was saved is there
+    ranker = BasicResumeRanker(duplicate_mode='off')
+    ranker.open_index(workspace.index_folder)
+    assert ranker.store.generation() == generation + 2
+    assert len(ranker.resume_names) == 6
+    ranker.store.close()
+
+
+def test_eviction_saves_outside_the_registry_lock(tmp_path):
+    registry = WorkspaceRegistry(str(tmp_path), lambda: BasicResumeRanker(duplicate_mode='off'), max_loaded=1)
+    saving, saved = threading.Event(), threading.Event()
+
+    with registry.use('alice') as alice:
+        save_index = alice.ranker.save_index
+
+        def slow_save_index():
+            saving.set()
+            assert saved.wait(10)
+            save_index()
+        alice.ranker.save_index = slow_save_index
+        alice.unsaved = True
+
+    def use(workspace_id):
+        with registry.use(workspace_id):
+            pass
+
+    evicting = threading.Thread(target=use, args=('bob',))
+    evicting.start()
+    assert saving.wait(10)
+    # alice is still saving, and other workspaces can be used meanwhile
+    other = threading.Thread(target=use, args=('carol',))
+    other.start()
+    other.join(10)
+    assert not other.is_alive()
+    assert 'alice' not in registry.workspaces
+
+    saved.set()
+    evicting.join(10)
+    assert alice.ranker is None and not alice.unsaved
+    assert registry.evictions >= 1
@@ -0,0 +1,166 @@
+"""
+Text Extraction for AI-Powered Resume Ranker
+Module-level extraction and preprocessing functions, importable by worker
+processes without pulling in the Flask application.
+Documents are streamed page by page (PDF), paragraph by paragraph (DOCX) or
+in fixed-size chunks (TXT) into the tokenizer, so only one page of raw text
+is held at a time, and extraction stops at a page and byte limit.
+"""
+
+import re
+import hashlib
+import inspect
+
+import PyPDF2
+from docx import Document
+
+import tokenizer
+from tokenizer import tokenize
+
+# Characters read from a plain text file per chunk
+TEXT_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r'\s')
+
+
+class ExtractionTimeout(Exception):
+    """A file took longer than the per-file timeout to extract"""
+
+
+class DocumentStream:
+    """Text of one resume file as an iterator of pages, paragraphs or chunks
+
+    Stops after max_pages PDF pages or max_bytes of UTF-8 text (None or 0
+    means no limit). Once iterated, truncated tells whether a limit cut the
+    document short and pages and bytes how much was read; error holds the
+    message of a PDF or DOCX that could only be read in part, if any.
+    """
+
+    def __init__(self, file_path, max_pages=None, max_bytes=None):
+        self.file_path = file_path
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.pages = 0
+        self.bytes = 0
+        self.truncated = False
+        self.error = None
+
+    def __iter__(self):
+        if self.file_path.endswith('.pdf'):
+            chunks = self._pdf_pages()
+        elif self.file_path.endswith('.docx'):
+            chunks = self._docx_paragraphs()
+        else:
+            chunks = self._text_chunks()
+
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            if self.max_bytes:
+                remaining = self.max_bytes - self.bytes
+                if len(data) > remaining:
+                    self.bytes = self.max_bytes
+                    self.truncated = True
+                    yield data[:remaining].decode('utf-8', 'ignore')
+                    chunks.close()
+                    return
+            self.bytes += len(data)
+            yield chunk
+
+    def _pdf_pages(self):
+        try:
+            with open(self.file_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                for page in pdf_reader.pages:
+                    if self.max_pages and self.pages >= self.max_pages:
+                        self.truncated = True
+                        return
+                    self.pages += 1
+                    yield page.extract_text()
+        except ExtractionTimeout:
+            raise
+        except Exception as e:
+            print(f"Error extracting text from PDF: {e}")
+            self.error = str(e) or type(e).__name__
+
+    def _docx_paragraphs(self):
+        try:
+            doc = Document(self.file_path)
+        except ExtractionTimeout:
+            raise
+        except Exception as e:
+            print(f"Error extracting text from DOCX: {e}")
+            self.error = str(e) or type(e).__name__
+            return
+        for paragraph in doc.paragraphs:
+            yield paragraph.text + "\n"
+
+    def _text_chunks(self):
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(TEXT_CHUNK_SIZE), ''):
+                yield chunk
+
+
+def extract_text_from_pdf(pdf_path):
+    """Extract text from PDF file"""
+    return "".join(DocumentStream(pdf_path)._pdf_pages())
+
+
+def extract_text_from_docx(docx_path):
+    """Extract text from DOCX file"""
+    return "".join(DocumentStream(docx_path)._docx_paragraphs())
+
+
+def extract_text(file_path):
+    """Extract text based on file type"""
+    return "".join(DocumentStream(file_path))
+
+
+def preprocess_chunks(chunks):
+    """Tokenize text arriving in chunks, yielding the words kept
+
+    A word running over a chunk boundary is carried into the next chunk, so
+    the words are the same as preprocess_text on the concatenated text.
+    """
+    tail = ''
+    for chunk in chunks:
+        # Carry everything after the last whitespace into the next chunk,
+        # lowercasing is context sensitive within a word (final sigma)
+        boundary = WHITESPACE.search(chunk[::-1])
+        if boundary is None:
+            tail += chunk
+            continue
+        cut = len(chunk) - boundary.start()
+        text, tail = tail + chunk[:cut], chunk[cut:]
+        yield from tokenize(text)
+
+    yield from tokenize(tail)
+
+
+def preprocess_text(text):
+    """Basic text preprocessing"""
+    return " ".join(tokenize(text))
+
+
+def preprocess_version():
+    """Fingerprint of the preprocessing, cached tokens are only reused for the same one"""
+    try:
+        source = inspect.getsource(tokenizer) + inspect.getsource(preprocess_chunks)
+    except (OSError, TypeError):
+        source = preprocess_chunks.__qualname__
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+
+def extract_resume(file_path, max_pages=None, max_bytes=None):
+    """Stream and preprocess one resume file, returns (processed_text, truncation)
+
+    truncation is None, or {'pages': ..., 'bytes': ...} read before a limit
+    or an error stopped the extraction, with the 'error' if there was one.
+    """
+    stream = DocumentStream(file_path, max_pages, max_bytes)
+    processed_text = " ".join(preprocess_chunks(stream))
+    truncation = None
+    if stream.truncated or stream.error is not None:
+        truncation = {'pages': stream.pages, 'bytes': stream.bytes}
+        if stream.error is not None:
+            truncation['error'] = stream.error
+    return processed_text, truncation
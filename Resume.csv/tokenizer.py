@@ -0,0 +1,72 @@
+"""
+Tokenizer for AI-Powered Resume Ranker
+Single-pass tokenizer with precompiled patterns and frozen stop words, and an
+interned vocabulary mapping terms to integer ids so that resumes are kept as
+compact array('I') token arrays instead of joined strings.
+"""
+
+import re
+from array import array
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+
+# Runs of word characters, i.e. what is left after replacing special
+# characters by spaces and splitting on whitespace
+WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase words of text longer than two characters, without stop words"""
+    return [word for word in WORD.findall(text.lower())
+            if len(word) > 2 and word not in STOP_WORDS]
+
+
+def short_words(text):
+    """Words of text that tokenize drops for their length, stop words aside"""
+    return [word for word in WORD.findall(text.lower())
+            if len(word) <= 2 and word not in STOP_WORDS]
+
+
+class Vocabulary:
+    """Append-only interning of terms to consecutive integer ids"""
+
+    def __init__(self, terms=()):
+        self.terms = list(terms)
+        self.ids = {term: term_id for term_id, term in enumerate(self.terms)}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def intern(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def encode(self, terms):
+        """Intern terms and return them as a token array"""
+        ids = self.ids
+        intern = self.intern
+        return array('I', [ids[term] if term in ids else intern(term) for term in terms])
+
+    def lookup(self, terms):
+        """Ids of query terms without interning them
+
+        Unknown terms get distinct negative ids, so they still count as
+        separate terms but never match a posting.
+        """
+        unknown = {}
+        return [self.ids[term] if term in self.ids else -unknown.setdefault(term, len(unknown) + 1)
+                for term in terms]
+
+    def decode(self, tokens):
+        """Token array back to the space-joined preprocessed text"""
+        terms = self.terms
+        return " ".join([terms[token] for token in tokens])
@@ -0,0 +1,91 @@
+"""
+Top-k Selection for AI-Powered Resume Ranker
+Picks a page of the best scores with a partial sort and summarises the score
+distribution without building a result row for every resume.
+Uses NumPy when it is installed and falls back to heapq otherwise.
+"""
+
+import heapq
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def select_top(scores, top_k=None, offset=0, min_score=None):
+    """Indices of the resumes on the requested page, best score first
+
+    Ties keep upload order. Only offset + top_k scores are ever sorted.
+    """
+    limit = offset + top_k if top_k is not None else None
+
+    if np is not None:
+        scores = np.asarray(scores, dtype=np.float64)
+        candidates = np.arange(len(scores)) if min_score is None else np.flatnonzero(scores >= min_score)
+
+        if limit is None or limit >= len(candidates):
+            order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        elif limit <= 0:
+            return []
+        else:
+            # Everything above the limit-th best score, then ties in upload order
+            candidate_scores = scores[candidates]
+            kth = np.partition(candidate_scores, len(candidates) - limit)[len(candidates) - limit]
+            above = candidates[candidate_scores > kth]
+            ties = candidates[candidate_scores == kth][:limit - len(above)]
+            selected = np.concatenate([above, ties])
+            order = selected[np.lexsort((selected, -scores[selected]))]
+
+        return order[offset:limit].tolist()
+
+    candidates = range(len(scores))
+    if min_score is not None:
+        candidates = [i for i in candidates if scores[i] >= min_score]
+
+    if limit is None:
+        order = sorted(candidates, key=scores.__getitem__, reverse=True)
+    else:
+        order = heapq.nlargest(max(limit, 0), candidates, key=scores.__getitem__)
+
+    return order[offset:limit]
+
+
+def score_summary(scores, min_score=None, bins=10):
+    """Count, mean, extremes and a histogram of the scores in one pass"""
+    if np is not None:
+        scores = np.asarray(scores, dtype=np.float64)
+        if min_score is not None:
+            scores = scores[scores >= min_score]
+        counts = np.histogram(np.clip(scores, 0, 1), bins=bins, range=(0, 1))[0].tolist()
+        count = len(scores)
+        total = float(scores.sum())
+        highest = float(scores.max()) if count else 0
+        lowest = float(scores.min()) if count else 0
+    else:
+        counts = [0] * bins
+        count = 0
+        total = 0.0
+        highest = lowest = None
+        for score in scores:
+            if min_score is not None and score < min_score:
+                continue
+            count += 1
+            total += score
+            highest = score if highest is None else max(highest, score)
+            lowest = score if lowest is None else min(lowest, score)
+            counts[min(max(int(score * bins), 0), bins - 1)] += 1
+        highest = highest or 0
+        lowest = lowest or 0
+
+    width = 100 / bins
+    return {
+        'count': count,
+        'average_score': round(total / count * 100, 2) if count else 0,
+        'highest_score': round(highest * 100, 2),
+        'lowest_score': round(lowest * 100, 2),
+        'histogram': [{
+            'range': f'{i * width:g}-{(i + 1) * width:g}',
+            'count': counts[i]
+        } for i in range(bins)]
+    }
@@ -0,0 +1,195 @@
+"""
+Vectorised Scoring Backend for AI-Powered Resume Ranker
+Holds the resume corpus as a SciPy CSR term-document matrix and scores every
+resume against the job description with sparse matrix-vector products.
+NumPy and SciPy are optional; HAS_VECTOR_BACKEND tells whether they are usable.
+"""
+
+import math
+
+try:
+    import numpy as np
+    from scipy import sparse
+    HAS_VECTOR_BACKEND = True
+except ImportError:
+    np = None
+    sparse = None
+    HAS_VECTOR_BACKEND = False
+
+
+class CsrScoringBackend:
+    """CSR view of a ResumeIndex, rebuilt whenever the index version changes
+
+    previous is the backend of the snapshot before, if any. Once built, a
+    backend only compiles the resumes added since the nearest built one
+    and copies the term frequencies of the others from it.
+    """
+
+    def __init__(self, vocabulary, previous=None):
+        # Columns are the interned term ids, so they stay stable across builds
+        self.vocabulary = vocabulary
+        self.version = None
+        self.doc_ids = ()
+        self.doc_id_column = None
+        self.tf_matrix = None
+        self.presence_matrix = None
+        self.tfidf_matrix = None
+        self.df = None
+        if previous is not None and previous.tf_matrix is None:
+            previous = previous.previous
+        self.previous = previous
+
+    def build(self, index, doc_ids, token_rows=None):
+        """Compile the index into a CSR matrix with one row per resume
+
+        token_rows, the token arrays of doc_ids by row, let the rows of the
+        resumes the previous backend already holds be copied from it.
+        """
+        # A snapshot passes its frozen doc id column every time
+        if self.version == index.version and (doc_ids is self.doc_id_column or tuple(doc_ids) == self.doc_ids):
+            return
+        doc_id_column, doc_ids = doc_ids, tuple(doc_ids)
+
+        previous = self.previous
+        if token_rows is not None and previous is not None and previous.vocabulary is self.vocabulary:
+            tf_matrix = self._updated_tf_matrix(previous, doc_ids, token_rows)
+        else:
+            tf_matrix = self._tf_matrix(index, doc_ids)
+        # Set before the matrices, which tell the next backend this one is built
+        self.doc_ids = doc_ids
+        self.doc_id_column = doc_id_column
+        self.previous = None
+
+        # Weighed on the CSR arrays directly, in a few passes over the nonzeros
+        shape, indices, indptr = tf_matrix.shape, tf_matrix.indices, tf_matrix.indptr
+        row_of_value = np.repeat(np.arange(shape[0]), np.diff(indptr))
+        self.tf_matrix = tf_matrix
+        self.presence_matrix = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=shape)
+        self.df = np.bincount(indices, minlength=shape[1]).astype(np.float64)
+
+        # IDF comes from the resumes only, so the rows can be L2-normalised
+        # once and cosine similarity is a plain product with the query
+        idf = math.log(max(len(doc_ids), 1)) - np.log1p(self.df)
+        tfidf = tf_matrix.data * idf[indices]
+        norms = np.sqrt(np.bincount(row_of_value, weights=tfidf * tfidf, minlength=shape[0]))
+        inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        self.tfidf_matrix = sparse.csr_matrix((tfidf * inverse_norms[row_of_value], indices, indptr), shape=shape)
+        self.version = index.version
+
+    def _tf_matrix(self, index, doc_ids):
+        """Term frequencies of doc_ids (rows) from the postings of the index"""
+        row_of_doc = np.full(max(index.next_doc_id, 1), -1, dtype=np.int64)
+        row_of_doc[list(doc_ids)] = np.arange(len(doc_ids))
+
+        rows, cols, data = [], [], []
+        for term, term_postings in index.postings.items():
+            count = len(term_postings)
+            rows.append(row_of_doc[np.fromiter(term_postings.keys(), dtype=np.int64, count=count)])
+            cols.append(np.full(count, term, dtype=np.int64))
+            data.append(np.fromiter(term_postings.values(), dtype=np.float64, count=count))
+
+        shape = (len(doc_ids), len(self.vocabulary))
+        if not rows:
+            return sparse.csr_matrix(shape, dtype=np.float64)
+        return sparse.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=shape)
+
+    def _updated_tf_matrix(self, previous, doc_ids, token_rows):
+        """Term frequencies of doc_ids (rows), copying the rows previous holds"""
+        num_terms = len(self.vocabulary)
+        ids = np.asarray(doc_ids, dtype=np.int64)
+        previous_ids = np.asarray(previous.doc_ids, dtype=np.int64)
+        kept = np.isin(ids, previous_ids, assume_unique=True)
+        new_rows = np.flatnonzero(~kept)
+
+        # The vocabulary only grows, so the previous columns keep their terms
+        copied = previous.tf_matrix[np.flatnonzero(np.isin(previous_ids, ids, assume_unique=True))]
+        copied = sparse.csr_matrix((copied.data, copied.indices, copied.indptr), shape=(copied.shape[0], num_terms))
+
+        token_arrays = [np.asarray(token_rows[row], dtype=np.int64) for row in new_rows.tolist()]
+        tokens = np.concatenate(token_arrays) if token_arrays else np.zeros(0, dtype=np.int64)
+        token_row = np.repeat(np.arange(len(token_arrays)), [len(tokens) for tokens in token_arrays])
+        # Repeated tokens of a row are summed into its term frequency
+        added = sparse.csr_matrix((np.ones(len(tokens)), (token_row, tokens)), shape=(len(new_rows), num_terms))
+
+        tf_matrix = sparse.vstack([copied, added], format='csr')
+        positions = np.concatenate([np.flatnonzero(kept), new_rows])
+        if np.any(positions[1:] < positions[:-1]):
+            tf_matrix = tf_matrix[np.argsort(positions, kind='stable')]
+        return tf_matrix
+
+    def cosine_scores(self, query_vector):
+        """Cosine similarity of every row against the query, as one mat-vec"""
+        return self.cosine_score_matrix([query_vector])[:, 0]
+
+    def cosine_score_matrix(self, query_vectors):
+        """Cosine similarity of every row (rows) against every query (columns)
+
+        Each query vector is ({term id: weight}, norm) as returned by
+        ResumeIndex.query_vector for the same corpus.
+        """
+        num_rows, num_cols = self.tfidf_matrix.shape
+
+        cols, positions, values = [], [], []
+        for position, (weights, query_norm) in enumerate(query_vectors):
+            if query_norm <= 0:
+                continue
+            for term, weight in weights.items():
+                if 0 <= term < num_cols:
+                    cols.append(term)
+                    positions.append(position)
+                    values.append(weight / query_norm)
+
+        query_matrix = sparse.csr_matrix((values, (cols, positions)), shape=(num_cols, len(query_vectors)))
+        return (self.tfidf_matrix @ query_matrix).toarray()
+
+    def keyword_scores(self, matcher, phrase_rows):
+        """Weighted keyword hits of every row"""
+        return self.keyword_score_matrix([matcher], phrase_rows)[:, 0]
+
+    def keyword_score_matrix(self, matchers, phrase_rows):
+        """Weighted keyword hits of every row (rows) for every KeywordMatcher
+
+        A single-term keyword is the indicator of its term column, so all of
+        them are matched with one sparse product. Multi-term phrases are left
+        to phrase_rows(phrases), which returns the rows holding each phrase.
+        Phrases shared by several matchers are only matched once.
+        """
+        num_rows, num_cols = self.presence_matrix.shape
+
+        unique_phrases = {}
+        for matcher in matchers:
+            for term_ids, _ in matcher.phrase_ids(self.vocabulary):
+                unique_phrases.setdefault(term_ids, len(unique_phrases))
+
+        set_weights = np.zeros((len(unique_phrases), len(matchers)))
+        for position, matcher in enumerate(matchers):
+            for term_ids, weight in matcher.phrase_ids(self.vocabulary):
+                set_weights[unique_phrases[term_ids], position] += weight
+
+        indicator_rows, indicator_cols = [], []
+        phrases, phrase_columns = [], []
+        for term_ids, column in unique_phrases.items():
+            if len(term_ids) > 1:
+                phrases.append(term_ids)
+                phrase_columns.append(column)
+            elif term_ids[0] < num_cols:
+                indicator_rows.append(term_ids[0])
+                indicator_cols.append(column)
+
+        indicator = sparse.csr_matrix(
+            (np.ones(len(indicator_rows)), (indicator_rows, indicator_cols)),
+            shape=(num_cols, len(unique_phrases))
+        )
+        hits = (self.presence_matrix @ indicator) > 0
+
+        phrase_hit_rows, phrase_hit_cols = [], []
+        for column, rows in zip(phrase_columns, phrase_rows(phrases) if phrases else ()):
+            phrase_hit_rows.extend(rows)
+            phrase_hit_cols.extend([column] * len(rows))
+        if phrase_hit_rows:
+            hits = hits + sparse.csr_matrix(
+                (np.ones(len(phrase_hit_rows), dtype=bool), (phrase_hit_rows, phrase_hit_cols)),
+                shape=hits.shape
+            )
+
+        return np.asarray(hits.astype(np.float64) @ set_weights)
@@ -0,0 +1,421 @@
+"""
+Workspaces for AI-Powered Resume Ranker
+Registry of named workspaces, each with its own ranker, upload folder and
+persistent index, so several hiring pipelines can share one process. Idle
+workspaces are evicted to their on-disk form once more than max_loaded are
+in memory and reloaded lazily on their next request.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from index_store import writer_lock
+
+WORKSPACE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+JOB_FILENAME = 'job.json'
+
+
+def is_valid_workspace_id(workspace_id):
+    return bool(WORKSPACE_ID.match(workspace_id or ''))
+
+
+class Workspace:
+    """One hiring pipeline: a ranker over its own upload and index folders
+
+    lock serialises changes to the ranker; readers rank its published
+    snapshot without it. With shared_index several processes serve the
+    same folders: the ranker only maps the saved index read-only and
+    writing() loads a writable one under a lock on the index folder.
+
+    Every save writes the whole index again, so save() may defer saves to
+    one per save_interval seconds, see save().
+    """
+
+    def __init__(self, workspace_id, upload_folder, index_folder, create_ranker, shared_index=False,
+                 save_interval=0):
+        self.id = workspace_id
+        self.upload_folder = upload_folder
+        self.index_folder = index_folder
+        self.create_ranker = create_ranker
+        self.shared_index = shared_index
+        self.ranker = None
+        self.writer = None
+        self._writer_generation = None
+        self.lock = threading.RLock()
+        self.users = 0
+        self.last_used = time.time()
+        self.resets = 0
+        # Generation of the mapped index and mtime of the job it was given
+        self._mapped = None
+        self.save_interval = save_interval
+        self.saved_at = 0
+        self.unsaved = False
+
+    def _job_path(self):
+        return os.path.join(self.index_folder, JOB_FILENAME)
+
+    def _job_mtime(self):
+        try:
+            return os.stat(self._job_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def _restore_job(self, ranker):
+        """Give the ranker the job description kept next to the index"""
+        try:
+            with open(self._job_path(), 'r', encoding='utf-8') as f:
+                job = json.load(f)
+            ranker.set_job_description(job['job_description'], job.get('keywords'))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def load(self):
+        """Warm start the ranker from the index and pick up changed uploads"""
+        os.makedirs(self.upload_folder, exist_ok=True)
+        if self.shared_index:
+            with writer_lock(self.index_folder):
+                ranker = self._map()
+                if not ranker.read_only or ranker.folder_changed(self.upload_folder):
+                    writer = self.create_ranker()
+                    writer.open_index(self.index_folder)
+                    writer.sync_folder(self.upload_folder)
+                    writer.store.close()
+                    ranker.store.close()
+                    ranker = self._map()
+            self.ranker = ranker
+            return
+
+        ranker = self.create_ranker()
+        ranker.open_index(self.index_folder)
+        ranker.sync_folder(self.upload_folder)
+        self._restore_job(ranker)
+        self.ranker = ranker
+
+    def _map(self):
+        """Read-only ranker over the last saved index, with the saved job"""
+        job_mtime = self._job_mtime()
+        ranker = self.create_ranker()
+        ranker.open_index(self.index_folder, read_only=True)
+        self._restore_job(ranker)
+        self._mapped = (ranker.store.generation() if not ranker.read_only else ranker.index.version, job_mtime)
+        return ranker
+
+    def refresh(self):
+        """Map the index again if another process saved a newer one or changed the job"""
+        if not self.shared_index or self.ranker is None:
+            return
+        with self.lock:
+            if self._mapped != (self.ranker.store.generation(), self._job_mtime()):
+                old = self.ranker
+                self.ranker = self._map()
+                old.store.close()
+
+    @contextmanager
+    def writing(self, keep=False):
+        """The ranker to change, with every other writer shut out
+
+        Without a shared index this is the ranker itself under self.lock.
+        With one, other processes are shut out too and the changes go to a
+        writable ranker loaded from the latest saved index; once the caller
+        saved it, readers get the new index mapped. keep holds on to the
+        writable ranker for the next write, e.g. the next batch of an upload
+        job, as long as nobody else saved meanwhile.
+        """
+        with self.lock:
+            if not self.shared_index:
+                yield self.ranker
+                return
+
+            with writer_lock(self.index_folder):
+                writer = self.writer
+                if writer is None or writer.store.generation() != self._writer_generation:
+                    if writer is not None:
+                        writer.store.close()
+                    writer = self.writer = self.create_ranker()
+                    writer.open_index(self.index_folder)
+                try:
+                    yield writer
+                except Exception:
+                    # The writable ranker may be half changed, load it again next time
+                    keep = False
+                    raise
+                finally:
+                    self._writer_generation = writer.store.generation()
+                    if not keep:
+                        writer.store.close()
+                        self.writer = None
+                    self.refresh()
+
+    def save(self, ranker, defer=False):
+        """Save the index of a ranker changed through writing()
+
+        A save rewrites every generation file, so its cost follows the size
+        of the corpus. With defer and without a shared index, a save less
+        than save_interval seconds after the previous one is left to the
+        next save, flush() or unload(): the upload folder stays the source
+        of truth, and sync_folder picks changes lost in a crash up again on
+        the next start. With a shared index every save happens at once,
+        readers only see saved generations.
+        """
+        if defer and not self.shared_index and time.time() - self.saved_at < self.save_interval:
+            self.unsaved = True
+            return
+        ranker.save_index()
+        self.saved_at = time.time()
+        self.unsaved = False
+
+    def flush(self):
+        """Save the changes left by deferred saves, if any"""
+        with self.lock:
+            if self.unsaved and self.ranker is not None:
+                self.save(self.ranker)
+
+    def set_job_description(self, job_description, keywords=None):
+        """Set the job of the ranker and keep it for the next reload"""
+        self.ranker.set_job_description(job_description, keywords)
+        # Per process, so concurrent writers in other processes do not collide
+        temp_path = f'{self._job_path()}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'job_description': job_description, 'keywords': keywords}, f)
+        os.replace(temp_path, self._job_path())
+        if self.shared_index:
+            self._mapped = (self._mapped[0], self._job_mtime())
+
+    def reset(self):
+        """Clear the index, the job description and the uploaded files"""
+        self.resets += 1
+        self.unsaved = False
+        if self.shared_index:
+            with writer_lock(self.index_folder):
+                self._reset_folders()
+                self.unload()
+                self.ranker = self._map()
+            return
+
+        self._reset_folders()
+        self.ranker.store.close()
+        self.ranker = self.create_ranker()
+        self.ranker.open_index(self.index_folder)
+
+    def _reset_folders(self):
+        if self.ranker.store is not None:
+            self.ranker.store.clear()
+        if os.path.exists(self._job_path()):
+            os.remove(self._job_path())
+
+        for filename in os.listdir(self.upload_folder):
+            file_path = os.path.join(self.upload_folder, filename)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+
+    def unload(self, save=True):
+        """Drop the in-memory ranker, saving first what deferred saves left out"""
+        if save:
+            self.flush()
+        self.unsaved = False
+        for ranker in (self.ranker, self.writer):
+            if ranker is not None and ranker.store is not None:
+                ranker.store.close()
+        self.ranker = None
+        self.writer = None
+
+    def index_stats(self):
+        """Version and size of the ranker's index, for readiness checks"""
+        snapshot = self.ranker.snapshot
+        stats = {
+            'index_version': snapshot.index.version,
+            'total_resumes': len(snapshot.resume_tokens),
+            'vocabulary_size': len(snapshot.vocabulary),
+            'mapped': self.ranker.read_only
+        }
+        if self.ranker.store is not None:
+            stats['stored_index'] = self.ranker.store.stats()
+        return stats
+
+    def to_dict(self):
+        loaded = self.ranker is not None
+        return {
+            'workspace_id': self.id,
+            'loaded': loaded,
+            'total_resumes': len(self.ranker.resume_names) if loaded else None,
+            'job_description_set': bool(self.ranker.job_description) if loaded else None,
+            'last_used': self.last_used
+        }
+
+
+class WorkspaceRegistry:
+    """Named workspaces under root, at most max_loaded kept in memory
+
+    folders maps workspace ids to fixed (upload_folder, index_folder) pairs,
+    e.g. the default workspace served by the unprefixed routes. is_busy(id)
+    tells whether a workspace has background work, which keeps it loaded.
+    on_evict(id) is called once a workspace is unloaded, to drop whatever
+    else still holds its snapshots. shared_index is for processes serving
+    the same folders and save_interval defers saves, see Workspace.
+    """
+
+    def __init__(self, root, create_ranker, max_loaded=16, folders=None, is_busy=None, shared_index=False,
+                 on_evict=None, save_interval=0):
+        self.root = root
+        self.create_ranker = create_ranker
+        self.shared_index = shared_index
+        self.max_loaded = max(max_loaded, 1)
+        self.folders = folders or {}
+        self.is_busy = is_busy or (lambda workspace_id: False)
+        self.on_evict = on_evict or (lambda workspace_id: None)
+        self.save_interval = save_interval
+        # Least recently used first
+        self.workspaces = OrderedDict()
+        # Evicted workspaces still saving, by id, until they are unloaded
+        self._unloading = {}
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _folders(self, workspace_id):
+        if workspace_id in self.folders:
+            return self.folders[workspace_id]
+        folder = os.path.join(self.root, workspace_id)
+        return os.path.join(folder, 'uploads'), os.path.join(folder, 'index')
+
+    @contextmanager
+    def use(self, workspace_id):
+        """Loaded workspace for the duration of a request, created on first use"""
+        workspace = self.acquire(workspace_id)
+        try:
+            yield workspace
+        finally:
+            self.release(workspace)
+
+    def acquire(self, workspace_id):
+        if not is_valid_workspace_id(workspace_id):
+            raise ValueError(f'Invalid workspace id: {workspace_id!r}')
+
+        with self._lock:
+            workspace = self.workspaces.get(workspace_id)
+            if workspace is None:
+                # Taken back while being unloaded: its lock holds the reload
+                # back until the save is done
+                workspace = self._unloading.get(workspace_id)
+            if workspace is None:
+                upload_folder, index_folder = self._folders(workspace_id)
+                workspace = Workspace(workspace_id, upload_folder, index_folder, self.create_ranker,
+                                      self.shared_index, self.save_interval)
+                self.workspaces[workspace_id] = workspace
+            self.workspaces.move_to_end(workspace_id)
+            workspace.users += 1
+            workspace.last_used = time.time()
+
+        try:
+            with workspace.lock:
+                if workspace.ranker is None:
+                    workspace.load()
+            workspace.refresh()
+        except Exception:
+            self.release(workspace)
+            raise
+
+        self._evict()
+        return workspace
+
+    def release(self, workspace):
+        with self._lock:
+            workspace.users -= 1
+            workspace.last_used = time.time()
+
+    def _evict(self):
+        """Unload the least recently used idle workspaces beyond max_loaded
+
+        They leave the registry under its lock but are saved and unloaded
+        after it, so other workspaces are not held up by the save.
+        """
+        evicted = []
+        with self._lock:
+            loaded = [workspace for workspace in self.workspaces.values() if workspace.ranker is not None]
+            excess = len(loaded) - self.max_loaded
+            for workspace in loaded:
+                if excess <= 0:
+                    break
+                if workspace.users or self.is_busy(workspace.id):
+                    continue
+                del self.workspaces[workspace.id]
+                self._unloading[workspace.id] = workspace
+                evicted.append(workspace)
+                excess -= 1
+
+        for workspace in evicted:
+            with workspace.lock:
+                # Users are counted, and taken back workspaces registered,
+                # before they wait for the lock
+                unloaded = not workspace.users and self.workspaces.get(workspace.id) is not workspace
+                if unloaded:
+                    workspace.unload()
+            with self._lock:
+                if self._unloading.get(workspace.id) is workspace:
+                    del self._unloading[workspace.id]
+                if unloaded:
+                    self.evictions += 1
+            if unloaded:
+                self.on_evict(workspace.id)
+
+    def flush_all(self):
+        """Save what deferred saves left out in the loaded workspaces, e.g. at exit"""
+        with self._lock:
+            workspaces = list(self.workspaces.values())
+        for workspace in workspaces:
+            workspace.flush()
+
+    def delete(self, workspace_id):
+        """Remove a workspace with its uploads and index, returns False if it is in use"""
+        with self._lock:
+            workspace = self.workspaces.get(workspace_id) or self._unloading.get(workspace_id)
+            if workspace is not None:
+                if workspace.users or self.is_busy(workspace_id):
+                    return False
+                with workspace.lock:
+                    workspace.unload(save=False)
+                self.workspaces.pop(workspace_id, None)
+                self._unloading.pop(workspace_id, None)
+
+            # Still under the lock, so the workspace is not reloaded meanwhile
+            if workspace_id in self.folders:
+                for folder in self.folders[workspace_id]:
+                    shutil.rmtree(folder, ignore_errors=True)
+            else:
+                shutil.rmtree(os.path.join(self.root, workspace_id), ignore_errors=True)
+        return True
+
+    def list_workspaces(self):
+        """Loaded and on-disk workspaces, most recently used first"""
+        with self._lock:
+            workspaces = [workspace.to_dict() for workspace in reversed(self.workspaces.values())]
+        known = {workspace['workspace_id'] for workspace in workspaces}
+
+        on_disk = set(self.folders)
+        if os.path.isdir(self.root):
+            on_disk.update(entry.name for entry in os.scandir(self.root)
+                           if entry.is_dir() and is_valid_workspace_id(entry.name))
+        for workspace_id in sorted(on_disk - known):
+            workspaces.append({'workspace_id': workspace_id, 'loaded': False, 'total_resumes': None,
+                               'job_description_set': None, 'last_used': None})
+        return workspaces
+
+    def snapshots(self):
+        """{workspace_id: published snapshot} of the loaded workspaces"""
+        with self._lock:
+            return {workspace_id: workspace.ranker.snapshot
+                    for workspace_id, workspace in self.workspaces.items() if workspace.ranker is not None}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': sum(workspace.ranker is not None for workspace in self.workspaces.values()),
+                'max_loaded': self.max_loaded,
+                'evictions': self.evictions
+            }